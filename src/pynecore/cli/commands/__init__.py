@@ -9,9 +9,9 @@ from ..utils.error_hook import setup_global_error_logging
 from ...providers import available_providers
 
 # Import commands
-from . import run, data, compile, benchmark
+from . import run, data, compile, benchmark, optimize
 
-__all__ = ['run', 'data', 'compile', 'benchmark']
+__all__ = ['run', 'data', 'compile', 'benchmark', 'optimize']
 
 
 @app.callback()
@@ -180,7 +180,7 @@ def main(
             # Use fixed seed for reproducibility
             random.seed(42)
 
-            with OHLCVWriter(demo_file) as writer:
+            with OHLCVWriter(demo_file, buffered=True) as writer:
                 current_price = base_price
 
                 for i in range(20000):
@@ -1,3 +1,4 @@
+import ast
 import time
 import gc
 from pathlib import Path
@@ -13,6 +14,9 @@ from ..app import app, app_state
 from ...core.ohlcv_file import OHLCVReader
 from ...core.syminfo import SymInfo
 from ...core.script_runner import ScriptRunner
+from ...core.profiler import Profiler
+from ...core.import_hook import transform_ast
+from ..utils.profile import print_profile
 
 __all__ = []
 
@@ -25,6 +29,9 @@ def benchmark(
         candles: int = Option(5000, "--candles", "-c", help="Number of candles to process"),
         warmup: int = Option(2, "--warmup", "-w", help="Number of warmup iterations"),
         no_output: bool = Option(True, "--no-output", help="Don't write CSV output"),
+        profile: bool = Option(False, "--profile",
+                               help="Measure the time of main(), every call site of the script, order processing "
+                                    "and output writing in the measured iterations, and print the slowest ones"),
 ):
     """
     Benchmark script execution performance
@@ -93,6 +100,9 @@ def benchmark(
     # Total iterations including warmup
     total_iterations = warmup + iterations
 
+    # The profiler collects the times of all measured iterations
+    profiler = Profiler() if profile else None
+
     with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -127,7 +137,8 @@ def benchmark(
                     iter(ohlcv_list),
                     syminfo,
                     last_bar_index=len(ohlcv_list) - 1,
-                    plot_path=None if no_output else app_state.output_dir / f"benchmark_{i}.csv"
+                    plot_path=None if no_output else app_state.output_dir / f"benchmark_{i}.csv",
+                    profiler=profiler if i >= warmup else None
                 )
 
                 import_time = time.perf_counter() - import_start
@@ -151,6 +162,18 @@ def benchmark(
             if no_output and (app_state.output_dir / f"benchmark_{i}.csv").exists():
                 (app_state.output_dir / f"benchmark_{i}.csv").unlink()
 
+    # Time the AST transformation of the script, imports after the first one are served from the bytecode cache
+    source = script.read_text()
+    kloc = max(len(source.splitlines()), 1) / 1000
+    transform_times = []
+    for _ in range(iterations):
+        transform_start = time.perf_counter()
+        tree = ast.parse(source)
+        tree._module_file_path = str(script.resolve())  # type: ignore
+        compile(transform_ast(tree), str(script), 'exec')
+        transform_times.append(time.perf_counter() - transform_start)
+    avg_transform = statistics.mean(transform_times)
+
     # Calculate statistics
     avg_import = statistics.mean(import_times)
     avg_run = statistics.mean(run_times)
@@ -173,6 +196,8 @@ def benchmark(
     table.add_row("Iterations", str(iterations))
     table.add_row("", "")
     table.add_row("Avg Import Time", f"{avg_import * 1000:.2f} ms")
+    table.add_row("Avg Transform Time", f"{avg_transform * 1000:.2f} ms")
+    table.add_row("Transform Time / KLOC", f"{avg_transform / kloc * 1000:.2f} ms")
     table.add_row("Avg Run Time", f"{avg_run * 1000:.2f} ms")
     table.add_row("Avg Total Time", f"{avg_total * 1000:.2f} ms")
     table.add_row("", "")
@@ -185,3 +210,7 @@ def benchmark(
 
     console.print("")
     console.print(table)
+
+    if profiler:
+        console.print("")
+        print_profile(console, profiler)
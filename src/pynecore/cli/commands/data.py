@@ -7,12 +7,13 @@ from typer import Typer, Option, Argument, Exit, secho, colors, confirm
 
 from rich import print as rprint
 from rich.console import Console
+from rich.table import Table
 from rich.progress import (Progress, SpinnerColumn, TextColumn, BarColumn,
                            TimeElapsedColumn, TimeRemainingColumn)
 
 from ..app import app, app_state
 from ...providers import available_providers
-from ...providers.provider import Provider
+from ...providers.provider import Provider, refresh_ohlcv
 from ...lib.timeframe import in_seconds
 from ...core.data_converter import DataConverter, SupportedFormats as InputFormats
 from ...core.ohlcv_file import OHLCVReader
@@ -167,13 +168,14 @@ def download(
             if truncate:
                 ohlcv_writer.seek(0)
                 ohlcv_writer.truncate()
+                provider_instance.clear_checkpoint()
 
             # If the start date is "continue" (default), we resume from the last download
             if time_from == "continue":
-                if ohlcv_writer.end_timestamp:  # Resume from last download
-                    time_from = datetime.fromtimestamp(ohlcv_writer.end_timestamp, UTC)
-                    # We need to add one interval to the start date to avoid downloading the same data
-                    time_from += timedelta(seconds=ohlcv_writer.interval)
+                # Resume after the last saved bar or from the checkpoint of an interrupted download
+                resume_timestamp = provider_instance.get_resume_timestamp()
+                if resume_timestamp is not None:
+                    time_from = datetime.fromtimestamp(resume_timestamp, UTC)
                 else:  # No data, download one year as default
                     time_from = datetime.now(UTC) - timedelta(days=365)
 
@@ -201,6 +203,7 @@ def download(
                     # Truncate file
                     ohlcv_writer.seek(0)
                     ohlcv_writer.truncate()
+                    provider_instance.clear_checkpoint()
 
             total_seconds = int((time_to - time_from).total_seconds())
 
@@ -232,6 +235,75 @@ def download(
         raise Exit(2)
 
 
+@app_data.command()
+def refresh(
+        provider: AvailableProvidersEnum = Argument(..., case_sensitive=False, show_default=False,
+                                                    help="Data provider"),
+        symbols: list[str] = Option([], '--symbol', '-s', show_default=False,
+                                    help="Symbol (e.g. BYBIT:BTC/USDT:USDT), can be used multiple times"),
+        symbols_file: Path | None = Option(None, '--symbols-file', '-sf', show_default=False,
+                                           help="File with one symbol per line, lines starting with '#' "
+                                                "are comments"),
+        timeframes: list[str] = Option(['1D'], '--timeframe', '-tf',
+                                       help="Timeframe in TradingView format, can be used multiple times"),
+        workers: int = Option(4, '--workers', '-w', min=1, help="Number of symbols refreshed at the same time"),
+):
+    """
+    Append the new bars to the existing data files of many symbols and timeframes
+    """
+    provider_module = __import__(f"pynecore.providers.{provider.value}", fromlist=[''])
+    provider_class = getattr(provider_module, [p for p in dir(provider_module) if p.endswith('Provider')][0])
+
+    symbols = list(symbols)
+    if symbols_file:
+        symbols += [line.strip() for line in symbols_file.read_text().splitlines()
+                    if line.strip() and not line.strip().startswith('#')]
+    if not symbols:
+        secho("Error: Symbol is required!", err=True, fg=colors.RED)
+        raise Exit(1)
+    try:
+        timeframes = [validate_timeframe(timeframe) for timeframe in timeframes]
+    except ValueError as e:
+        secho(str(e), err=True, fg=colors.RED)
+        raise Exit(2)
+
+    now = datetime.now(UTC).replace(second=0, microsecond=0)
+    results = []
+    with Progress(SpinnerColumn(finished_text="[green]✓"), TextColumn("{task.description}"), BarColumn(),
+                  TimeElapsedColumn()) as progress:
+        task = progress.add_task(description="Refreshing data...", total=len(symbols) * len(timeframes))
+        for result in refresh_ohlcv(provider_class, symbols, timeframes, app_state.data_dir,
+                                    config_dir=app_state.config_dir, time_to=now, workers=workers):
+            results.append(result)
+            progress.update(task, advance=1)
+
+    def format_time(timestamp: int | None) -> str:
+        return datetime.fromtimestamp(timestamp, UTC).strftime('%Y-%m-%d %H:%M') if timestamp else "-"
+
+    # Freshness report
+    table = Table(title="Data Freshness", show_header=True, header_style="bold magenta")
+    table.add_column("Symbol", style="cyan")
+    table.add_column("Timeframe")
+    table.add_column("Last bar before")
+    table.add_column("Last bar")
+    table.add_column("New bars", justify="right")
+    table.add_column("Behind", justify="right")
+    table.add_column("Status")
+    for result in sorted(results, key=lambda r: (r.symbol, r.timeframe)):
+        behind = ""
+        if result.end:
+            # The last bar is the bar which opened at most one interval before now
+            behind_seconds = int(now.timestamp()) - result.end - in_seconds(result.timeframe)
+            behind = str(timedelta(seconds=behind_seconds)) if behind_seconds > 0 else "up to date"
+        table.add_row(result.symbol, result.timeframe, format_time(result.previous_end), format_time(result.end),
+                      str(result.new_bars), behind,
+                      f"[red]{result.error}[/red]" if result.error else "[green]OK[/green]")
+    Console().print(table)
+
+    if any(result.error for result in results):
+        raise Exit(1)
+
+
 @app_data.command()
 def convert_to(
         ohlcv_path: Path = Argument(..., dir_okay=False, file_okay=True,
@@ -291,6 +363,9 @@ def convert_from(
         symbol: str | None = Option(None, '--symbol', '-s', show_default=False,
                                     help="Symbol (default: from file name)"),
         tz: str = Option('UTC', '--timezone', '-tz', help="Timezone"),
+        workers: int | None = Option(None, '--workers', '-w', min=1,
+                                     help="Number of worker processes to parse big CSV/TXT files "
+                                          "(default: number of CPUs)"),
 ):
     """
     Convert data from other sources to pyne's OHLCV format
@@ -337,7 +412,8 @@ def convert_from(
                 provider=provider,
                 symbol=symbol,
                 timezone=tz,
-                force=True
+                force=True,
+                workers=workers
             )
 
             progress.update(task, completed=1)
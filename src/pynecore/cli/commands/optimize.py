@@ -0,0 +1,151 @@
+import json
+import sys
+import tomllib
+from datetime import datetime, UTC
+from pathlib import Path
+
+from typer import Option, Argument, secho, Exit
+from rich.table import Table
+from rich.console import Console
+from rich.progress import Progress, SpinnerColumn, TextColumn
+
+from ..app import app, app_state
+from ...core.csv_file import CSVWriter
+from ...core.optimizer import Optimizer, METHODS, parse_search_space
+from ...core.script_runner import import_script
+from ...core.strategy_stats import StrategyStatistics
+
+__all__ = []
+
+
+@app.command(name="optimize")
+def optimize(
+        script: Path = Argument(..., dir_okay=False, file_okay=True, help="Strategy script to optimize (.py)"),
+        data: Path = Argument(..., dir_okay=False, file_okay=True, help="Data file to use (*.ohlcv)"),
+        space_path: Path = Option(..., "--space", "-s", dir_okay=False, file_okay=True,
+                                  help="TOML file of the search space ([inputs] table)"),
+        method: str = Option("grid", "--method", "-m", help=f"Search method: {', '.join(METHODS)}"),
+        samples: int | None = Option(None, "--samples", "-n", min=1,
+                                     help="Number of random combinations (random and halving methods)"),
+        metric: str = Option("net_profit", "--metric",
+                             help="Strategy statistics field to rank the runs by"),
+        minimize: bool = Option(False, "--minimize", help="Lower metric is better"),
+        eta: int = Option(3, "--eta", min=2,
+                          help="Halving: only the best 1/eta of the candidates runs on more data"),
+        min_bars: int = Option(500, "--min-bars", min=1, help="Halving: bars of the first round"),
+        seed: int | None = Option(None, "--seed", help="Random seed"),
+        time_from: datetime | None = Option(None, '--from', '-f',
+                                            formats=["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"],
+                                            help="Start date (UTC), if not specified, will use the "
+                                                 "first date in the data"),
+        time_to: datetime | None = Option(None, '--to', '-t',
+                                          formats=["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"],
+                                          help="End date (UTC), if not specified, will use the last "
+                                               "date in the data"),
+        output_path: Path | None = Option(None, "--output", "-o",
+                                          help="Path to save all results (CSV)"),
+        top: int = Option(10, "--top", min=1, help="Number of best results to show"),
+        workers: int | None = Option(None, "--workers", "-w", min=1,
+                                     help="Number of worker processes, default is the number of CPUs"),
+):
+    """
+    Optimize the inputs of a strategy
+
+    The strategy runs with the combinations of its inputs in parallel worker processes, and the runs are
+    ranked by a metric of the strategy statistics. The data is loaded only once.
+
+    The search space file contains the values of inputs in an [bold]\\[inputs][/] table, as a list of values
+    or as a range, e.g. [italic]length = { start = 5, stop = 50, step = 5 }[/]. If start or stop is missing,
+    the minval / maxval of the input is used.
+
+    If [bold]script[/] path is a name without full path, it will be searched in the [italic]"workdir/scripts"[/] directory.
+    Similarly, if [bold]data[/] path is a name without full path, it will be searched in the [italic]"workdir/data"[/] directory.
+    """  # noqa
+    console = Console()
+
+    # Expand script path
+    if len(script.parts) == 1:
+        script = app_state.scripts_dir / script
+    if script.suffix == "":
+        script = script.with_suffix(".py")
+    if not script.exists():
+        secho(f"Script file '{script}' not found!", fg="red", err=True)
+        raise Exit(1)
+
+    # Expand data path
+    if data.suffix == "":
+        data = data.with_suffix(".ohlcv")
+    if len(data.parts) == 1:
+        data = app_state.data_dir / data
+    if not data.exists():
+        secho(f"Data file '{data}' not found!", fg="red", err=True)
+        raise Exit(1)
+    if not data.with_suffix(".toml").exists():
+        secho(f"Symbol info file '{data.with_suffix('.toml')}' not found!", fg="red", err=True)
+        raise Exit(1)
+
+    if not output_path:
+        output_path = app_state.output_dir / f"{script.stem}_optimize.csv"
+    elif output_path.suffix != ".csv":
+        output_path = output_path.with_suffix(".csv")
+
+    # Library directory for library imports
+    lib_dir = app_state.scripts_dir / "lib"
+    sys_paths = [str(lib_dir)] if lib_dir.is_dir() else []
+
+    # Load the search space, check it against the inputs of the script
+    try:
+        with open(space_path, 'rb') as f:
+            space_data = tomllib.load(f)['inputs']
+        sys.path[0:0] = sys_paths
+        try:
+            script_inputs = import_script(script).main.script.inputs
+        finally:
+            del sys.path[0:len(sys_paths)]
+        space = parse_search_space(space_data, script_inputs)
+    except (OSError, tomllib.TOMLDecodeError, KeyError, ValueError) as e:
+        secho(f"Invalid search space '{space_path}': {e}", fg="red", err=True)
+        raise Exit(1)
+
+    try:
+        optimizer = Optimizer(script, data,
+                              time_from=int(time_from.replace(tzinfo=UTC).timestamp()) if time_from else None,
+                              time_to=int(time_to.replace(tzinfo=UTC).timestamp()) if time_to else None,
+                              metric=metric, minimize=minimize, workers=workers, sys_paths=sys_paths)
+        with Progress(
+                SpinnerColumn(finished_text="[green]✓"),
+                TextColumn("{task.description}"),
+                console=console
+        ) as progress:
+            task = progress.add_task("Optimizing...", total=1)
+            results = optimizer.run(space, method, samples=samples, eta=eta, min_bars=min_bars, seed=seed)
+            progress.update(task, completed=1)
+    except ValueError as e:
+        secho(str(e), fg="red", err=True)
+        raise Exit(1)
+
+    # Save all results
+    with CSVWriter(output_path) as writer:
+        for rank, result in enumerate(results, 1):
+            row = {'rank': rank}
+            row.update({name: result.inputs[name] for name in space})
+            row.update(bars=result.bars, error=result.error or '')
+            for name in StrategyStatistics.__dataclass_fields__:
+                row[name] = getattr(result.statistics, name) if result.statistics else ''
+            writer.write_dict(row)
+
+    # Show the best results
+    table = Table(title=f"Best results by {metric}", show_header=True, header_style="bold magenta")
+    table.add_column("#", justify="right")
+    table.add_column("Inputs")
+    table.add_column("Bars", justify="right")
+    table.add_column(metric, justify="right")
+    table.add_column("Trades", justify="right")
+    for rank, result in enumerate(results[:top], 1):
+        table.add_row(
+            str(rank), json.dumps(result.inputs), str(result.bars),
+            f"{result.score:.4f}" if result.score is not None else f"[red]{result.error}[/red]",
+            str(result.statistics.total_trades) if result.statistics else "",
+        )
+    console.print(table)
+    console.print(f"All results saved to [bold]{output_path}[/bold]")
@@ -1,11 +1,9 @@
-import queue
-import threading
-import time
 import sys
 import tomllib
 
+from enum import Enum
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, UTC
 
 from typer import Option, Argument, secho, Exit
 from rich.progress import (Progress, SpinnerColumn, TextColumn, BarColumn,
@@ -21,14 +19,23 @@ from pynecore.core.data_converter import DataConverter, DataFormatError, Convers
 
 from pynecore.core.syminfo import SymInfo
 from pynecore.core.script_runner import ScriptRunner
+from pynecore.core.progress import RunProgress, ProgressMonitor
+from pynecore.core.profiler import Profiler
 from pynecore.pynesys.compiler import PyneComp
 from ...cli.utils.api_error_handler import APIErrorHandler
+from ...cli.utils.profile import print_profile
 
 __all__ = []
 
 console = Console()
 
 
+# Output formats of plot, trade and equity files
+class OutputFormat(Enum):
+    CSV = 'csv'
+    PCOL = 'pcol'
+
+
 class CustomTimeElapsedColumn(ProgressColumn):
     """Custom time elapsed column showing milliseconds."""
 
@@ -82,11 +89,24 @@ def run(
         trade_path: Path | None = Option(None, "--trade", "-tp",
                                          help="Path to save the trade data",
                                          rich_help_panel="Out Path Options"),
+        equity_path: Path | None = Option(None, "--equity", "-ep",
+                                          help="Path to save the equity of the strategy on every bar",
+                                          rich_help_panel="Out Path Options"),
+        fmt: OutputFormat = Option('csv', "--format",
+                                   case_sensitive=False,
+                                   help="Format of the plot, trade and equity files: CSV or binary columnar "
+                                        "(pcol), used if the path has no .csv or .pcol extension",
+                                   rich_help_panel="Out Path Options"),
         api_key: str | None = Option(None, "--api-key", "-a",
                                      help="PyneSys API key for compilation (overrides configuration file)",
                                      envvar="PYNESYS_API_KEY",
                                      rich_help_panel="Compilation Options"),
-
+        batch: bool = Option(False, "--batch",
+                             help="Calculate the supported TA calls of indicators over the whole data in advance "
+                                  "(needs NumPy)"),
+        profile: bool = Option(False, "--profile",
+                               help="Measure the time of main(), every call site of the script, order processing "
+                                    "and output writing, and print the slowest ones"),
 ):
     """
     Run a script (.py or .pine)
@@ -96,7 +116,7 @@ def run(
 
     If [bold]script[/] path is a name without full path, it will be searched in the [italic]"workdir/scripts"[/] directory.
     Similarly, if [bold]data[/] path is a name without full path, it will be searched in the [italic]"workdir/data"[/] directory.
-    The [bold]plot_path[/], [bold]strat_path[/], and [bold]trade_path[/] work the same way - if they are names without full paths,
+    The [bold]plot_path[/], [bold]strat_path[/], [bold]trade_path[/] and [bold]equity_path[/] work the same way - if they are names without full paths,
     they will be saved in the [italic]"workdir/output"[/] directory.
     
     [bold]Pine Script Support:[/bold]
@@ -125,6 +145,11 @@ def run(
         secho(f"Script file '{script}' not found!", fg="red", err=True)
         raise Exit(1)
 
+    if batch:
+        from ...core import batch_ta
+        if not batch_ta.is_available():
+            secho("Batch mode needs NumPy, the script runs bar by bar!", fg="yellow", err=True)
+
     # Handle .pine files - compile them first
     if script.suffix == ".pine":
         # Read api.toml configuration
@@ -229,11 +254,12 @@ def run(
         secho(f"Data file '{data}' not found!", fg="red", err=True)
         raise Exit(1)
 
-    # Ensure .csv extension for plot path
-    if plot_path and plot_path.suffix != ".csv":
-        plot_path = plot_path.with_suffix(".csv")
+    # Ensure .csv or .pcol extension for plot path
+    out_suffix = f".{fmt.value}"
+    if plot_path and plot_path.suffix not in (".csv", ".pcol"):
+        plot_path = plot_path.with_suffix(out_suffix)
     if not plot_path:
-        plot_path = app_state.output_dir / f"{script.stem}.csv"
+        plot_path = app_state.output_dir / f"{script.stem}{out_suffix}"
 
     # Ensure .csv extension for strategy path
     if strat_path and strat_path.suffix != ".csv":
@@ -241,11 +267,15 @@ def run(
     if not strat_path:
         strat_path = app_state.output_dir / f"{script.stem}_strat.csv"
 
-    # Ensure .csv extension for trade path
-    if trade_path and trade_path.suffix != ".csv":
-        trade_path = trade_path.with_suffix(".csv")
+    # Ensure .csv or .pcol extension for trade path
+    if trade_path and trade_path.suffix not in (".csv", ".pcol"):
+        trade_path = trade_path.with_suffix(out_suffix)
     if not trade_path:
-        trade_path = app_state.output_dir / f"{script.stem}_trade.csv"
+        trade_path = app_state.output_dir / f"{script.stem}_trade{out_suffix}"
+
+    # The equity is only saved if requested
+    if equity_path and equity_path.suffix not in (".csv", ".pcol"):
+        equity_path = equity_path.with_suffix(out_suffix)
 
     # Get symbol info for the data
     try:
@@ -266,8 +296,8 @@ def run(
         total_seconds = int((time_to - time_from).total_seconds())
 
         # Get the iterator
-        size = reader.get_size(int(time_from.timestamp()), int(time_to.timestamp()))
-        ohlcv_iter = reader.read_from(int(time_from.timestamp()), int(time_to.timestamp()))
+        size = reader.get_size(int(time_from.timestamp()), int(time_to.timestamp()), skip_gaps=True)
+        ohlcv_iter = reader.read_range(int(time_from.timestamp()), int(time_to.timestamp()))
 
         # Add lib directory to Python path for library imports
         lib_dir = app_state.scripts_dir / "lib"
@@ -286,7 +316,9 @@ def run(
             try:
                 # Create script runner (this is where the import happens)
                 runner = ScriptRunner(script, ohlcv_iter, syminfo, last_bar_index=size - 1,
-                                      plot_path=plot_path, strat_path=strat_path, trade_path=trade_path)
+                                      plot_path=plot_path, strat_path=strat_path, trade_path=trade_path,
+                                      equity_path=equity_path,
+                                      batch=batch, profiler=Profiler() if profile else None)
             finally:
                 # Remove lib directory from Python path
                 if lib_path_added:
@@ -295,6 +327,9 @@ def run(
             # Mark as completed
             loading_progress.update(loading_task, completed=1)
 
+        if equity_path and runner.equity_writer is None:
+            secho("The equity is only saved for strategies, --equity is ignored!", fg="yellow", err=True)
+
         # Now run with the main progress bar
         with Progress(
                 SpinnerColumn(finished_text="[green]✓"),
@@ -310,62 +345,130 @@ def run(
                 total=total_seconds,
             )
 
-            # Create queue for progress updates
-            progress_queue = queue.Queue()
-            stop_event = threading.Event()
-
-            def progress_worker():
-                """Worker thread that updates progress bar at 60Hz"""
-                last_update = 0
-                while not stop_event.is_set():
-                    try:
-                        # Drain all pending updates
-                        current_time = None
-                        while True:
-                            try:
-                                current_time = progress_queue.get_nowait()
-                            except queue.Empty:
-                                break
-
-                        # Update progress if we have new data
-                        if current_time is not None:
-                            if current_time == datetime.max:
-                                current_time = time_to
-                            elapsed_seconds = int((current_time - time_from).total_seconds())
-                            # Only update if time changed (to avoid redundant updates)
-                            if elapsed_seconds != last_update:
-                                progress.update(task, completed=elapsed_seconds)
-                                last_update = elapsed_seconds
-                    except Exception:  # noqa
-                        pass  # Ignore any errors in worker thread
-
-                    # Wait ~33.33ms (30Hz refresh rate)
-                    time.sleep(1 / 30)
-
-            # Start worker thread
-            worker = threading.Thread(target=progress_worker, daemon=True)
-            worker.start()
-
-            def cb_progress(current_time: datetime | None):
-                """Callback that just puts timestamp in queue - near zero overhead"""
-                try:
-                    progress_queue.put_nowait(current_time)
-                except queue.Full:
-                    pass  # If queue is full, skip this update
+            start_timestamp = int(time_from.replace(tzinfo=UTC).timestamp())
 
-            try:
-                # Run the script
-                runner.run(on_progress=cb_progress)
-
-                # Ensure final progress update
-                progress_queue.put(time_to)
-                time.sleep(0.05)  # Give worker thread time to process final update
+            def update_progress(run_progress: RunProgress):
+                """Sample the progress of the runner, called from the monitor thread"""
+                if run_progress.finished:
+                    progress.update(task, completed=total_seconds)
+                elif run_progress.timestamp:
+                    progress.update(task, completed=min(run_progress.timestamp - start_timestamp, total_seconds))
 
-                progress.update(task, completed=total_seconds)
+            try:
+                # Run the script, the progress bar is updated at 30Hz from another thread
+                with ProgressMonitor(runner.progress, update_progress):
+                    runner.run()
             finally:
-                # Stop worker thread
-                stop_event.set()
-                worker.join(timeout=0.1)  # Wait max 100ms for thread to finish
-
                 # Final update to ensure completion
                 progress.refresh()
+
+        if runner.profiler:
+            print_profile(console, runner.profiler)
+
+
+@app.command(name="run-many")
+def run_many(
+        script: Path = Argument(..., dir_okay=False, file_okay=True, help="Script to run (.py)"),
+        data: list[Path] = Argument(..., help="Data files (*.ohlcv) or directories of data files"),
+        time_from: datetime | None = Option(None, '--from', '-f',
+                                            formats=["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"],
+                                            help="Start date (UTC), if not specified, will use the "
+                                                 "first date of each data file"),
+        time_to: datetime | None = Option(None, '--to', '-t',
+                                          formats=["%Y-%m-%d", "%Y-%m-%d %H:%M:%S"],
+                                          help="End date (UTC), if not specified, will use the last "
+                                               "date of each data file"),
+        inputs_path: Path | None = Option(None, "--inputs", "-i", dir_okay=False, file_okay=True,
+                                          help="TOML file of input sets ([[inputs]] tables), the script "
+                                               "runs with every input set on every data file"),
+        summary_path: Path | None = Option(None, "--summary", "-sp",
+                                           help="Path to save the summary of the strategy statistics",
+                                           rich_help_panel="Out Path Options"),
+        workers: int | None = Option(None, "--workers", "-w", min=1,
+                                     help="Number of worker processes, default is the number of CPUs"),
+):
+    """
+    Run a script on many data files and/or input sets in parallel
+
+    The runs are distributed to worker processes, and the strategy statistics of all runs are
+    collected into one summary CSV file. Plot and trade data are not saved.
+
+    If [bold]script[/] path is a name without full path, it will be searched in the [italic]"workdir/scripts"[/] directory.
+    Similarly, if a [bold]data[/] path is a name without full path, it will be searched in the [italic]"workdir/data"[/] directory.
+    The symbol info is loaded from the toml file next to each data file.
+    """  # noqa
+
+    # Expand script path
+    if len(script.parts) == 1:
+        script = app_state.scripts_dir / script
+    if script.suffix == "":
+        script = script.with_suffix(".py")
+    if not script.exists():
+        secho(f"Script file '{script}' not found!", fg="red", err=True)
+        raise Exit(1)
+
+    # Expand data paths
+    data_paths: list[Path] = []
+    for path in data:
+        if len(path.parts) == 1:
+            path = app_state.data_dir / path
+        if path.is_dir():
+            data_paths.extend(sorted(path.glob("*.ohlcv")))
+            continue
+        if path.suffix == "":
+            path = path.with_suffix(".ohlcv")
+        if not path.exists():
+            secho(f"Data file '{path}' not found!", fg="red", err=True)
+            raise Exit(1)
+        data_paths.append(path)
+    if not data_paths:
+        secho("No data files found!", fg="red", err=True)
+        raise Exit(1)
+
+    # Load input sets
+    input_sets = None
+    if inputs_path:
+        try:
+            with open(inputs_path, 'rb') as f:
+                input_sets = tomllib.load(f)['inputs']
+        except (OSError, tomllib.TOMLDecodeError, KeyError) as e:
+            secho(f"Invalid inputs file '{inputs_path}': {e}", fg="red", err=True)
+            raise Exit(1)
+
+    # Ensure .csv extension for summary path
+    if summary_path and summary_path.suffix != ".csv":
+        summary_path = summary_path.with_suffix(".csv")
+    if not summary_path:
+        summary_path = app_state.output_dir / f"{script.stem}_summary.csv"
+
+    # Library directory for library imports
+    lib_dir = app_state.scripts_dir / "lib"
+    sys_paths = [str(lib_dir)] if lib_dir.is_dir() else []
+
+    total = len(data_paths) * (len(input_sets) if input_sets is not None else 1)
+    errors = 0
+    with Progress(
+            SpinnerColumn(finished_text="[green]✓"),
+            TextColumn("{task.description}"),
+            BarColumn(),
+            TextColumn("{task.completed}/{task.total}"),
+            CustomTimeElapsedColumn(),
+            "/",
+            CustomTimeRemainingColumn(),
+            console=console
+    ) as progress:
+        task = progress.add_task(description="Running script...", total=total)
+        for result in ScriptRunner.run_batch(
+                script, data_paths, input_sets,
+                time_from=int(time_from.replace(tzinfo=UTC).timestamp()) if time_from else None,
+                time_to=int(time_to.replace(tzinfo=UTC).timestamp()) if time_to else None,
+                workers=workers, summary_path=summary_path, sys_paths=sys_paths):
+            if result.error:
+                errors += 1
+                progress.console.print(f"[red]{result.data_path.name}: {result.error}[/red]")
+            progress.advance(task)
+
+    console.print(f"Summary saved to [bold]{summary_path}[/bold]")
+    if errors:
+        secho(f"{errors} of {total} runs failed!", fg="red", err=True)
+        raise Exit(1)
@@ -0,0 +1,39 @@
+from rich.console import Console
+from rich.table import Table
+
+from ...core.profiler import Profiler
+
+__all__ = ['print_profile']
+
+
+def print_profile(console: Console, profiler: Profiler, limit: int = 30):
+    """
+    Print the result of profiling as a table
+
+    :param console: The console to print to
+    :param profiler: The profiler
+    :param limit: Maximum number of rows
+    """
+    bars = profiler.bars
+    entries = profiler.report()
+    total = profiler.total
+
+    table = Table(title=f"Profile ({bars} bars)", show_header=True, header_style="bold magenta")
+    table.add_column("Function")
+    table.add_column("Location")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Per bar", justify="right")
+    table.add_column("%", justify="right")
+    for entry in entries[:limit]:
+        table.add_row(
+            entry.name,
+            entry.location,
+            str(entry.calls),
+            f"{entry.total * 1000:.2f} ms",
+            f"{entry.total / bars * 1e6:.2f} µs" if bars else "",
+            f"{entry.total / total * 100:.1f}" if total else "",
+        )
+    console.print(table)
+    if len(entries) > limit:
+        console.print(f"... and {len(entries) - limit} more")
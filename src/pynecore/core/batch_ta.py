@@ -0,0 +1,385 @@
+"""
+Whole-history (columnar) calculation of TA functions for indicator scripts
+
+The script is analyzed after the AST transformation. Every `lib.ta.*` call site in `main()` which
+
+ - calls a supported function,
+ - is called on every bar (not in conditional code, loops or after a possible early return),
+ - has a built-in price source (`lib.close`, `lib.hl2`, ...) as source and constant other arguments
+
+is calculated in advance over the whole data with NumPy. While the script runs, the isolated function of
+these call sites is replaced by a lookup into the precalculated values, so the `main()` function still runs
+on every bar and produces the same output. All other calls run bar by bar as usual.
+"""
+from typing import Any, Callable, Iterable, TYPE_CHECKING
+import ast
+import math
+from pathlib import Path
+from types import ModuleType
+
+# NumPy is optional, without it batch mode is not available
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:
+    np = None
+
+from ..types.na import NA
+from ..types.ohlcv import OHLCV
+
+if TYPE_CHECKING:
+    from ..core.syminfo import SymInfo
+    from ..core.ohlcv_file import OHLCVColumns
+
+__all__ = ['is_available', 'find_batch_calls', 'calculate_batch_calls', 'BatchCall']
+
+# Sources can be used as the 1st argument
+SOURCES = ('open', 'high', 'low', 'close', 'volume', 'hl2', 'hlc3', 'ohlc4', 'hlcc4')
+
+
+def is_available() -> bool:
+    """
+    Check if batch calculation is available (NumPy is installed)
+    """
+    return np is not None
+
+
+#
+# Calculations
+#
+# They return float64 arrays, NA values are NaN. The warm-up periods (where the result is NA) are the same
+# as in `lib.ta`. Running sums and recursions are calculated with the same floating point operations in
+# the same order as the bar-by-bar implementations, so the results are exactly the same.
+#
+
+def _kahan_add(summ: float, comp: float, value: float) -> tuple[float, float]:
+    """
+    Kahan summation step, the same as the transformed `+=` of persistent variables
+    """
+    corrected = value - comp
+    new_sum = summ + corrected
+    return new_sum, (new_sum - summ) - corrected
+
+
+def _sma(x: 'np.ndarray', length: int) -> 'np.ndarray':
+    length = int(length)
+    values = x.tolist()
+    out = [math.nan] * len(values)
+    if length == 1:
+        return np.array([round(v, 15) for v in values])
+    # Kahan summation, the same way as `lib.math.sum()`
+    summ = comp = 0.0
+    for i, v in enumerate(values):
+        if i >= length:
+            summ, comp = _kahan_add(summ, comp, -values[i - length])
+        summ, comp = _kahan_add(summ, comp, v)
+        if i >= length - 1:
+            out[i] = round(summ / length, 15)
+    return np.array(out)
+
+
+def _ema(x: 'np.ndarray', length: int, alpha: float | None = None) -> 'np.ndarray':
+    length = int(length)
+    if length == 1:
+        return x.copy()
+    alpha = alpha or (2 / (length + 1))
+    res = _sma(x, length)
+    if len(x) <= length:
+        return res
+    values = x.tolist()
+    out = res.tolist()
+    last = out[length - 1]
+    for i in range(length, len(values)):
+        last = alpha * values[i] + (1 - alpha) * last
+        out[i] = last
+    return np.array(out)
+
+
+def _rma(x: 'np.ndarray', length: int) -> 'np.ndarray':
+    return _ema(x, length, 1 / length)
+
+
+def _wma(x: 'np.ndarray', length: int) -> 'np.ndarray':
+    length = int(length)
+    values = x.tolist()
+    out = [math.nan] * len(values)
+    denom = length * (length + 1) / 2
+    # Persistent `+=` is Kahan summation, `-=` is not
+    summ = weighted_summ = summ_c = weighted_summ_c = 0.0
+    for i, v in enumerate(values):
+        if i < length:
+            summ, summ_c = _kahan_add(summ, summ_c, v)
+            weighted_summ, weighted_summ_c = _kahan_add(weighted_summ, weighted_summ_c, v * (i + 1))
+            if i < length - 1:
+                continue
+        else:
+            old_summ = summ
+            summ -= values[i - length] - v
+            weighted_summ -= old_summ - length * v
+        out[i] = weighted_summ / denom
+    return np.array(out)
+
+
+def _rsi(x: 'np.ndarray', length: int) -> 'np.ndarray':
+    res = np.full(len(x), np.nan)
+    if len(x) < 2:
+        return res
+    diff = x[1:] - x[:-1]
+    rma_u = _rma(np.maximum(diff, 0.0), length)
+    rma_d = _rma(np.maximum(-diff, 0.0), length)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Division by zero is NA in Pine Script
+        rs = np.where(rma_d == 0.0, np.nan, rma_u / rma_d)
+    res[1:] = 100 - 100 / (1 + rs)
+    return res
+
+
+def _change(x: 'np.ndarray', length: int = 1) -> 'np.ndarray':
+    length = int(length)
+    # Python's `round()` is used (not `np.round()`) to get the same result as `lib.ta.change()`
+    values = [round(v, 14) for v in x.tolist()]
+    out = [math.nan] * length + [round(values[i] - values[i - length], 14) for i in range(length, len(values))]
+    return np.array(out[:len(values)])
+
+
+def _highest(x: 'np.ndarray', length: int) -> 'np.ndarray':
+    length = int(length)
+    res = np.full(len(x), np.nan)
+    if len(x) >= length:
+        res[length - 1:] = sliding_window_view(x, length).max(axis=1)
+    return res
+
+
+def _lowest(x: 'np.ndarray', length: int) -> 'np.ndarray':
+    length = int(length)
+    res = np.full(len(x), np.nan)
+    if len(x) >= length:
+        res[length - 1:] = sliding_window_view(x, length).min(axis=1)
+    return res
+
+
+def _cum(x: 'np.ndarray') -> 'np.ndarray':
+    out = []
+    summ = comp = 0.0
+    for v in x.tolist():
+        summ, comp = _kahan_add(summ, comp, v)
+        out.append(summ)
+    return np.array(out)
+
+
+# Supported functions: name -> (implementation, number of constant arguments after the source)
+SUPPORTED_FUNCTIONS: dict[str, tuple[Callable[..., Any], tuple[int, ...]]] = {
+    'sma': (_sma, (1,)),
+    'ema': (_ema, (1,)),
+    'rma': (_rma, (1,)),
+    'wma': (_wma, (1,)),
+    'rsi': (_rsi, (1,)),
+    'change': (_change, (0, 1)),
+    'mom': (_change, (1,)),
+    'highest': (_highest, (1,)),
+    'lowest': (_lowest, (1,)),
+    'cum': (_cum, (0,)),
+}
+
+
+#
+# Script analysis
+#
+
+class BatchCall:
+    """
+    A call site which can be calculated in batch
+    """
+
+    __slots__ = ('call_id', 'function', 'source', 'args')
+
+    def __init__(self, call_id: str, function: str, source: str, args: tuple[int | float, ...]):
+        self.call_id = call_id
+        self.function = function
+        self.source = source
+        self.args = args
+
+    def __repr__(self):
+        return f"BatchCall({self.call_id!r}, ta.{self.function}({self.source}, {', '.join(map(str, self.args))}))"
+
+
+def _is_lib_attr(node: ast.AST, *path: str) -> bool:
+    """
+    Check if the node is `lib.<path[0]>.<path[1]>...`
+    """
+    for name in reversed(path):
+        if not isinstance(node, ast.Attribute) or node.attr != name:
+            return False
+        node = node.value
+    return isinstance(node, ast.Name) and node.id == 'lib'
+
+
+def _match_call(node: ast.Call) -> BatchCall | None:
+    """
+    Match `isolate_function(lib.ta.<func>, '<call_id>', ...)(lib.<source>, <constants>...)`
+    """
+    inner = node.func
+    if not (isinstance(inner, ast.Call) and isinstance(inner.func, ast.Name)
+            and inner.func.id == 'isolate_function' and len(inner.args) >= 2):
+        return None
+    func, call_id = inner.args[0], inner.args[1]
+    if not (isinstance(call_id, ast.Constant) and isinstance(call_id.value, str)):
+        return None
+    if not (isinstance(func, ast.Attribute) and _is_lib_attr(func.value, 'ta')
+            and func.attr in SUPPORTED_FUNCTIONS):
+        return None
+    if node.keywords or not node.args:
+        return None
+
+    source = node.args[0]
+    if not (isinstance(source, ast.Attribute) and source.attr in SOURCES and _is_lib_attr(source, source.attr)):
+        return None
+
+    args = []
+    for arg in node.args[1:]:
+        if not (isinstance(arg, ast.Constant) and type(arg.value) in (int, float)):
+            return None
+        args.append(arg.value)
+    if len(args) not in SUPPORTED_FUNCTIONS[func.attr][1]:
+        return None
+    if any(a <= 0 for a in args):
+        return None
+
+    return BatchCall(call_id.value, func.attr, source.attr, tuple(args))
+
+
+def _collect_calls(node: ast.AST, result: list[BatchCall]) -> None:
+    """
+    Collect batch calls from an expression, which is evaluated on every bar
+    """
+    # These are evaluated conditionally or not at all
+    if isinstance(node, (ast.IfExp, ast.BoolOp, ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp,
+                         ast.GeneratorExp)):
+        return
+    if isinstance(node, ast.Call):
+        call = _match_call(node)
+        if call is not None:
+            result.append(call)
+    for child in ast.iter_child_nodes(node):
+        _collect_calls(child, result)
+
+
+def find_batch_calls(tree: ast.Module) -> list[BatchCall]:
+    """
+    Find call sites in the `main()` function of a transformed module, which can be calculated in batch
+
+    :param tree: The transformed module
+    :return: List of batch calls
+    """
+    main = next((node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == 'main'), None)
+    if main is None:
+        return []
+
+    result: list[BatchCall] = []
+    for stmt in main.body:
+        if isinstance(stmt, (ast.Assign, ast.AnnAssign, ast.AugAssign, ast.Expr, ast.Return)):
+            if stmt.value is not None:
+                _collect_calls(stmt.value, result)
+            if isinstance(stmt, ast.Return):
+                break
+        elif any(isinstance(n, (ast.Return, ast.Raise)) for n in ast.walk(stmt)):
+            # Statements after a possible early return are not executed on every bar
+            break
+
+    # A call ID must be unique, if not (e.g. it is called more times), it can't be calculated in batch
+    counts: dict[str, int] = {}
+    for call in result:
+        counts[call.call_id] = counts.get(call.call_id, 0) + 1
+    return [call for call in result if counts[call.call_id] == 1]
+
+
+def find_batch_calls_in_script(script_path: Path) -> list[BatchCall]:
+    """
+    Find call sites of a script file, which can be calculated in batch
+
+    :param script_path: Path of the script
+    :return: List of batch calls
+    """
+    from .import_hook import transform_ast
+
+    tree = ast.parse(script_path.read_text())
+    tree._module_file_path = str(script_path.resolve())  # type: ignore
+    return find_batch_calls(transform_ast(tree))
+
+
+#
+# Runtime
+#
+
+def get_source_columns(candles: Iterable[OHLCV], syminfo: 'SymInfo') -> dict[str, 'np.ndarray']:
+    """
+    Create the source columns from candles, the same way as `lib` properties are set on every bar
+
+    :param candles: The candles
+    :param syminfo: Symbol info, the prices are rounded by its pricescale
+    :return: Dictionary of source columns
+    """
+    data = np.array([candle[:6] for candle in candles], dtype=np.float64).reshape(-1, 6)
+    return _price_columns(data[:, 1], data[:, 2], data[:, 3], data[:, 4], data[:, 5], syminfo)
+
+
+def get_source_columns_from_arrays(columns: 'OHLCVColumns', syminfo: 'SymInfo') -> dict[str, 'np.ndarray']:
+    """
+    Create the source columns from the columns of an OHLCV file range (see `OHLCVRange.as_arrays()`),
+    without creating per-bar Python objects
+
+    :param columns: The OHLCV columns
+    :param syminfo: Symbol info, the prices are rounded by its pricescale
+    :return: Dictionary of source columns
+    """
+    return _price_columns(*(np.asarray(column, dtype=np.float64) for column in columns[1:]), syminfo)
+
+
+def _price_columns(o: 'np.ndarray', h: 'np.ndarray', l: 'np.ndarray', c: 'np.ndarray', volume: 'np.ndarray',
+                   syminfo: 'SymInfo') -> dict[str, 'np.ndarray']:
+    """
+    Round the prices and calculate the derived sources
+    """
+    pricescale = syminfo.pricescale
+    o, h, l, c = (np.round(column * pricescale) / pricescale for column in (o, h, l, c))
+    return {
+        'open': o, 'high': h, 'low': l, 'close': c, 'volume': volume,
+        'hl2': (h + l) / 2.0,
+        'hlc3': (h + l + c) / 3.0,
+        'ohlc4': (o + h + l + c) / 4.0,
+        'hlcc4': (h + l + 2 * c) / 4.0,
+    }
+
+
+class PrecalculatedCall:
+    """
+    Replacement of an isolated function, it returns the precalculated value of the current bar
+    """
+
+    __slots__ = ('values', 'lib')
+
+    def __init__(self, values: list[Any], lib: ModuleType):
+        self.values = values
+        self.lib = lib
+
+    def __call__(self, *_, **__):
+        return self.values[self.lib.bar_index]
+
+
+def calculate_batch_calls(calls: list[BatchCall], columns: dict[str, 'np.ndarray'], lib: ModuleType) \
+        -> dict[str, PrecalculatedCall]:
+    """
+    Calculate batch calls
+
+    :param calls: The batch calls
+    :param columns: The source columns
+    :param lib: The lib module, it is used to get the current bar index
+    :return: Dictionary of call IDs and their precalculated replacement
+    """
+    na = NA(float)
+    result = {}
+    for call in calls:
+        func = SUPPORTED_FUNCTIONS[call.function][0]
+        values = func(columns[call.source], *call.args)
+        result[call.call_id] = PrecalculatedCall([na if math.isnan(v) else v for v in values.tolist()], lib)
+    return result
@@ -0,0 +1,365 @@
+"""
+Binary columnar output files
+
+A faster and smaller alternative of CSV files for plot data, trades and equity. Values are not formatted as text,
+they are stored in typed fixed width columns, which can be loaded directly into arrays (e.g. for NumPy or pandas).
+
+File format (little endian)::
+
+    b"PYNECOL1"
+    uint32 length of the schema, schema as UTF-8 JSON: {"columns": [{"name": "time", "type": "q"}, ...]}
+    chunks:
+        uint32 number of rows
+        every column:
+            "q" (int64) and "d" (float64) columns: the values
+            "s" (string) columns: uint32 byte lengths of the values, then the UTF-8 bytes of all values
+
+NA values are stored as NaN in float columns and as `INT_NA` in integer columns.
+"""
+from __future__ import annotations
+from typing import Any, Iterable, Optional
+from array import array
+from datetime import datetime
+from pathlib import Path
+import json
+import math
+import struct
+import sys
+
+from pynecore.types.ohlcv import OHLCV
+from pynecore.types.na import NA
+
+__all__ = ['ColumnarWriter', 'ColumnarReader', 'COLUMNAR_SUFFIX', 'INT_NA']
+
+MAGIC = b"PYNECOL1"
+COLUMNAR_SUFFIX = ".pcol"
+
+# NA value of integer columns
+INT_NA = -2 ** 63
+
+_COUNT = struct.Struct('<I')
+_SWAP = sys.byteorder != 'little'
+_OHLCV_HEADERS = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+
+def _to_float(value: Any) -> float:
+    """Convert a value of a float column"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_int(value: Any) -> int:
+    """Convert a value of an integer column"""
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):
+        return INT_NA
+
+
+def _to_str(value: Any) -> str:
+    """Convert a value of a string column"""
+    if value is None or isinstance(value, NA):
+        return ''
+    return str(value)
+
+
+_CONVERTERS = {'d': _to_float, 'q': _to_int, 's': _to_str}
+
+
+def _type_of(value: Any) -> str:
+    """Guess the column type from a value"""
+    if isinstance(value, str):
+        return 's'
+    if isinstance(value, (bool, int, datetime)):
+        return 'q'
+    if isinstance(value, (float, NA)) or value is None:
+        return 'd'
+    return 's'
+
+
+def _pack_numbers(typecode: str, values: list) -> bytes:
+    data = array(typecode, values)
+    if _SWAP:
+        data.byteswap()
+    return data.tobytes()
+
+
+class ColumnarWriter:
+    """
+    Writer of binary columnar files.
+
+    It has the same write methods as `CSVWriter`, so it can be used as an output sink of `ScriptRunner`.
+    Rows are collected in memory and written in chunks. If headers are given, the schema is written when the file
+    is opened (columns without a given type are floats), so a file without rows can be read as well. Otherwise the
+    headers and types are taken from the first written row.
+    """
+
+    __slots__ = ('path', '_file', '_headers', '_types', '_chunk_size', '_columns', '_converters', '_rows',
+                 '_has_schema')
+
+    def __init__(self, path: Path, *,
+                 headers: tuple | list | None = None,
+                 types: dict[str, str] | None = None,
+                 chunk_size: int = 8192):
+        """
+        :param path: Output file path
+        :param headers: Optional list of column names
+        :param types: Optional types of the columns by name: "q" (int64), "d" (float64) or "s" (string)
+        :param chunk_size: Number of rows in a chunk
+        """
+        self.path = path
+        self._file = None
+        self._headers: list[str] | None = list(headers) if headers else None
+        self._types: dict[str, str] = dict(types) if types else {}
+        self._chunk_size = chunk_size
+        self._columns: list[list] = []
+        self._converters: list = []
+        self._rows = 0
+        self._has_schema = False
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def is_open(self) -> bool:
+        """Check if the writer is open"""
+        return self._file is not None
+
+    def open(self) -> ColumnarWriter:
+        """Open the file for writing, the schema is written if the headers are known"""
+        if self._file is None:
+            self._file = open(self.path, 'wb')
+            self._has_schema = False
+            self._rows = 0
+            if self._headers is not None:
+                self._init_schema(self._headers, ())
+        return self
+
+    def _init_schema(self, headers: Iterable[str], values: Iterable[Any], default_type: str | None = None):
+        """
+        Write the schema, the missing types are guessed from the values of the first row
+        """
+        if self._headers is None:
+            self._headers = list(headers)
+        types = self._types
+        for name, value in zip(self._headers, values):
+            if name not in types:
+                types[name] = 's' if isinstance(value, str) else default_type or _type_of(value)
+        for name in self._headers:
+            types.setdefault(name, 'd')
+
+        self._columns = [[] for _ in self._headers]
+        self._converters = [_CONVERTERS[types[name]] for name in self._headers]
+
+        assert self._file is not None
+        self._has_schema = True
+        schema = json.dumps({'columns': [{'name': name, 'type': types[name]} for name in self._headers]})
+        schema_bytes = schema.encode('utf-8')
+        self._file.write(MAGIC + _COUNT.pack(len(schema_bytes)) + schema_bytes)
+
+    def _append(self, values: Iterable[Any]):
+        """Add a row"""
+        for column, convert, value in zip(self._columns, self._converters, values):
+            column.append(value if type(value) is float and convert is _to_float else convert(value))
+        self._rows += 1
+        if self._rows >= self._chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write the collected rows as a chunk"""
+        if not self._rows:
+            return
+        assert self._headers is not None and self._file is not None
+        parts = [_COUNT.pack(self._rows)]
+        for name, column in zip(self._headers, self._columns):
+            typecode = self._types[name]
+            if typecode == 's':
+                encoded = [value.encode('utf-8') for value in column]
+                parts.append(_pack_numbers('I', [len(value) for value in encoded]))
+                parts.append(b''.join(encoded))
+            else:
+                parts.append(_pack_numbers(typecode, column))
+            column.clear()
+        self._file.write(b''.join(parts))
+        self._rows = 0
+
+    def write(self, *data: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Write a row
+
+        :param data: The values of the row, in the order of the headers
+        :param timeout: Not used, only for compatibility with `CSVWriter`
+        :return: Always True
+        """
+        if self._file is None:
+            raise RuntimeError("Writer not opened!")
+        if not self._has_schema:
+            raise ValueError("No headers provided!")
+        self._append(data)
+        return True
+
+    def write_dict(self, data: dict[str, Any], timeout: Optional[float] = None) -> bool:
+        """
+        Write a row from a dict, missing keys are written as NA
+
+        :param data: The values of the row by column names
+        :param timeout: Not used, only for compatibility with `CSVWriter`
+        :return: Always True
+        """
+        if self._file is None:
+            raise RuntimeError("Writer not opened!")
+        if not self._has_schema:
+            self._init_schema(data.keys(), data.values())
+            self._append(data.values())
+        else:
+            self._append([data.get(name) for name in self._headers])  # type: ignore
+        return True
+
+    def write_ohlcv(self, candle: OHLCV, timeout: Optional[float] = None) -> bool:
+        """
+        Write an OHLCV record with its extra fields
+
+        :param candle: The OHLCV record to write
+        :param timeout: Not used, only for compatibility with `CSVWriter`
+        :return: Always True
+        """
+        return self.write_plot(candle, {})
+
+    def write_plot(self, candle: OHLCV, plot_data: dict[str, Any], timeout: Optional[float] = None) -> bool:
+        """
+        Write an OHLCV record with its extra fields and the plot data of the bar.
+
+        The values are copied at once, so the plot data can be changed after the call.
+
+        :param candle: The OHLCV record
+        :param plot_data: The plotted values by title
+        :param timeout: Not used, only for compatibility with `CSVWriter`
+        :return: Always True
+        """
+        if self._file is None:
+            raise RuntimeError("Writer not opened!")
+        extra_fields = candle.extra_fields
+        if not self._has_schema:
+            fields = dict(extra_fields) if extra_fields else {}
+            fields.update(plot_data)
+            self._types.setdefault('time', 'q')
+            # Plotted values are floats, even if the first one is an int or NA
+            self._init_schema((*_OHLCV_HEADERS, *fields.keys()), (*candle[:6], *fields.values()), 'd')
+            self._append((*candle[:6], *fields.values()))
+            return True
+
+        values = list(candle[:6])
+        for name in self._headers[6:]:  # type: ignore
+            value = plot_data.get(name, NA)
+            if value is NA and extra_fields:
+                value = extra_fields.get(name)
+            values.append(value)
+        self._append(values)
+        return True
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Write the remaining rows and close the file, a file without rows and headers gets an empty schema
+
+        :param timeout: Not used, only for compatibility with `CSVWriter`
+        """
+        if self._file is None:
+            return
+        try:
+            if not self._has_schema:
+                self._init_schema((), ())
+            self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+
+class ColumnarReader:
+    """
+    Reader of binary columnar files
+    """
+
+    __slots__ = ('path', 'headers', 'types', '_data')
+
+    def __init__(self, path: Path):
+        """
+        :param path: The file path
+        """
+        self.path = path
+        self.headers: list[str] = []
+        self.types: dict[str, str] = {}
+        self._data: memoryview | None = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self) -> ColumnarReader:
+        """Open the file and read its schema"""
+        data = memoryview(Path(self.path).read_bytes())
+        if bytes(data[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"Not a columnar file: {self.path}")
+        (schema_size,) = _COUNT.unpack_from(data, len(MAGIC))
+        start = len(MAGIC) + _COUNT.size
+        schema = json.loads(bytes(data[start:start + schema_size]).decode('utf-8'))
+        self.headers = [column['name'] for column in schema['columns']]
+        self.types = {column['name']: column['type'] for column in schema['columns']}
+        self._data = data[start + schema_size:]
+        return self
+
+    def read(self) -> dict[str, array | list[str]]:
+        """
+        Read all columns
+
+        :return: The values by column name, arrays for numeric columns, lists for string columns
+        """
+        if self._data is None:
+            self.open()
+        data = self._data
+        assert data is not None
+
+        columns: dict[str, array | list[str]] = {
+            name: [] if typecode == 's' else array(typecode) for name, typecode in self.types.items()
+        }
+        pos = 0
+        while pos < len(data):
+            (rows,) = _COUNT.unpack_from(data, pos)
+            pos += _COUNT.size
+            for name in self.headers:
+                typecode = self.types[name]
+                column = columns[name]
+                if typecode == 's':
+                    lengths = array('I')
+                    lengths.frombytes(data[pos:pos + rows * lengths.itemsize])
+                    if _SWAP:
+                        lengths.byteswap()
+                    pos += rows * lengths.itemsize
+                    for length in lengths:
+                        column.append(bytes(data[pos:pos + length]).decode('utf-8'))  # type: ignore
+                        pos += length
+                else:
+                    values = array(typecode)
+                    size = rows * values.itemsize
+                    values.frombytes(data[pos:pos + size])
+                    if _SWAP:
+                        values.byteswap()
+                    column.extend(values)  # type: ignore
+                    pos += size
+        return columns
+
+    def close(self):
+        """Close the file"""
+        if self._data is not None:
+            self._data.release()
+            self._data = None
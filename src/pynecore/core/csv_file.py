@@ -265,6 +265,20 @@ class CSVWriter:
         except queue.Full:
             return False
 
+    def write_plot(self, candle: OHLCV, plot_data: dict[str, Any], timeout: Optional[float] = None) -> bool:
+        """
+        Write an OHLCV record with the plot data of the bar as extra fields.
+
+        :param candle: The OHLCV record to write
+        :param plot_data: The plotted values by title, it is copied, so it can be changed after the call
+        :param timeout: Optional timeout in seconds
+        :return: True if write command was queued, False on timeout
+        :raises RuntimeError: If writer thread has died with an error
+        """
+        extra_fields = {} if candle.extra_fields is None else dict(candle.extra_fields)
+        extra_fields.update(plot_data)
+        return self.write_ohlcv(candle._replace(extra_fields=extra_fields), timeout=timeout)
+
     def close(self, timeout: Optional[float] = None):
         """
         Close the CSV file and stop the worker thread.
@@ -69,7 +69,8 @@ class DataConverter:
             force: bool = False,
             provider: str | None = None,
             symbol: str | None = None,
-            timezone: str = "UTC"
+            timezone: str = "UTC",
+            workers: int | None = None
     ) -> None:
         """
         Convert multiple file formats to OHLCV format.
@@ -79,6 +80,7 @@ class DataConverter:
         :param provider: Data provider name for OHLCV file naming
         :param symbol: Symbol for OHLCV file naming
         :param timezone: Timezone for timestamp conversion
+        :param workers: Number of worker processes to parse big CSV and TXT files, default is the number of CPUs
         :raises FileNotFoundError: If source file doesn't exist
         :raises DataFormatError: If file format is unsupported
         :raises ConversionError: If conversion fails
@@ -123,13 +125,13 @@ class DataConverter:
 
         try:
             # Perform conversion directly to target file with truncate to clear existing data
-            with OHLCVWriter(ohlcv_path, truncate=True) as ohlcv_writer:
+            with OHLCVWriter(ohlcv_path, truncate=True, index=True) as ohlcv_writer:
                 if detected_format == 'csv':
-                    ohlcv_writer.load_from_csv(file_path, tz=timezone)
+                    ohlcv_writer.load_from_csv(file_path, tz=timezone, workers=workers)
                 elif detected_format == 'json':
                     ohlcv_writer.load_from_json(file_path, tz=timezone)
                 elif detected_format == 'txt':
-                    ohlcv_writer.load_from_txt(file_path, tz=timezone)
+                    ohlcv_writer.load_from_txt(file_path, tz=timezone, workers=workers)
                 else:
                     raise ConversionError(f"Unsupported format for conversion: {detected_format}")
 
@@ -1,6 +1,6 @@
 import re
 from zoneinfo import ZoneInfo
-from datetime import datetime, UTC
+from datetime import datetime, date, timedelta, tzinfo, UTC
 from functools import lru_cache
 from ..lib import syminfo
 
@@ -160,3 +160,138 @@ def parse_datestring(datestring: str) -> datetime:
         "- RFC Style: '20 Feb 2020 15:30:00 GMT+0200'\n"
         "- Simple Pine: 'Feb 01 2020 22:10:05', '2020-02-20'"
     )
+
+
+# The longest time a UTC offset segment is searched for a transition, fixed offset zones have no transitions
+_MAX_SEGMENT_SECONDS = 400 * 24 * 60 * 60
+_DAY_SECONDS = 24 * 60 * 60
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+
+
+class TimeContext:
+    """
+    Time of the current bar in a timezone.
+
+    The UTC offset is constant between the transitions of the timezone, so it is calculated only when the time
+    leaves the current offset segment. The local time fields are calculated from the local seconds with integer
+    arithmetic, the `datetime` object is only created if it is needed.
+    """
+
+    __slots__ = ('tz', 'timestamp', 'offset', 'local_seconds', '_segment_start', '_segment_end', '_datetime',
+                 '_date')
+
+    def __init__(self, tz: tzinfo):
+        """
+        :param tz: The timezone of the local time
+        """
+        self.tz = tz
+        self._segment_start = self._segment_end = 0
+        self.timestamp: int | float = 0
+        self.offset = 0
+        self.local_seconds = 0
+        self._datetime: datetime | None = None
+        self._date: date | None = None
+        self.set(0)
+
+    def _utc_offset(self, timestamp: int) -> int:
+        """
+        Get the UTC offset of the timezone in seconds at a UNIX timestamp
+        """
+        offset = datetime.fromtimestamp(timestamp, self.tz).utcoffset()
+        assert offset is not None
+        return offset.days * _DAY_SECONDS + offset.seconds
+
+    def _find_segment(self, timestamp: int):
+        """
+        Find the UTC offset and the time until it is valid, starting from the timestamp
+        """
+        offset = self._utc_offset(timestamp)
+        end = timestamp + _MAX_SEGMENT_SECONDS
+        # Find the day of the next transition, then the exact second of it
+        t = timestamp
+        while t < end:
+            if self._utc_offset(t + _DAY_SECONDS) != offset:
+                lo, hi = t, t + _DAY_SECONDS
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if self._utc_offset(mid) == offset:
+                        lo = mid
+                    else:
+                        hi = mid
+                end = hi
+                break
+            t += _DAY_SECONDS
+        self.offset = offset
+        self._segment_start = timestamp
+        self._segment_end = end
+
+    def set(self, timestamp: int | float):
+        """
+        Set the current time
+
+        :param timestamp: UNIX timestamp in seconds
+        """
+        seconds = int(timestamp)
+        if not self._segment_start <= seconds < self._segment_end:
+            self._find_segment(seconds)
+        self.timestamp = timestamp
+        self.local_seconds = seconds + self.offset
+        self._datetime = None
+        self._date = None
+
+    @property
+    def local_datetime(self) -> datetime:
+        """
+        The current local time as a naive datetime
+        """
+        return _NAIVE_EPOCH + timedelta(seconds=self.local_seconds)
+
+    @property
+    def date(self) -> date:
+        """
+        The current local date
+        """
+        if self._date is None:
+            self._date = date.fromordinal(self.local_seconds // _DAY_SECONDS + _EPOCH_ORDINAL)
+        return self._date
+
+    @property
+    def year(self) -> int:
+        return self.date.year
+
+    @property
+    def month(self) -> int:
+        return self.date.month
+
+    @property
+    def day(self) -> int:
+        return self.date.day
+
+    @property
+    def hour(self) -> int:
+        return self.local_seconds % _DAY_SECONDS // 3600
+
+    @property
+    def minute(self) -> int:
+        return self.local_seconds % 3600 // 60
+
+    @property
+    def second(self) -> int:
+        return self.local_seconds % 60
+
+    def weekday(self) -> int:
+        """
+        The day of the week, Monday is 0 (like `datetime.weekday()`)
+        """
+        # 1970-01-01 was a Thursday
+        return (self.local_seconds // _DAY_SECONDS + 3) % 7
+
+    @property
+    def datetime(self) -> datetime:
+        """
+        The current time as a timezone aware datetime
+        """
+        if self._datetime is None:
+            self._datetime = datetime.fromtimestamp(self.timestamp, self.tz)
+        return self._datetime
@@ -0,0 +1,80 @@
+from typing import Generic, TypeVar, Iterator
+
+__all__ = ['DrawingRegistry']
+
+T = TypeVar('T')
+
+
+class DrawingRegistry(Generic[T]):
+    """
+    Registry of the drawing objects of a script (labels, lines, boxes, ...) in creation order.
+
+    Like in Pine Script, only the last `max_*_count` drawings (set in `script.indicator()` or
+    `script.strategy()`) are kept, the oldest ones are removed when new ones are created.
+    Objects are stored by identity, so adding and deleting is O(1).
+    """
+
+    __slots__ = ('_items', 'limit_name')
+
+    def __init__(self, limit_name: str | None = None):
+        """
+        :param limit_name: The name of the script attribute limiting the number of drawings, None for no limit
+        """
+        self._items: dict[int, T] = {}
+        self.limit_name = limit_name
+
+    @property
+    def limit(self) -> int | None:
+        """
+        The maximum number of drawings kept, None if there is no limit
+        """
+        from .. import lib
+        if self.limit_name is None or lib._script is None:
+            return None
+        return getattr(lib._script, self.limit_name, None)
+
+    def add(self, obj: T) -> T:
+        """
+        Add a new drawing, remove the oldest ones if the limit is reached
+
+        :param obj: The drawing object
+        :return: The same object
+        """
+        items = self._items
+        items[id(obj)] = obj
+        limit = self.limit
+        if limit is not None:
+            while len(items) > max(limit, 1):
+                del items[next(iter(items))]
+        return obj
+
+    def remove(self, obj: T) -> None:
+        """
+        Remove a drawing, it does nothing if it is already removed
+
+        :param obj: The drawing object
+        """
+        items = self._items
+        if items.get(id(obj)) is obj:
+            del items[id(obj)]
+
+    def all(self) -> list[T]:
+        """
+        Get all drawings, the oldest first
+        """
+        return list(self._items.values())
+
+    def clear(self) -> None:
+        """
+        Remove all drawings
+        """
+        self._items.clear()
+
+    def __contains__(self, obj: object) -> bool:
+        return self._items.get(id(obj)) is obj
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items.values())
@@ -1,21 +1,36 @@
 from typing import Callable
-from types import FunctionType
+from types import FunctionType, MethodType
 from dataclasses import is_dataclass, replace as dataclass_replace
 from copy import copy
 from .pine_export import Exported
-from .series import SeriesImpl
 
-__all__ = ['isolate_function', 'reset']
+__all__ = ['isolate_function', 'reset', 'set_precalculated']
 
 # Store all function instances
 _function_cache: dict[str | tuple, FunctionType] = {}
 
+# Replacements of isolated functions, whose results are calculated in advance (batch mode)
+_precalculated: dict[tuple, Callable] = {}
+
 
 def reset():
     """
     Reset all function instances
     """
     _function_cache.clear()
+    _precalculated.clear()
+
+
+def set_precalculated(parent_scope: str, functions: dict[str, Callable]):
+    """
+    Set replacements of call sites, whose results are calculated in advance
+
+    :param parent_scope: The scope ID of the module containing the call sites
+    :param functions: Dictionary of call IDs and their replacements
+    """
+    for call_id, func in functions.items():
+        # The call sites of batch mode are called once per bar, so the call counter is always 1
+        _precalculated[(parent_scope, call_id, 1)] = func
 
 
 def isolate_function(
@@ -44,6 +59,10 @@ def isolate_function(
     if hasattr(func, '__self__') and isinstance(func.__self__, type):
         return func  # type: ignore
 
+    # Bound methods of instances keep their state in the instance, and rebuilding them would lose `self`
+    if isinstance(func, MethodType):
+        return func  # type: ignore
+
     # Check if this is an Exported proxy and unwrap it
     if isinstance(func, Exported):
         unwrapped_func = func.__fn__
@@ -61,6 +80,13 @@ def isolate_function(
     else:
         call_id_key = parent_scope
 
+    # Precalculated call sites don't need to be isolated
+    if _precalculated:
+        try:
+            return _precalculated[call_id_key]  # type: ignore
+        except KeyError:
+            pass
+
     # If the function is overloaded, we need to remove the dispatcher from the cache to override it with implementation
     if is_overloaded:
         del _function_cache[call_id_key]
@@ -120,7 +146,7 @@ def isolate_function(
     try:
         for key in series_vars[qualname]:
             old_value = new_globals[key]
-            new_globals[key] = SeriesImpl(old_value._max_bars_back)  # noqa
+            new_globals[key] = type(old_value)(old_value._max_bars_back)  # noqa
     except KeyError:
         pass
 
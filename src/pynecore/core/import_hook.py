@@ -1,15 +1,232 @@
 from typing import cast
+from types import CodeType
 import os
 import sys
+import hashlib
 import importlib.util
 import importlib.machinery
+import importlib.metadata
+import io
+import marshal
 import re
+import tokenize
 from pathlib import Path
 
+# Environment variables which print or save the transformed code, the cache is not used if they are set
+DEBUG_ENV_VARS = ('PYNE_AST_DEBUG', 'PYNE_AST_DEBUG_RAW', 'PYNE_AST_SAVE')
+
+_pyne_re = re.compile(rb'@pyne\b')
+
+# Hash of the sources of the transformer pipeline, computed on first use
+_pipeline_version: str | None = None
+
+
+def pipeline_version() -> str:
+    """
+    Get the version of the AST transformer pipeline. It is the hash of the PyneCore version and the sources
+    the transformed code depends on: the import hook, the transformers, the `lib` package (wildcard imports are
+    resolved by its `__all__` lists) and the stdlib checker, so the cached code is invalidated by any change of them
+
+    :return: The hex digest of the sources
+    """
+    global _pipeline_version
+    if _pipeline_version is None:
+        package_dir = Path(__file__).parent.parent
+        transformers_dir = package_dir / 'transformers'
+        try:
+            version = importlib.metadata.version('pynesys-pynecore')
+        except importlib.metadata.PackageNotFoundError:
+            version = ''
+        h = hashlib.sha256(version.encode())
+        for path in [Path(__file__), *sorted(transformers_dir.glob('*.py')),
+                     *sorted(transformers_dir.glob('*.json')),
+                     *sorted((package_dir / 'lib').rglob('*.py')),
+                     package_dir / 'utils' / 'stdlib_checker.py']:
+            h.update(str(path.relative_to(package_dir)).encode())
+            h.update(path.read_bytes())
+        _pipeline_version = h.hexdigest()
+    return _pipeline_version
+
+
+def has_pyne_docstring(data: bytes) -> bool:
+    """
+    Check if a source is a Pyne module: its module docstring contains `@pyne`. Only the first tokens are read,
+    the source is not parsed.
+
+    :param data: The source code
+    :return: True if it is a Pyne module
+    """
+    if not _pyne_re.search(data):
+        return False
+    import ast
+    try:
+        for token in tokenize.tokenize(io.BytesIO(data).readline):
+            if token.type in (tokenize.ENCODING, tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE):
+                continue
+            if token.type != tokenize.STRING:
+                return False
+            docstring = ast.literal_eval(token.string)
+            return isinstance(docstring, str) and '@pyne' in docstring
+    except (tokenize.TokenError, SyntaxError, ValueError):
+        pass
+    return False
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory of the transformed code cache. It can be set by the `PYNE_CACHE_DIR` environment
+    variable, the default is `$XDG_CACHE_HOME/pynecore` (`~/.cache/pynecore`).
+
+    :return: The directory, separated by Python implementation and version
+    """
+    cache_dir = os.environ.get('PYNE_CACHE_DIR')
+    if cache_dir:
+        base = Path(cache_dir)
+    else:
+        base = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'pynecore'
+    return base / (sys.implementation.cache_tag or 'python')
+
+
+def get_cache_path(data: bytes, path: str, optimize: int = -1) -> Path:
+    """
+    Get the path of the cached transformed code of a source
+
+    :param data: The source code
+    :param path: The path of the source file
+    :param optimize: The optimization level of the compilation
+    :return: The path of the cache file, it is `<hash of the path>-<hash of everything>.pyc`
+    """
+    # Transformers use the path of the module (e.g. in the IDs of function calls)
+    path = str(Path(path).resolve())
+    path_hash = hashlib.sha256(path.encode()).hexdigest()[:16]
+    h = hashlib.sha256()
+    h.update(pipeline_version().encode())
+    h.update(importlib.util.MAGIC_NUMBER)
+    h.update(str(sys.flags.optimize if optimize == -1 else optimize).encode())
+    h.update(path.encode())
+    h.update(data)
+    return get_cache_dir() / f"{path_hash}-{h.hexdigest()[:32]}.pyc"
+
+
+def load_cached_code(cache_path: Path) -> CodeType | None:
+    """
+    Load transformed code from the cache
+
+    :param cache_path: The path of the cache file
+    :return: The code object or None if it is not in the cache
+    """
+    try:
+        data = cache_path.read_bytes()
+    except OSError:
+        return None
+    if data[:4] != importlib.util.MAGIC_NUMBER:
+        return None
+    try:
+        code = marshal.loads(data[4:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return code if isinstance(code, CodeType) else None
+
+
+def save_cached_code(cache_path: Path, code: CodeType):
+    """
+    Save transformed code to the cache, older versions of the same module are removed
+
+    :param cache_path: The path of the cache file
+    :param code: The code object
+    """
+    prefix = cache_path.name.split('-', 1)[0]
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        for old_path in cache_path.parent.glob(f"{prefix}-*.pyc"):
+            if old_path != cache_path:
+                old_path.unlink(missing_ok=True)
+        tmp_path.write_bytes(importlib.util.MAGIC_NUMBER + marshal.dumps(code))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def transform_ast(tree: 'ast.Module') -> 'ast.Module':
+    """
+    Run the Pyne AST transformer pipeline on a parsed module
+
+    :param tree: The parsed module, it is modified in place
+    :return: The transformed module
+    """
+    import ast
+
+    # Remove test cases from the output, because they can coorupt the output
+    transformed = tree
+    transformed.body = [node for node in transformed.body
+                        if not (isinstance(node, ast.FunctionDef)
+                                and node.name.startswith('__test_') and node.name.endswith('__'))]
+
+    # Transform AST - lazy import transformers only when needed
+    from pynecore.transformers.import_lifter import ImportLifterTransformer
+    from pynecore.transformers.import_normalizer import ImportNormalizerTransformer
+    from pynecore.transformers.persistent_series import PersistentSeriesTransformer
+    from pynecore.transformers.lib_series import LibrarySeriesTransformer
+    from pynecore.transformers.closure_arguments_transformer import ClosureArgumentsTransformer
+    from pynecore.transformers.function_isolation import FunctionIsolationTransformer
+    from pynecore.transformers.module_property import ModulePropertyTransformer
+    from pynecore.transformers.series import SeriesTransformer
+    from pynecore.transformers.unused_series_detector import UnusedSeriesDetectorTransformer
+    from pynecore.transformers.persistent import PersistentTransformer
+    from pynecore.transformers.input_transformer import InputTransformer
+    from pynecore.transformers.safe_convert_transformer import SafeConvertTransformer
+    from pynecore.transformers.safe_division_transformer import SafeDivisionTransformer
+    from pynecore.transformers.visitor import FusedTransformer, fix_missing_locations
+
+    transformed = ImportLifterTransformer().visit(transformed)
+    transformed = ImportNormalizerTransformer().visit(transformed)
+    transformed = PersistentSeriesTransformer().visit(transformed)
+    transformed = LibrarySeriesTransformer().visit(transformed)
+    transformed = ModulePropertyTransformer().visit(transformed)
+    transformed = ClosureArgumentsTransformer().visit(transformed)
+    transformed = FunctionIsolationTransformer().visit(transformed)
+    transformed = UnusedSeriesDetectorTransformer().optimize(transformed)
+    transformed = SeriesTransformer().visit(transformed)
+    transformed = PersistentTransformer().visit(transformed)
+    # These work bottom-up and don't depend on each other, so they run in a single walk of the tree
+    transformed = FusedTransformer(
+        InputTransformer(),
+        SafeConvertTransformer(),
+        SafeDivisionTransformer(),
+    ).visit(transformed)
+
+    fix_missing_locations(transformed)
+    return transformed
+
 
 class PyneLoader(importlib.machinery.SourceFileLoader):
     """Loader that handles AST transformation"""
 
+    def get_code(self, fullname: str) -> CodeType | None:
+        """
+        Get the code of the module. The transformed code of Pyne modules is cached by the hash of the source,
+        the transformer pipeline and the Python version, the standard bytecode cache is used for other modules.
+        """
+        source_path = self.get_filename(fullname)
+        try:
+            data = self.get_data(source_path)
+        except OSError:
+            return super().get_code(fullname)
+        if not has_pyne_docstring(data):
+            return super().get_code(fullname)
+
+        if any(os.environ.get(name) for name in DEBUG_ENV_VARS):
+            return self.source_to_code(data, source_path)
+
+        cache_path = get_cache_path(data, source_path)
+        code = load_cached_code(cache_path)
+        if code is None:
+            code = self.source_to_code(data, source_path)
+            if not sys.dont_write_bytecode:
+                save_cached_code(cache_path, code)
+        return code
+
     # noinspection PyMethodOverriding
     def source_to_code(self, data: bytes | str, path: str, *, _optimize: int = -1):
         """Transform source to code if needed"""
@@ -50,42 +267,7 @@ class PyneLoader(importlib.machinery.SourceFileLoader):
                 isinstance(cast(ast.Constant, cast(ast.Expr, tree.body[0]).value).value, str) and
                 '@pyne' in cast(ast.Constant, cast(ast.Expr, tree.body[0]).value).value):  # type: ignore
 
-            # Remove test cases from the output, because they can coorupt the output
-            transformed = tree
-            transformed.body = [node for node in transformed.body
-                                if not (isinstance(node, ast.FunctionDef)
-                                        and node.name.startswith('__test_') and node.name.endswith('__'))]
-
-            # Transform AST - lazy import transformers only when needed
-            from pynecore.transformers.import_lifter import ImportLifterTransformer
-            from pynecore.transformers.import_normalizer import ImportNormalizerTransformer
-            from pynecore.transformers.persistent_series import PersistentSeriesTransformer
-            from pynecore.transformers.lib_series import LibrarySeriesTransformer
-            from pynecore.transformers.closure_arguments_transformer import ClosureArgumentsTransformer
-            from pynecore.transformers.function_isolation import FunctionIsolationTransformer
-            from pynecore.transformers.module_property import ModulePropertyTransformer
-            from pynecore.transformers.series import SeriesTransformer
-            from pynecore.transformers.unused_series_detector import UnusedSeriesDetectorTransformer
-            from pynecore.transformers.persistent import PersistentTransformer
-            from pynecore.transformers.input_transformer import InputTransformer
-            from pynecore.transformers.safe_convert_transformer import SafeConvertTransformer
-            from pynecore.transformers.safe_division_transformer import SafeDivisionTransformer
-
-            transformed = ImportLifterTransformer().visit(transformed)
-            transformed = ImportNormalizerTransformer().visit(transformed)
-            transformed = PersistentSeriesTransformer().visit(transformed)
-            transformed = LibrarySeriesTransformer().visit(transformed)
-            transformed = ModulePropertyTransformer().visit(transformed)
-            transformed = ClosureArgumentsTransformer().visit(transformed)
-            transformed = FunctionIsolationTransformer().visit(transformed)
-            transformed = UnusedSeriesDetectorTransformer().optimize(transformed)
-            transformed = SeriesTransformer().visit(transformed)
-            transformed = PersistentTransformer().visit(transformed)
-            transformed = InputTransformer().visit(transformed)
-            transformed = SafeConvertTransformer().visit(transformed)
-            transformed = SafeDivisionTransformer().visit(transformed)
-
-            ast.fix_missing_locations(transformed)
+            transformed = transform_ast(tree)
 
             # Debug output if requested
             if os.environ.get('PYNE_AST_DEBUG'):
@@ -109,7 +291,6 @@ class PyneLoader(importlib.machinery.SourceFileLoader):
 
             tree = transformed
 
-        # Let Python handle bytecode caching
         return compile(tree, path, 'exec', optimize=_optimize)
 
 
@@ -10,34 +10,80 @@ The file is a binary file with the following 24 bytes structure:
  - volume:   float32 (4 bytes)
 
 The .ohlcv format cannot have gaps in it. All gaps are filled with the previous close price and -1 volume.
+
+The writer can maintain an optional `<file>.ohlcv.idx` sidecar index, which stores the runs of gap bars,
+so readers can jump over them and count real bars without unpacking the filler bars.
 """
-from typing import Iterator, cast
+from typing import Iterator, NamedTuple, Any, cast
 
 import csv
 import json
 import math
 import mmap
 import os
+import re
 import struct
-from collections import Counter
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from collections.abc import Iterable
+from contextlib import contextmanager
 try:
     from collections.abc import Buffer
 except ImportError:
     # Python < 3.12 compatibility: Buffer was added in 3.12
     Buffer = bytes  # type: ignore
 from datetime import datetime, time, timedelta, timezone as dt_timezone, UTC
-from io import BufferedWriter, BufferedRandom
+from io import BufferedWriter, BufferedRandom, BytesIO, TextIOWrapper
 from math import gcd as math_gcd
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+# NumPy is optional, it is only used for the columnar (bulk) read API
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from pynecore.types.ohlcv import OHLCV
 from ..core.syminfo import SymInfoInterval
 
 RECORD_SIZE = 24  # 6 * 4
 STRUCT_FORMAT = 'Ifffff'  # I: uint32, f: float32
+COLUMN_NAMES = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+READ_CHUNK_SIZE = 4096  # Number of records unpacked at once by the batched reader
+WRITE_BUFFER_SIZE = 4096  # Number of records collected in memory by the buffered writer
+PARALLEL_CHUNK_SIZE = 16 * 1024 * 1024  # Bytes of text parsed by one job, bigger files are parsed in parallel
+
+# Precompiled record struct
+_record_struct = struct.Struct(STRUCT_FORMAT)
+
+INDEX_SUFFIX = '.idx'
+INDEX_MAGIC = b'PYNX'
+INDEX_VERSION = 1
+# magic, version, number of records, mtime of the data file (ns), number of gap runs
+_index_header_struct = struct.Struct('=4sH2xQqQ')
+
+# Structured dtype with the same layout as STRUCT_FORMAT (native byte order, no padding)
+RECORD_DTYPE = np.dtype([('timestamp', '=u4'), ('open', '=f4'), ('high', '=f4'),
+                         ('low', '=f4'), ('close', '=f4'), ('volume', '=f4')]) if np is not None else None
+
+__all__ = ['OHLCVWriter', 'OHLCVReader', 'OHLCVColumns', 'OHLCVIndex', 'OHLCVRange']
+
+
+class OHLCVColumns(NamedTuple):
+    """
+    Column views of an OHLCV file range
 
-__all__ = ['OHLCVWriter', 'OHLCVReader']
+    Every column is a NumPy array if NumPy is installed, otherwise a (strided) `memoryview`.
+    The columns are views of the memory mapped file, so they are only valid while the reader is open.
+    """
+    timestamp: Any
+    open: Any
+    high: Any
+    low: Any
+    close: Any
+    volume: Any
 
 
 def _format_float(value: float) -> str:
@@ -45,6 +91,24 @@ def _format_float(value: float) -> str:
     return f"{value:.8g}"
 
 
+# Common timestamp formats, in the order they are tried
+TIMESTAMP_FORMATS = (
+    '%Y-%m-%d %H:%M:%S%z',  # 2024-01-08 19:00:00+0000
+    '%Y-%m-%d %H:%M:%S%Z',  # 2024-01-08 19:00:00UTC
+    '%Y-%m-%dT%H:%M:%S%z',  # 2024-01-08T19:00:00+0000
+    '%Y-%m-%d %H:%M:%S',
+    '%Y/%m/%d %H:%M:%S',
+    '%d.%m.%Y %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%SZ',  # ISO with Z
+    '%Y-%m-%d %H:%M',
+    '%Y%m%d %H:%M:%S'
+)
+
+# Formats of a date with an optional time of day, which can be parsed by cached dates
+_date_time_format_re = re.compile(r'^((?:%[Ymd]|[^%\sT])+)(?:([ T])%H:%M(:%S)?)?$')
+
+
 def _parse_timestamp(ts_str: str, timestamp_format: str | None = None, timezone=None) -> int:
     """
     Parse timestamp string to Unix timestamp.
@@ -69,18 +133,7 @@ def _parse_timestamp(ts_str: str, timestamp_format: str | None = None, timezone=
         dt = datetime.strptime(ts_str, timestamp_format)
     else:
         # Try common formats
-        for fmt in [
-            '%Y-%m-%d %H:%M:%S%z',  # 2024-01-08 19:00:00+0000
-            '%Y-%m-%d %H:%M:%S%Z',  # 2024-01-08 19:00:00UTC
-            '%Y-%m-%dT%H:%M:%S%z',  # 2024-01-08T19:00:00+0000
-            '%Y-%m-%d %H:%M:%S',
-            '%Y/%m/%d %H:%M:%S',
-            '%d.%m.%Y %H:%M:%S',
-            '%Y-%m-%dT%H:%M:%S',
-            '%Y-%m-%dT%H:%M:%SZ',  # ISO with Z
-            '%Y-%m-%d %H:%M',
-            '%Y%m%d %H:%M:%S'
-        ]:
+        for fmt in TIMESTAMP_FORMATS:
             try:
                 dt = datetime.strptime(ts_str, fmt)
                 break
@@ -97,6 +150,419 @@ def _parse_timestamp(ts_str: str, timestamp_format: str | None = None, timezone=
     return int(dt.timestamp())
 
 
+def _find_timestamp_format(ts_str: str) -> str | None:
+    """
+    Find the first common format which matches a timestamp string
+
+    :param ts_str: Timestamp string
+    :return: The format or None if no format matches
+    """
+    for fmt in TIMESTAMP_FORMATS:
+        try:
+            datetime.strptime(ts_str, fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
+
+
+class _TimestampParser:
+    """
+    Timestamp parser for importing many rows, it gives the same result as `_parse_timestamp()`
+
+    Data files use the same format in every row, so the format is detected once, from the first row,
+    and only detected again, if a row doesn't match it. If the format is a date with an optional time of day,
+    the timestamps of the dates are cached, and only the time of day is added to them, so no `datetime` is
+    created per row. Dates with a UTC offset change (DST transitions) and rows which don't match
+    are parsed by `strptime()`.
+    """
+
+    __slots__ = ('timestamp_format', 'timezone', '_format', '_date_format', '_separator', '_time_length',
+                 '_dates')
+
+    def __init__(self, timestamp_format: str | None = None, timezone=None):
+        """
+        :param timestamp_format: Optional specific datetime format for parsing
+        :param timezone: Optional timezone to apply to the parsed datetime
+        """
+        self.timestamp_format = timestamp_format
+        self.timezone = timezone
+        self._format: str | None = None
+        self._date_format: str | None = None
+        self._separator = ''
+        self._time_length = 0
+        # Timestamp of the start of the dates, None if the date has a UTC offset change
+        self._dates: dict[str, int | None] = {}
+        if timestamp_format:
+            self._set_format(timestamp_format)
+
+    def _set_format(self, fmt: str) -> None:
+        """
+        Use a format for the next rows
+        """
+        self._format = fmt
+        self._dates.clear()
+        match = _date_time_format_re.match(fmt)
+        if match is None:
+            self._date_format = None
+            return
+        self._date_format = match[1]
+        self._separator = match[2] or ''
+        self._time_length = 0 if match[2] is None else 8 if match[3] else 5
+
+    def _date_timestamp(self, date_str: str) -> int | None:
+        """
+        Calculate the timestamp of the start of a date
+
+        :param date_str: The date part of a timestamp string
+        :return: The timestamp or None if the date has a UTC offset change
+        :raises ValueError: If the date doesn't match the format
+        """
+        assert self._date_format is not None
+        dt = datetime.strptime(date_str, self._date_format)
+        if self.timezone:
+            dt = dt.replace(tzinfo=self.timezone)
+        start = dt.timestamp()
+        # The same date arithmetic as strptime + timestamp() only if the day is 24 hours long
+        if (dt + timedelta(days=1)).timestamp() - start != 86400:
+            return None
+        return int(start)
+
+    def __call__(self, ts_str: str) -> int:
+        """
+        Parse timestamp string to Unix timestamp
+
+        :param ts_str: Timestamp string to parse
+        :return: Unix timestamp as integer
+        :raises ValueError: If timestamp cannot be parsed
+        """
+        if self._date_format is not None:
+            time_length = self._time_length
+            if not time_length:
+                date_str = ts_str
+                seconds = 0
+            else:
+                time_str = ts_str[-time_length:]
+                date_str = ts_str[:-time_length - 1]
+                # Only 2 digit hours, minutes and seconds in valid ranges, others are parsed by strptime
+                if (ts_str[-time_length - 1:-time_length] != self._separator or time_str[2] != ':'
+                        or (time_length == 8 and time_str[5] != ':')):
+                    return self._parse(ts_str)
+                hms = time_str[0:2] + time_str[3:5] + time_str[6:8]
+                if not (hms.isascii() and hms.isdigit()):
+                    return self._parse(ts_str)
+                hour, minute = int(hms[0:2]), int(hms[2:4])
+                second = int(hms[4:6]) if time_length == 8 else 0
+                if hour > 23 or minute > 59 or second > 59:
+                    return self._parse(ts_str)
+                seconds = hour * 3600 + minute * 60 + second
+
+            try:
+                start = self._dates[date_str]
+            except KeyError:
+                if ts_str.isdigit():
+                    return _parse_timestamp(ts_str)
+                try:
+                    start = self._dates[date_str] = self._date_timestamp(date_str)
+                except ValueError:
+                    return self._parse(ts_str)
+            if start is not None:
+                return start + seconds
+
+        return self._parse(ts_str)
+
+    def _parse(self, ts_str: str) -> int:
+        """
+        Parse timestamp string by `strptime()`, try the last used format first
+        """
+        if ts_str.isdigit() or self.timestamp_format:
+            return _parse_timestamp(ts_str, self.timestamp_format, self.timezone)
+        if self._format is not None:
+            try:
+                return _parse_timestamp(ts_str, self._format, self.timezone)
+            except ValueError:
+                pass
+        # Detect the format again
+        fmt = _find_timestamp_format(ts_str)
+        if fmt is None:
+            raise ValueError(f"Could not parse timestamp: {ts_str}")
+        self._set_format(fmt)
+        return _parse_timestamp(ts_str, fmt, self.timezone)
+
+
+def _find_gap_runs(buffer, start_pos: int, end_pos: int) -> list[tuple[int, int]]:
+    """
+    Find runs of gap bars (negative volume) in a buffer of OHLCV records
+
+    :param buffer: The buffer of the whole file (e.g. mmap)
+    :param start_pos: First position to scan
+    :param end_pos: Position after the last one to scan
+    :return: List of (start position, length) tuples
+    """
+    if end_pos <= start_pos:
+        return []
+
+    if np is not None:
+        volume = np.frombuffer(buffer, dtype=RECORD_DTYPE, count=end_pos - start_pos,
+                               offset=start_pos * RECORD_SIZE)['volume']
+        edges = np.diff(np.concatenate(([0], (volume < 0.0).view(np.int8), [0])))
+        del volume  # Release the buffer as soon as possible
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        return [(int(s) + start_pos, int(e - s)) for s, e in zip(starts, ends)]
+
+    runs: list[tuple[int, int]] = []
+    run_start = -1
+    pos = start_pos
+    for chunk_start in range(start_pos, end_pos, READ_CHUNK_SIZE):
+        chunk_end = min(chunk_start + READ_CHUNK_SIZE, end_pos)
+        for record in _record_struct.iter_unpack(buffer[chunk_start * RECORD_SIZE:chunk_end * RECORD_SIZE]):
+            if record[5] < 0.0:
+                if run_start < 0:
+                    run_start = pos
+            elif run_start >= 0:
+                runs.append((run_start, pos - run_start))
+                run_start = -1
+            pos += 1
+    if run_start >= 0:
+        runs.append((run_start, pos - run_start))
+    return runs
+
+
+def _split_lines(path: str | Path, start: int, end: int, chunk_size: int) -> list[tuple[int, int]]:
+    """
+    Split a byte range of a text file into chunks on line boundaries
+
+    :param path: Path of the file
+    :param start: Start offset, it must be the start of a line
+    :param end: End offset
+    :param chunk_size: Approximate size of the chunks
+    :return: List of (start, end) offsets
+    """
+    bounds = [start]
+    with open(path, 'rb') as f:
+        while bounds[-1] + chunk_size < end:
+            f.seek(bounds[-1] + chunk_size)
+            f.readline()  # Move to the start of the next line
+            if f.tell() >= end:
+                break
+            bounds.append(f.tell())
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _parse_chunk(path: str | Path, start: int, end: int, delimiter: str | None, columns: tuple,
+                 timestamp_format: str | None, timezone) -> tuple[array, array]:
+    """
+    Parse the rows of a CSV or TXT file chunk, it runs in a worker process
+
+    :param path: Path of the file
+    :param start: Start offset of the chunk
+    :param end: End offset of the chunk
+    :param delimiter: Delimiter of a TXT file, None for CSV files
+    :param columns: Indices of the timestamp, date, time, open, high, low, close and volume columns and the
+                    number of columns
+    :param timestamp_format: Optional datetime fmt for parsing
+    :param timezone: Timezone for timestamp conversion
+    :return: The timestamps and the open, high, low, close and volume values of the rows
+    """
+    timestamp_idx, date_idx, time_idx, o_idx, h_idx, l_idx, c_idx, v_idx, column_count = columns
+
+    with open(path, 'rb') as f:
+        f.seek(start)
+        # Decoded the same way as the file is read by the sequential loaders
+        text = TextIOWrapper(BytesIO(f.read(end - start)))
+
+    if delimiter is None:
+        rows = csv.reader(text)
+    else:
+        rows = []
+        for line in text:
+            line = line.strip()
+            if not line:  # Skip empty lines
+                continue
+            row = OHLCVWriter._parse_txt_line(line, delimiter)
+            if len(row) != column_count:
+                raise ValueError(f"Row has {len(row)} columns, expected {column_count}")
+            # Strip whitespace from all fields
+            rows.append([field.strip() for field in row])
+
+    parse_timestamp = _TimestampParser(timestamp_format, timezone)
+    timestamps = array('q')
+    values = array('d')
+    for row in rows:
+        if date_idx is not None and time_idx is not None:
+            # Combine date and time
+            ts_str = f"{row[date_idx]} {row[time_idx]}"
+        else:
+            ts_str = row[timestamp_idx]
+
+        try:
+            timestamps.append(parse_timestamp(ts_str))
+        except Exception as e:
+            raise ValueError(f"Failed to parse timestamp '{ts_str}': {e}")
+
+        try:
+            values.extend((float(row[o_idx]), float(row[h_idx]), float(row[l_idx]),
+                           float(row[c_idx]), float(row[v_idx])))
+        except (ValueError, IndexError) as e:
+            raise ValueError(f"Invalid data in row: {e}")
+
+    return timestamps, values
+
+
+def _is_parallel(path: str | Path, workers: int | None) -> bool:
+    """
+    Check if a file should be parsed in parallel
+
+    :param path: Path of the file
+    :param workers: Number of worker processes, None means the number of CPUs
+    :return: True if the file is bigger than one chunk and more than one worker can be used
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    return workers > 1 and os.path.getsize(path) > PARALLEL_CHUNK_SIZE
+
+
+def _data_offset(path: str | Path) -> int:
+    """
+    Get the offset of the first data row after the header line
+
+    :param path: Path of the file
+    :return: The byte offset of the second line
+    """
+    with open(path, 'rb') as f:
+        f.readline()
+        return f.tell()
+
+
+class OHLCVIndex:
+    """
+    Gap index of an OHLCV file
+
+    It stores the runs of gap bars as sorted start and end positions with prefix sums of their lengths,
+    so gap runs can be skipped and real bars can be counted by binary search.
+    """
+
+    __slots__ = ('size', 'mtime_ns', '_starts', '_ends', '_gaps_before')
+
+    def __init__(self, size: int, runs: list[tuple[int, int]], mtime_ns: int = 0):
+        """
+        :param size: Number of records in the data file
+        :param runs: Gap runs as (start position, length) tuples, in order
+        :param mtime_ns: Modification time of the data file, used to detect stale indexes
+        """
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self._starts: list[int] = [start for start, _ in runs]
+        self._ends: list[int] = [start + length for start, length in runs]
+        # Number of gap bars before each run
+        self._gaps_before: list[int] = [0] * (len(runs) + 1)
+        for i, (_, length) in enumerate(runs):
+            self._gaps_before[i + 1] = self._gaps_before[i] + length
+
+    @property
+    def runs(self) -> list[tuple[int, int]]:
+        """
+        Gap runs as (start position, length) tuples
+        """
+        return [(start, end - start) for start, end in zip(self._starts, self._ends)]
+
+    @property
+    def gap_count(self) -> int:
+        """
+        Number of all gap bars
+        """
+        return self._gaps_before[-1]
+
+    def count_gaps(self, start_pos: int, end_pos: int) -> int:
+        """
+        Count gap bars between positions
+
+        :param start_pos: First position
+        :param end_pos: Position after the last one
+        :return: Number of gap bars in the range
+        """
+        if end_pos <= start_pos:
+            return 0
+        # Runs which end after start_pos and start before end_pos
+        first = bisect_right(self._ends, start_pos)
+        last = bisect_left(self._starts, end_pos)
+        if first >= last:
+            return 0
+        count = self._gaps_before[last] - self._gaps_before[first]
+        # Clip the first and last run
+        count -= max(0, start_pos - self._starts[first])
+        count -= max(0, self._ends[last - 1] - end_pos)
+        return count
+
+    def real_ranges(self, start_pos: int, end_pos: int) -> Iterator[tuple[int, int]]:
+        """
+        Iterate ranges of real (not gap) bars between positions
+
+        :param start_pos: First position
+        :param end_pos: Position after the last one
+        :return: Iterator of (start, end) position tuples, end is exclusive
+        """
+        pos = start_pos
+        for i in range(bisect_right(self._ends, start_pos), len(self._starts)):
+            gap_start = self._starts[i]
+            if gap_start >= end_pos:
+                break
+            if gap_start > pos:
+                yield pos, gap_start
+            pos = self._ends[i]
+        if pos < end_pos:
+            yield pos, end_pos
+
+    @classmethod
+    def load(cls, path: str | Path, size: int | None = None, mtime_ns: int | None = None) -> 'OHLCVIndex | None':
+        """
+        Load index from file
+
+        :param path: Path of the index file
+        :param size: Expected number of records, if not matches, the index is stale
+        :param mtime_ns: Expected modification time of the data file, if not matches, the index is stale
+        :return: The index or None if it doesn't exist, invalid or stale
+        """
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(_index_header_struct.size)
+                if len(header) != _index_header_struct.size:
+                    return None
+                magic, version, index_size, index_mtime_ns, run_count = _index_header_struct.unpack(header)
+                if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                    return None
+                if size is not None and index_size != size:
+                    return None
+                if mtime_ns is not None and index_mtime_ns != mtime_ns:
+                    return None
+                data = array('Q')
+                data.frombytes(f.read(run_count * 2 * data.itemsize))
+                if len(data) != run_count * 2:
+                    return None
+        except OSError:
+            return None
+        return cls(index_size, list(zip(data[0::2], data[1::2])), index_mtime_ns)
+
+    def save(self, path: str | Path) -> None:
+        """
+        Save index to file
+
+        :param path: Path of the index file
+        """
+        data = array('Q')
+        for start, end in zip(self._starts, self._ends):
+            data.append(start)
+            data.append(end - start)
+        tmp_path = str(path) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_index_header_struct.pack(INDEX_MAGIC, INDEX_VERSION, self.size, self.mtime_ns,
+                                              len(self._starts)))
+            f.write(data.tobytes())
+        os.replace(tmp_path, path)
+
+
 class OHLCVWriter:
     """
     Binary OHLCV data writer using direct file operations
@@ -105,12 +571,31 @@ class OHLCVWriter:
     __slots__ = ('path', '_file', '_size', '_start_timestamp', '_interval', '_current_pos', '_last_timestamp',
                  '_price_changes', '_price_decimals', '_last_close', '_analyzed_tick_size',
                  '_analyzed_price_scale', '_analyzed_min_move', '_confidence',
-                 '_trading_hours', '_analyzed_opening_hours', '_truncate')
+                 '_trading_hours', '_analyzed_opening_hours', '_truncate', '_index', '_index_runs',
+                 '_index_from', '_buffered', '_buffer', '_buffer_len', '_buffer_pos', '_decimals_cache',
+                 '_hours_bucket', '_hours_key')
 
-    def __init__(self, path: str | Path, truncate: bool = False):
+    def __init__(self, path: str | Path, truncate: bool = False, index: bool = False, buffered: bool = False):
+        """
+        :param path: Path of the OHLCV file
+        :param truncate: Clear existing data
+        :param index: Maintain the `<file>.ohlcv.idx` gap index, if False, an existing index is removed,
+                      because it would be stale after writing
+        :param buffered: Collect the appended records in memory and write them in batches, instead of
+                         writing and flushing every candle, the records are on the disk after `flush()`
+                         or `close()`
+        """
         self.path: str = str(path)
         self._file: BufferedWriter | BufferedRandom | None = None
         self._truncate: bool = truncate
+        self._index: bool = index
+        # Write buffer of the records appended after the end of the file
+        self._buffered: bool = buffered
+        self._buffer: bytearray = bytearray(WRITE_BUFFER_SIZE * RECORD_SIZE)
+        self._buffer_len: int = 0  # Used bytes
+        self._buffer_pos: int = 0  # Record number of the first buffered record
+        self._index_runs: list[tuple[int, int]] = []
+        self._index_from: int = 0
         self._size: int = 0
         self._start_timestamp: int | None = None
         self._interval: int | None = None
@@ -119,6 +604,7 @@ class OHLCVWriter:
         # Tick size analysis
         self._price_changes: list[float] = []
         self._price_decimals: set[int] = set()
+        self._decimals_cache: dict[float, int] = {}
         self._last_close: float | None = None
         self._analyzed_tick_size: float | None = None
         self._analyzed_price_scale: int | None = None
@@ -127,6 +613,8 @@ class OHLCVWriter:
         # Trading hours analysis
         self._trading_hours: dict[tuple[int, int], int] = {}  # (weekday, hour) -> count
         self._analyzed_opening_hours: list | None = None
+        self._hours_bucket: int = -1
+        self._hours_key: tuple[int, int] = (0, 0)
 
     def __enter__(self):
         self.open()
@@ -238,6 +726,20 @@ class OHLCVWriter:
         """
         Open file for writing
         """
+        index_path = self.path + INDEX_SUFFIX
+        self._index_runs = []
+        self._index_from = 0
+        if self._index:
+            # Reuse the existing index if it is up to date, then only the new records need to be indexed
+            if not self._truncate and os.path.exists(self.path):
+                stat = os.stat(self.path)
+                index = OHLCVIndex.load(index_path, stat.st_size // RECORD_SIZE, stat.st_mtime_ns)
+                if index is not None:
+                    self._index_runs = index.runs
+                    self._index_from = index.size
+        elif os.path.exists(index_path):
+            os.remove(index_path)
+
         # If truncate is True, always open in write mode to clear existing data
         if self._truncate:
             self._file = open(self.path, 'wb+')
@@ -280,15 +782,19 @@ class OHLCVWriter:
         if self._file is None:
             raise IOError("File not opened!")
 
+        # Records from this position need to be (re)indexed
+        if self._current_pos < self._index_from:
+            self._index_from = self._current_pos
+
         if self._size == 0:
             self._start_timestamp = candle.timestamp
-        elif self._size == 1:
+        elif self._size == 1 and self._interval is None:
             # First interval detection
             assert self._start_timestamp is not None
             self._interval = candle.timestamp - self._start_timestamp
             if self._interval <= 0:
                 raise ValueError(f"Invalid interval: {self._interval}")
-        elif self._size >= 2:  # Changed from elif self._size == 2: to properly handle all cases
+        else:  # The interval is known (it is preset when rebuilding the file)
             # Check chronological order
             if self._last_timestamp is not None and candle.timestamp <= self._last_timestamp:
                 raise ValueError(
@@ -312,30 +818,22 @@ class OHLCVWriter:
 
                 # Fill gap if needed
                 if candle.timestamp > expected_ts:
-                    # Get previous candle's close price
-                    self._file.seek((self._current_pos - 1) * RECORD_SIZE)
-                    data: Buffer = self._file.read(RECORD_SIZE)
-                    prev_data = struct.unpack(STRUCT_FORMAT, data)
-                    prev_close = prev_data[4]  # 4th index is close price
-
-                    # Fill gap with previous close and -1 volume (gap indicator)
-                    while expected_ts < candle.timestamp:
-                        gap_data: Buffer = struct.pack(STRUCT_FORMAT,
-                                                       expected_ts, prev_close, prev_close,
-                                                       prev_close, prev_close, -1.0)
-                        self._file.seek(self._current_pos * RECORD_SIZE)
-                        self._file.write(gap_data)
-                        self._current_pos += 1
-                        self._size = max(self._size, self._current_pos)
-                        expected_ts += self._interval
-
-        # Write actual data
-        self._file.seek(self._current_pos * RECORD_SIZE)
-        data: Buffer = struct.pack(STRUCT_FORMAT,
-                                   candle.timestamp, candle.open, candle.high,
-                                   candle.low, candle.close, candle.volume)
-        self._file.write(data)
-        self._file.flush()
+                    self._write_gap(expected_ts, candle.timestamp)
+
+        # Write actual data, appended records are packed right into the write buffer
+        buffer_len = self._buffer_len
+        if self._buffered and self._current_pos == self._size and buffer_len < len(self._buffer):
+            if not buffer_len:
+                self._buffer_pos = self._current_pos
+            _record_struct.pack_into(self._buffer, buffer_len,
+                                     candle.timestamp, candle.open, candle.high,
+                                     candle.low, candle.close, candle.volume)
+            self._buffer_len = buffer_len + RECORD_SIZE
+            self._current_pos += 1
+            self._size = self._current_pos
+        else:
+            self._write_records(_record_struct.pack(candle.timestamp, candle.open, candle.high,
+                                                    candle.low, candle.close, candle.volume))
 
         # Collect data for tick size analysis
         self._collect_price_data(candle)
@@ -344,9 +842,157 @@ class OHLCVWriter:
         self._collect_trading_hours(candle)
 
         self._last_timestamp = candle.timestamp
-        self._current_pos += 1
+
+    def write_many(self, candles: Iterable[OHLCV]) -> int:
+        """
+        Write candles in buffered mode, the records are written in batches and flushed once at the end.
+        Gaps are filled the same way as by `write()`.
+
+        :param candles: OHLCV data to write, in chronological order
+        :return: Number of written candles
+        """
+        count = 0
+        with self._buffering():
+            for candle in candles:
+                self.write(candle)
+                count += 1
+        return count
+
+    def flush(self) -> None:
+        """
+        Write the buffered records to the file
+        """
+        if self._file is None:
+            return
+        self._flush_buffer()
+        self._file.flush()
+
+    @contextmanager
+    def _buffering(self):
+        """
+        Use buffered mode temporarily, the buffer is flushed at the end
+        """
+        buffered = self._buffered
+        self._buffered = True
+        try:
+            yield
+        finally:
+            self._buffered = buffered
+            self.flush()
+
+    def _load_parallel(self, path: str | Path, delimiter: str | None, columns: tuple,
+                       timestamp_format: str | None, timezone, workers: int | None) -> None:
+        """
+        Parse the data rows of a CSV or TXT file in a process pool, and write them in order
+
+        The file is split into chunks on line boundaries, so every data row must be in one line.
+        Gap filling and the tick size and opening hours analysis are done by the writer as usual.
+
+        :param path: Path of the file
+        :param delimiter: Delimiter of a TXT file, None for CSV files
+        :param columns: Column indices, see `_parse_chunk()`
+        :param timestamp_format: Optional datetime fmt for parsing
+        :param timezone: Timezone for timestamp conversion
+        :param workers: Number of worker processes, default is the number of CPUs
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = deque(_split_lines(path, _data_offset(path), os.path.getsize(path), PARALLEL_CHUNK_SIZE))
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor, self._buffering():
+            # Only a limited number of chunks are parsed ahead, to limit memory usage
+            futures = deque()
+            try:
+                while chunks or futures:
+                    while chunks and len(futures) < 2 * workers:
+                        start, end = chunks.popleft()
+                        futures.append(executor.submit(_parse_chunk, path, start, end, delimiter, columns,
+                                                       timestamp_format, timezone))
+                    timestamps, values = futures.popleft().result()
+
+                    for i, timestamp in enumerate(timestamps):
+                        i *= 5
+                        try:
+                            self.write(OHLCV(timestamp, values[i], values[i + 1], values[i + 2],
+                                             values[i + 3], values[i + 4]))
+                        except ValueError as e:
+                            raise ValueError(f"Invalid data in row: {e}")
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _flush_buffer(self) -> None:
+        """
+        Write the buffered records to their place in the file
+        """
+        if not self._buffer_len:
+            return
+        assert self._file is not None
+        self._file.seek(self._buffer_pos * RECORD_SIZE)
+        with memoryview(self._buffer) as view:
+            self._file.write(view[:self._buffer_len])
+        self._buffer_len = 0
+
+    def _write_records(self, data: bytes | bytearray) -> None:
+        """
+        Write packed records at the current position
+
+        :param data: The packed records
+        """
+        assert self._file is not None
+        size = len(data)
+        if self._buffered and self._current_pos == self._size and size <= len(self._buffer):
+            # Appending: collect in the buffer, it always ends at the end of the file
+            if self._buffer_len + size > len(self._buffer):
+                self._flush_buffer()
+            if not self._buffer_len:
+                self._buffer_pos = self._current_pos
+            self._buffer[self._buffer_len:self._buffer_len + size] = data
+            self._buffer_len += size
+        else:
+            # Overwriting or too big for the buffer: the buffered records must be written first
+            self._flush_buffer()
+            self._file.seek(self._current_pos * RECORD_SIZE)
+            self._file.write(data)
+            if not self._buffered:
+                self._file.flush()
+        self._current_pos += size // RECORD_SIZE
         self._size = max(self._size, self._current_pos)
 
+    def _read_close(self, position: int) -> float:
+        """
+        Read the (float32) close price of a written record, it may be still in the write buffer
+
+        :param position: The record number
+        :return: The close price
+        """
+        assert self._file is not None
+        offset = (position - self._buffer_pos) * RECORD_SIZE
+        if 0 <= offset < self._buffer_len:
+            return _record_struct.unpack_from(self._buffer, offset)[4]
+        self._file.seek(position * RECORD_SIZE)
+        data: Buffer = self._file.read(RECORD_SIZE)
+        return _record_struct.unpack(data)[4]
+
+    def _write_gap(self, start_timestamp: int, end_timestamp: int) -> None:
+        """
+        Fill a gap with the previous close price and -1 volume (gap indicator)
+
+        :param start_timestamp: Timestamp of the first missing record
+        :param end_timestamp: Timestamp of the next real record (exclusive)
+        """
+        assert self._interval is not None
+        timestamps = array('I', range(start_timestamp, end_timestamp, self._interval))
+        prev_close = self._read_close(self._current_pos - 1)
+
+        # The gap records only differ in timestamp: repeat one record, then set all the timestamps at once
+        data = bytearray(_record_struct.pack(0, prev_close, prev_close, prev_close, prev_close, -1.0)
+                         * len(timestamps))
+        with memoryview(data) as view, view.cast('I') as words:
+            words[::RECORD_SIZE // 4] = timestamps
+        self._write_records(data)
+
     def seek_to_timestamp(self, timestamp: int) -> None:
         """
         Move write position to specific timestamp.
@@ -368,6 +1014,7 @@ class OHLCVWriter:
         if position < 0:
             raise ValueError("Negative position not allowed")
         assert self._file is not None
+        # The buffered records stay in the buffer, they are written before writing to another position
 
         self._current_pos = position
         self._file.seek(position * RECORD_SIZE)
@@ -379,6 +1026,7 @@ class OHLCVWriter:
         """
         if self._file is None:
             raise IOError("File not opened!")
+        self._flush_buffer()
 
         # Calculate new size in bytes
         new_size = self._current_pos * RECORD_SIZE
@@ -386,6 +1034,7 @@ class OHLCVWriter:
         # Truncate the file
         self._file.truncate(new_size)
         self._size = self._current_pos
+        self._index_from = min(self._index_from, self._size)
 
         # Update interval if we deleted too much
         if self._size < 2:
@@ -398,8 +1047,34 @@ class OHLCVWriter:
         Close the file
         """
         if self._file:
+            self._flush_buffer()
             self._file.close()
             self._file = None
+            if self._index:
+                self._update_index()
+
+    def _update_index(self) -> None:
+        """
+        Update the gap index file, only records written since the last index update are scanned
+        """
+        size = os.path.getsize(self.path) // RECORD_SIZE
+        index_from = min(self._index_from, size)
+
+        # Keep runs before the first modified record
+        runs = [(start, min(length, index_from - start)) for start, length in self._index_runs if start < index_from]
+
+        if index_from < size:
+            with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                new_runs = _find_gap_runs(mm, index_from, size)
+            # Merge the run continuing over the boundary
+            if runs and new_runs and runs[-1][0] + runs[-1][1] == new_runs[0][0]:
+                runs[-1] = (runs[-1][0], runs[-1][1] + new_runs[0][1])
+                new_runs = new_runs[1:]
+            runs.extend(new_runs)
+
+        OHLCVIndex(size, runs, os.stat(self.path).st_mtime_ns).save(self.path + INDEX_SUFFIX)
+        self._index_runs = runs
+        self._index_from = size
 
     def _collect_price_data(self, candle: OHLCV) -> None:
         """
@@ -411,13 +1086,21 @@ class OHLCVWriter:
             if change > 0 and len(self._price_changes) < 1000:  # Limit to 1000 samples
                 self._price_changes.append(change)
 
-        # Collect decimal places
-        for price in [candle.open, candle.high, candle.low, candle.close]:
-            if price != int(price):  # Has decimal component
-                price_str = f"{price:.15f}".rstrip('0').rstrip('.')
-                if '.' in price_str:
-                    decimals = len(price_str.split('.')[1])
-                    self._price_decimals.add(decimals)
+        # Collect decimal places, prices repeat a lot, so they are cached
+        cache = self._decimals_cache
+        for price in (candle.open, candle.high, candle.low, candle.close):
+            decimals = cache.get(price)
+            if decimals is None:
+                decimals = 0
+                if price != int(price):  # Has decimal component
+                    price_str = f"{price:.15f}".rstrip('0').rstrip('.')
+                    if '.' in price_str:
+                        decimals = len(price_str.split('.')[1])
+                if len(cache) >= 4096:
+                    cache.clear()
+                cache[price] = decimals
+            if decimals:
+                self._price_decimals.add(decimals)
 
         self._last_close = candle.close
 
@@ -667,15 +1350,18 @@ class OHLCVWriter:
         if candle.volume <= 0:
             return  # Skip gaps
 
-        # Convert timestamp to datetime
-        dt = datetime.fromtimestamp(candle.timestamp, tz=None)  # Local time
-
-        # Get weekday (1=Monday, 7=Sunday) and hour
-        weekday = dt.isoweekday()
-        hour = dt.hour
+        # UTC offsets are multiples of 15 minutes, so the local weekday and hour are the same
+        # in a 15 minutes bucket, they need to be calculated only once per bucket
+        bucket = candle.timestamp // 900
+        if bucket != self._hours_bucket:
+            # Convert timestamp to datetime
+            dt = datetime.fromtimestamp(candle.timestamp, tz=None)  # Local time
+            # Get weekday (1=Monday, 7=Sunday) and hour
+            self._hours_key = (dt.isoweekday(), dt.hour)
+            self._hours_bucket = bucket
 
         # Count occurrences
-        key = (weekday, hour)
+        key = self._hours_key
         self._trading_hours[key] = self._trading_hours.get(key, 0) + 1
 
     def _collect_existing_trading_hours(self) -> None:
@@ -871,19 +1557,13 @@ class OHLCVWriter:
 
         if not self._file or self._size == 0:
             return
-
-        # Save current file position and data
-        current_records = []
+        self._flush_buffer()
 
         # Read all existing records
         self._file.seek(0)
-        for i in range(self._size):
-            offset = i * RECORD_SIZE
-            self._file.seek(offset)
-            data = self._file.read(RECORD_SIZE)
-            if len(cast(bytes, data)) == RECORD_SIZE:
-                record = struct.unpack(STRUCT_FORMAT, cast(Buffer, data))
-                current_records.append(OHLCV(*record, extra_fields={}))
+        data = cast(bytes, self._file.read(self._size * RECORD_SIZE))
+        data = data[:len(data) - len(data) % RECORD_SIZE]
+        current_records = [OHLCV(*record, extra_fields={}) for record in _record_struct.iter_unpack(data)]
 
         # Create temp file for rebuilding
         temp_fd, temp_path = tempfile.mkstemp(suffix='.ohlcv.tmp', dir=os.path.dirname(self.path))
@@ -893,10 +1573,10 @@ class OHLCVWriter:
 
             # Create new writer with temp file
             with OHLCVWriter(temp_path) as temp_writer:
-                # Write all records with correct interval
-                # The writer will now properly handle gaps
-                for record in current_records:
-                    temp_writer.write(record)
+                # Preset the correct interval, otherwise it would be detected from the first two records again
+                temp_writer._interval = new_interval
+                # Write all real records with correct interval, the writer fills the gaps on the new grid
+                temp_writer.write_many(record for record in current_records if record.volume >= 0)
 
             # Close current file
             self._file.close()
@@ -911,6 +1591,10 @@ class OHLCVWriter:
             # Reset interval to the correct one
             self._interval = new_interval
 
+            # All records have been moved, the whole file needs to be indexed
+            self._index_runs = []
+            self._index_from = 0
+
             # Position at end for appending
             self._file.seek(0, os.SEEK_END)
             self._current_pos = self._size
@@ -936,16 +1620,22 @@ class OHLCVWriter:
                       timestamp_column: str | None = None,
                       date_column: str | None = None,
                       time_column: str | None = None,
-                      tz: str | None = None) -> None:
+                      tz: str | None = None,
+                      workers: int | None = None) -> None:
         """
         Load OHLCV data from CSV file using only builtin modules.
 
+        Big files are split into chunks, which are parsed in parallel by worker processes,
+        in this case every data row must be in one line.
+
         :param path: Path to CSV file
         :param timestamp_format: Optional datetime fmt for parsing
         :param timestamp_column: Column name for timestamp (default tries: timestamp, time, date)
         :param date_column: When timestamp is split into date+time columns, date column name
         :param time_column: When timestamp is split into date+time columns, time column name
         :param tz: Timezone name (e.g. 'UTC', 'Europe/London', '+0100') for timestamp conversion
+        :param workers: Number of worker processes for big files, default is the number of CPUs,
+                        1 disables parallel parsing
         """
         # Parse timezone
         timezone = None
@@ -1008,49 +1698,62 @@ class OHLCVWriter:
             except ValueError as e:
                 raise ValueError(f"Missing required column: {str(e)}")
 
-            # Process data rows
-            for row in reader:
-                # Handle timestamp
-                if date_idx is not None and time_idx is not None:
-                    # Combine date and time
-                    ts_str = f"{row[date_idx]} {row[time_idx]}"
-                else:
-                    ts_str = row[timestamp_idx]
+            if _is_parallel(path, workers):
+                columns = (timestamp_idx, date_idx, time_idx, o_idx, h_idx, l_idx, c_idx, v_idx, len(headers))
+                self._load_parallel(path, None, columns, timestamp_format, timezone, workers)
+                return
 
-                # Convert timestamp
-                try:
-                    timestamp = _parse_timestamp(ts_str, timestamp_format, timezone)
-                except Exception as e:
-                    raise ValueError(f"Failed to parse timestamp '{ts_str}': {e}")
+            parse_timestamp = _TimestampParser(timestamp_format, timezone)
 
-                # Write OHLCV data
-                try:
-                    self.write(OHLCV(
-                        timestamp,
-                        float(row[o_idx]),
-                        float(row[h_idx]),
-                        float(row[l_idx]),
-                        float(row[c_idx]),
-                        float(row[v_idx])
-                    ))
-                except (ValueError, IndexError) as e:
-                    raise ValueError(f"Invalid data in row: {e}")
+            # Process data rows, the records are written in batches
+            with self._buffering():
+                for row in reader:
+                    # Handle timestamp
+                    if date_idx is not None and time_idx is not None:
+                        # Combine date and time
+                        ts_str = f"{row[date_idx]} {row[time_idx]}"
+                    else:
+                        ts_str = row[timestamp_idx]
+
+                    # Convert timestamp
+                    try:
+                        timestamp = parse_timestamp(ts_str)
+                    except Exception as e:
+                        raise ValueError(f"Failed to parse timestamp '{ts_str}': {e}")
+
+                    # Write OHLCV data
+                    try:
+                        self.write(OHLCV(
+                            timestamp,
+                            float(row[o_idx]),
+                            float(row[h_idx]),
+                            float(row[l_idx]),
+                            float(row[c_idx]),
+                            float(row[v_idx])
+                        ))
+                    except (ValueError, IndexError) as e:
+                        raise ValueError(f"Invalid data in row: {e}")
 
     def load_from_txt(self, path: str | Path,
                       timestamp_format: str | None = None,
                       timestamp_column: str | None = None,
                       date_column: str | None = None,
                       time_column: str | None = None,
-                      tz: str | None = None) -> None:
+                      tz: str | None = None,
+                      workers: int | None = None) -> None:
         """
         Load OHLCV data from TXT file using only builtin modules.
 
+        Big files are split into chunks, which are parsed in parallel by worker processes.
+
         :param path: Path to TXT file
         :param timestamp_format: Optional datetime fmt for parsing
         :param timestamp_column: Column name for timestamp (default tries: timestamp, time, date)
         :param date_column: When timestamp is split into date+time columns, date column name
         :param time_column: When timestamp is split into date+time columns, time column name
         :param tz: Timezone name (e.g. 'UTC', 'Europe/London', '+0100') for timestamp conversion
+        :param workers: Number of worker processes for big files, default is the number of CPUs,
+                        1 disables parallel parsing
         """
         # Parse timezone
         timezone = None
@@ -1089,9 +1792,11 @@ class OHLCVWriter:
             # Use delimiter with highest count
             delimiter = max(delimiter_counts, key=lambda x: delimiter_counts[x])
 
-        # Read TXT file with manual parsing for better control
+        # Read TXT file with manual parsing for better control, big files are parsed by worker processes,
+        # then only the header is needed here
+        parallel = _is_parallel(path, workers)
         with open(path, 'r') as f:
-            lines = f.readlines()
+            lines = [f.readline()] if parallel else f.readlines()
 
         if not lines:
             raise ValueError("File is empty")
@@ -1147,44 +1852,52 @@ class OHLCVWriter:
         except ValueError as e:
             raise ValueError(f"Missing required column: {str(e)}")
 
-        # Process data rows
-        for line in lines[1:]:  # Skip header
-            line = line.strip()
-            if not line:  # Skip empty lines
-                continue
+        if parallel:
+            columns = (timestamp_idx, date_idx, time_idx, o_idx, h_idx, l_idx, c_idx, v_idx, len(headers))
+            self._load_parallel(path, delimiter, columns, timestamp_format, timezone, workers)
+            return
 
-            row = self._parse_txt_line(line, delimiter)
+        parse_timestamp = _TimestampParser(timestamp_format, timezone)
 
-            if len(row) != len(headers):
-                raise ValueError(f"Row has {len(row)} columns, expected {len(headers)}")
+        # Process data rows, the records are written in batches
+        with self._buffering():
+            for line in lines[1:]:  # Skip header
+                line = line.strip()
+                if not line:  # Skip empty lines
+                    continue
 
-            # Strip whitespace from all fields
-            row = [field.strip() for field in row]
+                row = self._parse_txt_line(line, delimiter)
 
-            # Handle timestamp
-            if date_idx is not None and time_idx is not None:
-                # Combine date and time
-                ts_str = f"{row[date_idx]} {row[time_idx]}"
-            else:
-                ts_str = str(row[timestamp_idx]) if timestamp_idx is not None and timestamp_idx < len(row) else ""
-            try:
-                # Convert timestamp
-                timestamp = _parse_timestamp(ts_str, timestamp_format, timezone)
-            except Exception as e:
-                raise ValueError(f"Failed to parse timestamp '{ts_str}': {e}")
+                if len(row) != len(headers):
+                    raise ValueError(f"Row has {len(row)} columns, expected {len(headers)}")
 
-            # Write OHLCV data
-            try:
-                self.write(OHLCV(
-                    timestamp,
-                    float(row[o_idx]),
-                    float(row[h_idx]),
-                    float(row[l_idx]),
-                    float(row[c_idx]),
-                    float(row[v_idx])
-                ))
-            except (ValueError, IndexError) as e:
-                raise ValueError(f"Invalid data in row: {e}")
+                # Strip whitespace from all fields
+                row = [field.strip() for field in row]
+
+                # Handle timestamp
+                if date_idx is not None and time_idx is not None:
+                    # Combine date and time
+                    ts_str = f"{row[date_idx]} {row[time_idx]}"
+                else:
+                    ts_str = str(row[timestamp_idx]) if timestamp_idx is not None and timestamp_idx < len(row) else ""
+                try:
+                    # Convert timestamp
+                    timestamp = parse_timestamp(ts_str)
+                except Exception as e:
+                    raise ValueError(f"Failed to parse timestamp '{ts_str}': {e}")
+
+                # Write OHLCV data
+                try:
+                    self.write(OHLCV(
+                        timestamp,
+                        float(row[o_idx]),
+                        float(row[h_idx]),
+                        float(row[l_idx]),
+                        float(row[c_idx]),
+                        float(row[v_idx])
+                    ))
+                except (ValueError, IndexError) as e:
+                    raise ValueError(f"Invalid data in row: {e}")
 
     @staticmethod
     def _parse_txt_line(line: str, delimiter: str) -> list[str]:
@@ -1341,36 +2054,95 @@ class OHLCVWriter:
             if not field_map['timestamp']:
                 raise ValueError("Could not find timestamp field")
 
-        # Process records
-        for record in data:
-            # Get timestamp
-            try:
-                if date_field and time_field:
-                    # Combine date and time
-                    ts_str = f"{record[date_field]} {record[time_field]}"
-                else:
-                    ts_str = str(record[field_map['timestamp']])
-
-                # Convert timestamp
-                timestamp = _parse_timestamp(ts_str, timestamp_format, timezone)
+        parse_timestamp = _TimestampParser(timestamp_format, timezone)
 
-                # Get OHLCV values
+        # Process records, they are written in batches
+        with self._buffering():
+            for record in data:
+                # Get timestamp
                 try:
-                    self.write(OHLCV(
-                        timestamp,
-                        float(record[field_map['open']]),
-                        float(record[field_map['high']]),
-                        float(record[field_map['low']]),
-                        float(record[field_map['close']]),
-                        float(record[field_map['volume']])
-                    ))
-                except KeyError as e:
-                    raise ValueError(f"Missing field in record: {e}")
-                except ValueError as e:
-                    raise ValueError(f"Invalid value in record: {e}")
+                    if date_field and time_field:
+                        # Combine date and time
+                        ts_str = f"{record[date_field]} {record[time_field]}"
+                    else:
+                        ts_str = str(record[field_map['timestamp']])
+
+                    # Convert timestamp
+                    timestamp = parse_timestamp(ts_str)
+
+                    # Get OHLCV values
+                    try:
+                        self.write(OHLCV(
+                            timestamp,
+                            float(record[field_map['open']]),
+                            float(record[field_map['high']]),
+                            float(record[field_map['low']]),
+                            float(record[field_map['close']]),
+                            float(record[field_map['volume']])
+                        ))
+                    except KeyError as e:
+                        raise ValueError(f"Missing field in record: {e}")
+                    except ValueError as e:
+                        raise ValueError(f"Invalid value in record: {e}")
+
+                except Exception as e:
+                    raise ValueError(f"Failed to process record: {e}")
+
 
-            except Exception as e:
-                raise ValueError(f"Failed to process record: {e}")
+class OHLCVRange:
+    """
+    Bars of an OHLCV file between timestamps, returned by `OHLCVReader.read_range()`.
+
+    Iterating it yields the bars as `OHLCV` objects. Vectorized consumers (e.g. batch mode of `ScriptRunner`)
+    can get the same bars as columns with `as_arrays()`, without creating per-bar Python objects.
+    """
+
+    __slots__ = ('reader', 'start_timestamp', 'end_timestamp', 'skip_gaps')
+
+    def __init__(self, reader: 'OHLCVReader', start_timestamp: int, end_timestamp: int | None = None,
+                 skip_gaps: bool = True):
+        """
+        :param reader: The open reader
+        :param start_timestamp: Start timestamp
+        :param end_timestamp: End timestamp (inclusive), if None, until the last bar
+        :param skip_gaps: Skip gap bars
+        """
+        self.reader = reader
+        self.start_timestamp = start_timestamp
+        self.end_timestamp = end_timestamp
+        self.skip_gaps = skip_gaps
+
+    def __iter__(self) -> Iterator[OHLCV]:
+        return self.reader.read_from(self.start_timestamp, self.end_timestamp, self.skip_gaps)
+
+    def as_arrays(self) -> OHLCVColumns:
+        """
+        Get the bars of the range as columns, the same bars as iterating it.
+
+        Without gaps they are zero-copy views (see `OHLCVReader.as_arrays()`), if gap bars are skipped and
+        there are any in the range, the columns are copies (NumPy arrays or lists without NumPy).
+
+        :return: Columns of timestamp, open, high, low, close and volume
+        """
+        reader = self.reader
+        if not reader.size or not reader.interval:
+            columns = reader.as_arrays()
+            return OHLCVColumns(*(column[:0] for column in columns))
+
+        columns = reader.as_arrays(self.start_timestamp, self.end_timestamp)
+        if not self.skip_gaps:
+            return columns
+
+        # Gap bars have negative volume
+        if np is not None:
+            mask = columns.volume >= 0.0
+            if mask.all():
+                return columns
+            return OHLCVColumns(*(column[mask] for column in columns))
+        keep = [i for i, volume in enumerate(columns.volume) if volume >= 0.0]
+        if len(keep) == len(columns.volume):
+            return columns
+        return OHLCVColumns(*([column[i] for i in keep] for column in columns))
 
 
 class OHLCVReader:
@@ -1378,7 +2150,7 @@ class OHLCVReader:
     Very fast OHLCV data reader using memory mapping.
     """
 
-    __slots__ = ('path', '_file', '_mmap', '_size', '_start_timestamp', '_interval')
+    __slots__ = ('path', '_file', '_mmap', '_size', '_start_timestamp', '_interval', '_index')
 
     def __init__(self, path: str | Path):
         self.path = str(path)
@@ -1387,6 +2159,7 @@ class OHLCVReader:
         self._size = 0
         self._start_timestamp = None
         self._interval = None
+        self._index: OHLCVIndex | None = None
 
     def __enter__(self):
         self.open()
@@ -1437,6 +2210,13 @@ class OHLCVReader:
         """
         return self._interval
 
+    @property
+    def index(self) -> OHLCVIndex | None:
+        """
+        The gap index of the file, None if there is no up-to-date index file
+        """
+        return self._index
+
     def open(self) -> 'OHLCVReader':
         """
         Open file and create memory mapping
@@ -1471,14 +2251,17 @@ class OHLCVReader:
                 second_timestamp = struct.unpack('I', cast(Buffer, self._mmap[RECORD_SIZE:RECORD_SIZE + 4]))[0]
                 self._interval = second_timestamp - self._start_timestamp
 
+            # Load gap index if it exists and up to date
+            self._index = OHLCVIndex.load(self.path + INDEX_SUFFIX, self._size,
+                                          os.fstat(self._file.fileno()).st_mtime_ns)
+
         return self
 
     def __iter__(self) -> Iterator[OHLCV]:
         """
         Iterate through all candles
         """
-        for pos in range(self._size):
-            yield self.read(pos)
+        return self._iter_range(0, self._size, skip_gaps=False)
 
     def read(self, position: int) -> OHLCV:
         """
@@ -1489,10 +2272,69 @@ class OHLCVReader:
 
         assert self._mmap is not None
 
-        offset = position * RECORD_SIZE
-        data = struct.unpack(STRUCT_FORMAT, self._mmap[offset:offset + RECORD_SIZE])
+        data = _record_struct.unpack_from(self._mmap, position * RECORD_SIZE)
         return OHLCV(*data, extra_fields={})
 
+    def _iter_range(self, start_pos: int, end_pos: int, skip_gaps: bool) -> Iterator[OHLCV]:
+        """
+        Iterate candles between positions, unpacking them in chunks of `READ_CHUNK_SIZE` records.
+        The candles don't have extra fields (it is None), so no dict is created for them.
+
+        :param start_pos: First position
+        :param end_pos: Position after the last one
+        :param skip_gaps: Skip gap bars (negative volume)
+        """
+        mm = self._mmap
+        assert mm is not None or start_pos >= end_pos
+        iter_unpack = _record_struct.iter_unpack
+        for chunk_start in range(start_pos, end_pos, READ_CHUNK_SIZE):
+            chunk_end = min(chunk_start + READ_CHUNK_SIZE, end_pos)
+            chunk = mm[chunk_start * RECORD_SIZE:chunk_end * RECORD_SIZE]
+            if skip_gaps:
+                for record in iter_unpack(chunk):
+                    if record[5] < 0.0:
+                        continue
+                    yield OHLCV(*record)
+            else:
+                for record in iter_unpack(chunk):
+                    yield OHLCV(*record)
+
+    def as_arrays(self, start_timestamp: int | None = None, end_timestamp: int | None = None) -> OHLCVColumns:
+        """
+        Get the OHLCV data between timestamps as columns, without creating per-bar Python objects.
+
+        If NumPy is installed, the columns are fields of a structured array which views the memory map
+        directly (zero-copy). Without NumPy the columns are strided `memoryview` objects of the map, which
+        are also zero-copy and can be converted by `array.array(typecode, view)` or `view.tolist()`.
+
+        Gap bars (filled by the writer) are included, they can be recognized by negative volume.
+
+        :param start_timestamp: Start timestamp, if None, from the first bar
+        :param end_timestamp: End timestamp (inclusive), if None, until the last bar
+        :return: Columns of timestamp, open, high, low, close and volume
+        """
+        if self._mmap is None or not self._size:
+            if np is not None:
+                empty = np.empty(0, dtype=RECORD_DTYPE)
+                return OHLCVColumns(*(empty[name] for name in COLUMN_NAMES))
+            return OHLCVColumns(*(memoryview(b'').cast('I' if name == 'timestamp' else 'f')
+                                  for name in COLUMN_NAMES))
+
+        if self._interval:
+            start_pos, end_pos = self.get_positions(start_timestamp, end_timestamp)
+        else:
+            start_pos, end_pos = 0, self._size
+        count = max(end_pos - start_pos, 0)
+
+        if np is not None:
+            records = np.frombuffer(self._mmap, dtype=RECORD_DTYPE, count=count, offset=start_pos * RECORD_SIZE)
+            return OHLCVColumns(*(records[name] for name in COLUMN_NAMES))
+
+        view = memoryview(self._mmap)[start_pos * RECORD_SIZE:(start_pos + count) * RECORD_SIZE]
+        uints = view.cast('I')
+        floats = view.cast('f')
+        return OHLCVColumns(uints[0::6], floats[1::6], floats[2::6], floats[3::6], floats[4::6], floats[5::6])
+
     def read_from(self, start_timestamp: int, end_timestamp: int | None = None, skip_gaps: bool = True) \
             -> Iterator[OHLCV]:
         """
@@ -1510,24 +2352,42 @@ class OHLCVReader:
         # Calculate start and end positions
         start_pos, end_pos = self.get_positions(start_timestamp, end_timestamp)
 
+        # With gap index we can jump over the gap runs
+        if skip_gaps and self._index is not None:
+            for range_start, range_end in self._index.real_ranges(start_pos, end_pos):
+                yield from self._iter_range(range_start, range_end, skip_gaps=False)
+            return
+
         # Yield the calculated range
-        for pos in range(start_pos, end_pos):
-            ohlcv = self.read(pos)
-            # Skip gaps if needed
-            if skip_gaps and ohlcv.volume < 0:
-                continue
-            yield ohlcv
+        yield from self._iter_range(start_pos, end_pos, skip_gaps)
+
+    def read_range(self, start_timestamp: int, end_timestamp: int | None = None, skip_gaps: bool = True) \
+            -> OHLCVRange:
+        """
+        Get the bars between timestamps as a range, which can be iterated (like `read_from()`) or read as columns
+
+        :param start_timestamp: Start timestamp
+        :param end_timestamp: End timestamp, if None, until the end
+        :param skip_gaps: Skip gap bars (default)
+        :return: The range of the bars
+        """
+        return OHLCVRange(self, start_timestamp, end_timestamp, skip_gaps)
 
     def close(self):
         """
         Close file and memory mapping
         """
         if self._mmap:
-            self._mmap.close()
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Views returned by `as_arrays()` are still alive, the map is released together with them
+                pass
             self._mmap = None
         if self._file:
             self._file.close()
             self._file = None
+        self._index = None
 
     def get_positions(self, start_timestamp: int | None = None, end_timestamp: int | None = None) -> tuple[int, int]:
         """
@@ -1560,19 +2420,28 @@ class OHLCVReader:
 
         return start_pos, end_pos
 
-    def get_size(self, start_timestamp: int | None = None, end_timestamp: int | None = None) -> int:
+    def get_size(self, start_timestamp: int | None = None, end_timestamp: int | None = None,
+                 skip_gaps: bool = False) -> int:
         """
         Get number of records between timestamps
 
         :param start_timestamp: Start timestamp
         :param end_timestamp: End timestamp
+        :param skip_gaps: Count only real bars, gap bars are not counted. It uses the gap index if
+                          available, otherwise the volume column needs to be scanned
         :return: Number of records
         """
         if not self._size or not self._interval:
             return 0
 
         start_pos, end_pos = self.get_positions(start_timestamp, end_timestamp)
-        return end_pos - start_pos
+        if not skip_gaps:
+            return end_pos - start_pos
+
+        if self._index is not None:
+            return end_pos - start_pos - self._index.count_gaps(start_pos, end_pos)
+        gaps = sum(length for _, length in _find_gap_runs(self._mmap, start_pos, end_pos))
+        return end_pos - start_pos - gaps
 
     def save_to_csv(self, path: str, as_datetime=False) -> None:
         """
@@ -0,0 +1,310 @@
+"""
+Optimization of script inputs
+
+The strategy runs with many combinations of its inputs in a pool of worker processes. The OHLCV data is
+loaded only once into shared memory, every worker decodes it once and uses it for all of its runs.
+The runs are ranked by a metric of the strategy statistics.
+
+Search methods:
+
+ - grid: all combinations of the search space
+ - random: random sample of the combinations
+ - halving: successive halving, all candidates run on the beginning of the data, only the best part of
+   them runs on more and more data, so clearly losing combinations are abandoned early
+"""
+from typing import Any, Iterable, NamedTuple, Sequence
+import itertools
+import math
+import os
+import random
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+from ..types.ohlcv import OHLCV
+from .ohlcv_file import OHLCVReader, RECORD_SIZE, STRUCT_FORMAT
+from .strategy_stats import StrategyStatistics
+from .syminfo import SymInfo
+
+__all__ = ['Optimizer', 'OptimizationResult', 'input_range', 'parse_search_space']
+
+METHODS = ('grid', 'random', 'halving')
+
+_record_struct = struct.Struct(STRUCT_FORMAT)
+
+
+class OptimizationResult(NamedTuple):
+    """
+    Result of a run with an input combination
+    """
+    inputs: dict[str, Any]
+    score: float | None
+    bars: int
+    statistics: StrategyStatistics | None = None
+    error: str | None = None
+
+
+def input_range(start: int | float, stop: int | float, step: int | float = 1) -> list[int | float]:
+    """
+    Create a list of input values, including the stop value
+
+    :param start: The first value
+    :param stop: The last value
+    :param step: The step between values
+    :return: The list of values
+    """
+    if step <= 0:
+        raise ValueError("Step must be positive!")
+    if all(isinstance(v, int) for v in (start, stop, step)):
+        return list(range(start, stop + 1, step))
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    # Round to prevent floating point noise, e.g. 0.30000000000000004
+    return [round(start + i * step, 10) for i in range(count)]
+
+
+def parse_search_space(data: dict[str, Any], script_inputs: dict[str, Any] | None = None) \
+        -> dict[str, list[Any]]:
+    """
+    Create search space from its description (e.g. loaded from a TOML file)
+
+    Values can be lists of values or ranges (tables with `start`, `stop` and `step`). If `start` or `stop`
+    is missing, the `minval` or `maxval` of the input is used.
+
+    :param data: Input name -> list of values or range
+    :param script_inputs: The inputs of the script (`Script.inputs`), used to check input names and get limits
+    :return: The search space, input name -> list of values
+    :raises ValueError: If the description is invalid
+    """
+    space: dict[str, list[Any]] = {}
+    for name, spec in data.items():
+        input_data = None
+        if script_inputs is not None:
+            input_data = script_inputs.get(name, script_inputs.get(name + '__global__'))
+            if input_data is None:
+                raise ValueError(f"The script has no input '{name}'!")
+
+        if isinstance(spec, list):
+            values = spec
+        elif isinstance(spec, dict):
+            start = spec.get('start', getattr(input_data, 'minval', None))
+            stop = spec.get('stop', getattr(input_data, 'maxval', None))
+            if start is None or stop is None:
+                raise ValueError(f"Range of input '{name}' needs 'start' and 'stop'!")
+            values = input_range(start, stop, spec.get('step', getattr(input_data, 'step', None) or 1))
+        else:
+            values = [spec]
+
+        if not values:
+            raise ValueError(f"Input '{name}' has no values!")
+        space[name] = values
+    return space
+
+
+#
+# Worker process
+#
+
+_worker_script_path: Path | None = None
+_worker_syminfo: SymInfo | None = None
+_worker_candles: list[OHLCV] = []
+
+
+def _init_worker(script_path: Path, syminfo: SymInfo, shm_name: str, size: int, sys_paths: list[str]):
+    """
+    Initialize a worker process, decode the shared OHLCV data
+    """
+    global _worker_script_path, _worker_syminfo, _worker_candles
+    from . import import_hook  # noqa
+    from .. import lib  # noqa
+
+    for path in reversed(sys_paths):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    # Workers must not write the toml file of the script concurrently
+    os.environ['PYNE_SAVE_SCRIPT_TOML'] = '0'
+
+    _worker_script_path = script_path
+    _worker_syminfo = syminfo
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _worker_candles = [OHLCV(*record) for record in _record_struct.iter_unpack(shm.buf[:size * RECORD_SIZE])]
+    finally:
+        shm.close()
+
+
+def _run(inputs: dict[str, Any], bars: int, metric: str) -> OptimizationResult:
+    """
+    Run the script with an input combination on the first `bars` bars
+    """
+    from .script_runner import ScriptRunner
+
+    try:
+        assert _worker_script_path is not None and _worker_syminfo is not None
+        runner = ScriptRunner(_worker_script_path, itertools.islice(_worker_candles, bars), _worker_syminfo,
+                              last_bar_index=bars - 1, inputs=inputs)
+        runner.run()
+        if runner.statistics is None:
+            raise ValueError("Only strategies can be optimized!")
+        score = float(getattr(runner.statistics, metric))
+        return OptimizationResult(inputs, score, bars, runner.statistics)
+    except Exception as e:  # One failing run must not stop the optimization
+        return OptimizationResult(inputs, None, bars, error=f"{type(e).__name__}: {e}")
+
+
+class Optimizer:
+    """
+    Optimize the inputs of a strategy on a data file
+    """
+
+    def __init__(self, script_path: Path, data_path: Path, *,
+                 time_from: int | None = None, time_to: int | None = None,
+                 metric: str = 'net_profit', minimize: bool = False,
+                 workers: int | None = None, sys_paths: Iterable[str] = ()):
+        """
+        :param script_path: The path of the strategy script
+        :param data_path: The path of the OHLCV file, symbol info is loaded from the toml file next to it
+        :param time_from: Start timestamp, if not specified, the start of the data
+        :param time_to: End timestamp, if not specified, the end of the data
+        :param metric: The field of the strategy statistics to rank the runs by
+        :param minimize: Lower metric is better (e.g. for `max_equity_drawdown`)
+        :param workers: Number of worker processes, default is the number of CPUs
+        :param sys_paths: Additional import paths for the workers (e.g. the library directory)
+        :raises ValueError: If the metric is not a field of the strategy statistics
+        """
+        if metric not in StrategyStatistics.__dataclass_fields__:
+            raise ValueError(f"Unknown metric: {metric}")
+        self.script_path = script_path
+        self.data_path = data_path
+        self.time_from = time_from
+        self.time_to = time_to
+        self.metric = metric
+        self.minimize = minimize
+        self.workers = workers or os.cpu_count() or 1
+        self.sys_paths = list(sys_paths)
+
+    def run(self, space: dict[str, Sequence[Any]], method: str = 'grid', *,
+            samples: int | None = None, eta: int = 3, min_bars: int = 500,
+            seed: int | None = None) -> list[OptimizationResult]:
+        """
+        Run the optimization
+
+        :param space: The search space, input name -> values
+        :param method: The search method, one of 'grid', 'random' or 'halving'
+        :param samples: Number of random combinations, for 'random' it is required,
+                        for 'halving' all combinations are used if not specified
+        :param eta: Only the best 1/eta part of the candidates goes to the next round of halving
+        :param min_bars: Minimum number of bars of the first round of halving
+        :param seed: Random seed
+        :return: Results sorted by score, the best first. Results abandoned by halving (having less bars)
+                 and failed runs are at the end
+        :raises ValueError: On invalid arguments
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown method: {method}, it must be one of {', '.join(METHODS)}")
+        if eta < 2:
+            raise ValueError("Eta must be at least 2!")
+
+        candidates = self._candidates(space, method, samples, seed)
+        if not candidates:
+            return []
+
+        syminfo = SymInfo.load_toml(self.data_path.with_suffix('.toml'))
+        shm, size = self._load_shared_data()
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(candidates)),
+                                     initializer=_init_worker,
+                                     initargs=(self.script_path, syminfo, shm.name, size, self.sys_paths)) as ex:
+                if method == 'halving':
+                    results = self._successive_halving(ex, candidates, size, eta, min_bars)
+                else:
+                    results = list(ex.map(_run, candidates, itertools.repeat(size), itertools.repeat(self.metric)))
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return self._sort(results)
+
+    @staticmethod
+    def _candidates(space: dict[str, Sequence[Any]], method: str, samples: int | None,
+                    seed: int | None) -> list[dict[str, Any]]:
+        """
+        Create the input combinations to run
+        """
+        names = list(space)
+        total = math.prod(len(values) for values in space.values())
+        if method == 'random' and not samples:
+            raise ValueError("Random search needs the number of samples!")
+
+        if samples is None or samples >= total:
+            indices: Iterable[int] = range(total)
+        else:
+            # Sample combination indices, so the combinations don't need to be created
+            indices = random.Random(seed).sample(range(total), samples)
+
+        candidates = []
+        for index in indices:
+            combination = {}
+            for name in reversed(names):
+                index, i = divmod(index, len(space[name]))
+                combination[name] = space[name][i]
+            candidates.append({name: combination[name] for name in names})
+        return candidates
+
+    def _load_shared_data(self) -> tuple[shared_memory.SharedMemory, int]:
+        """
+        Load the bars of the data file (without gaps) into shared memory
+        """
+        with OHLCVReader(self.data_path) as reader:
+            start = self.time_from if self.time_from is not None else reader.start_timestamp
+            end = self.time_to if self.time_to is not None else reader.end_timestamp
+            size = reader.get_size(start, end, skip_gaps=True)
+            if size <= 0:
+                raise ValueError("No data in the given range!")
+
+            shm = shared_memory.SharedMemory(create=True, size=size * RECORD_SIZE)
+            try:
+                offset = 0
+                for candle in reader.read_from(start, end, skip_gaps=True):
+                    _record_struct.pack_into(shm.buf, offset, *candle[:6])
+                    offset += RECORD_SIZE
+            except BaseException:
+                shm.close()
+                shm.unlink()
+                raise
+        return shm, size
+
+    def _successive_halving(self, executor: ProcessPoolExecutor, candidates: list[dict[str, Any]],
+                            size: int, eta: int, min_bars: int) -> list[OptimizationResult]:
+        """
+        Successive halving: in every round the best 1/eta of the candidates run on eta times more data
+        """
+        rounds = max(1, math.ceil(math.log(len(candidates), eta)))
+
+        finished: list[OptimizationResult] = []
+        for round_index in range(rounds):
+            # The last round runs on the whole data, the previous ones on eta times less data than the next
+            last = round_index == rounds - 1 or len(candidates) == 1
+            bars = size if last else max(min(min_bars, size), size // eta ** (rounds - 1 - round_index))
+            results = list(executor.map(_run, candidates, itertools.repeat(bars), itertools.repeat(self.metric)))
+            if last or bars >= size:
+                return finished + results
+
+            ranked = self._sort(results)
+            keep = max(1, math.ceil(len(candidates) / eta))
+            survivors = [r for r in ranked[:keep] if r.score is not None]
+            finished.extend(ranked[len(survivors):])
+            if not survivors:
+                break
+            candidates = [r.inputs for r in survivors]
+
+        return finished
+
+    def _sort(self, results: list[OptimizationResult]) -> list[OptimizationResult]:
+        """
+        Sort results: more bars first, then by score, failed runs are the last
+        """
+        sign = 1 if self.minimize else -1
+        return sorted(results, key=lambda r: (r.score is None, -r.bars, sign * r.score if r.score is not None else 0))
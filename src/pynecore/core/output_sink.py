@@ -0,0 +1,63 @@
+"""
+Output sinks of script runs
+
+`ScriptRunner` writes plot data, trades and equity through output sinks. The format is chosen by the file
+extension: `.pcol` files are written by `ColumnarWriter` (binary, typed columns), everything else by `CSVWriter`.
+"""
+from typing import Any, Optional, Protocol
+from pathlib import Path
+
+from pynecore.types.ohlcv import OHLCV
+from .csv_file import CSVWriter
+from .columnar_file import ColumnarWriter, COLUMNAR_SUFFIX
+
+__all__ = ['OutputSink', 'create_output_sink', 'is_columnar']
+
+
+class OutputSink(Protocol):
+    """
+    Interface of the output writers
+    """
+
+    def open(self) -> 'OutputSink':
+        ...
+
+    def close(self, timeout: Optional[float] = None):
+        ...
+
+    def write(self, *data: Any, timeout: Optional[float] = None) -> bool:
+        ...
+
+    def write_dict(self, data: dict[str, Any], timeout: Optional[float] = None) -> bool:
+        ...
+
+    def write_ohlcv(self, candle: OHLCV, timeout: Optional[float] = None) -> bool:
+        ...
+
+    def write_plot(self, candle: OHLCV, plot_data: dict[str, Any], timeout: Optional[float] = None) -> bool:
+        ...
+
+
+def is_columnar(path: Path) -> bool:
+    """
+    Check if the path is a binary columnar file
+
+    :param path: The file path
+    :return: True if the file has the columnar file extension
+    """
+    return Path(path).suffix == COLUMNAR_SUFFIX
+
+
+def create_output_sink(path: Path, *, headers: tuple | list | None = None,
+                       types: dict[str, str] | None = None) -> OutputSink:
+    """
+    Create an output sink by the extension of the path
+
+    :param path: Output file path
+    :param headers: Optional list of column names
+    :param types: Optional column types of the columnar format by name, not used by CSV files
+    :return: A `ColumnarWriter` for `.pcol` files, otherwise a `CSVWriter`
+    """
+    if is_columnar(path):
+        return ColumnarWriter(path, headers=headers, types=types)
+    return CSVWriter(path, float_fmt=".8g", headers=headers)
@@ -0,0 +1,238 @@
+"""
+Bar loop profiler
+
+It measures the time spent in the parts of the bar loop: the `main()` function of the script, every call site
+of the script (keyed by the call ID the function isolation transformer gives them, so every `ta.*` call and
+every call of an own function is measured separately), order processing of strategies and the CSV writers.
+
+It works by wrapping the functions, so it has overhead, the absolute times are higher than without profiling,
+but they show well which parts are slow.
+"""
+from typing import Any, Callable, NamedTuple
+import ast
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+from types import ModuleType
+
+__all__ = ['Profiler', 'ProfileEntry', 'CallSite', 'find_call_sites']
+
+
+class CallSite(NamedTuple):
+    """
+    A call site of the script
+    """
+    call_id: str
+    name: str
+    lineno: int
+
+
+class ProfileEntry:
+    """
+    Measured time of a function or call site
+    """
+
+    __slots__ = ('name', 'location', 'calls', 'total')
+
+    def __init__(self, name: str, location: str = ''):
+        """
+        :param name: The name of the function
+        :param location: The location in the script (file:line)
+        """
+        self.name = name
+        self.location = location
+        # Number of calls
+        self.calls = 0
+        # Total time in seconds
+        self.total = 0.0
+
+    def __repr__(self) -> str:
+        return f"ProfileEntry({self.name!r}, {self.location!r}, calls={self.calls}, total={self.total:.6f})"
+
+
+def find_call_sites(script_path: Path) -> dict[str, CallSite]:
+    """
+    Find the isolated call sites of a script
+
+    :param script_path: Path of the script
+    :return: Call sites by call ID
+    """
+    from .import_hook import transform_ast
+
+    tree = ast.parse(script_path.read_text())
+    tree._module_file_path = str(script_path.resolve())  # type: ignore
+
+    sites: dict[str, CallSite] = {}
+    for node in ast.walk(transform_ast(tree)):
+        # isolate_function(func, call_id, ...)(args)
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Call)
+                and isinstance(node.func.func, ast.Name) and node.func.func.id == 'isolate_function'
+                and len(node.func.args) >= 2 and isinstance(node.func.args[1], ast.Constant)):
+            continue
+        func, call_id = node.func.args[0], node.func.args[1].value
+        name = ast.unparse(func)
+        # Show the names as they are in the script, not as normalized by the import normalizer
+        if name.startswith('lib.'):
+            name = name[4:]
+        sites[call_id] = CallSite(call_id, name, getattr(func, 'lineno', 0))
+    return sites
+
+
+class Profiler:
+    """
+    Collects the time of the functions of the bar loop
+    """
+
+    __slots__ = ('entries', '_patches', '_main_entry')
+
+    def __init__(self):
+        # Entries by key, in the order of the first call
+        self.entries: dict[Any, ProfileEntry] = {}
+        # Original attributes of patched objects
+        self._patches: list[tuple[Any, str, Any]] = []
+        self._main_entry: ProfileEntry | None = None
+
+    def entry(self, key: Any, name: str, location: str = '') -> ProfileEntry:
+        """
+        Get or create an entry
+
+        :param key: The key of the entry
+        :param name: The name of the function, if the entry is new
+        :param location: The location of the function, if the entry is new
+        :return: The entry
+        """
+        try:
+            return self.entries[key]
+        except KeyError:
+            entry = self.entries[key] = ProfileEntry(name, location)
+            return entry
+
+    @staticmethod
+    def timed(func: Callable, entry: ProfileEntry) -> Callable:
+        """
+        Wrap a function to measure its time
+
+        :param func: The function to wrap
+        :param entry: The entry to add the time to
+        :return: The wrapped function
+        """
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                entry.total += perf_counter() - start
+                entry.calls += 1
+
+        return wrapper
+
+    def patch(self, obj: Any, attr: str, name: str, location: str = '') -> ProfileEntry:
+        """
+        Replace a function attribute of an object (module or class) with a measured one
+
+        :param obj: The object which has the function
+        :param attr: The name of the attribute
+        :param name: The name in the report
+        :param location: The location in the report
+        :return: The entry of the function
+        """
+        original = vars(obj)[attr]
+        self._patches.append((obj, attr, original))
+        # Keyed by name, so the entry is the same if the script is imported again (e.g. in benchmarks)
+        entry = self.entry((name, location), name, location)
+        setattr(obj, attr, self.timed(original, entry))
+        return entry
+
+    def install(self, script_module: ModuleType, script_path: Path):
+        """
+        Start profiling a script module
+
+        :param script_module: The imported script module
+        :param script_path: Path of the script, to find the call sites
+        """
+        from ..lib.strategy import Position
+        from .csv_file import CSVWriter
+        from .columnar_file import ColumnarWriter
+        from . import function_isolation
+
+        file_name = script_path.name
+        call_sites = find_call_sites(script_path)
+        original_isolate_function = function_isolation.isolate_function
+        entry = self.entry
+
+        # Entries of the call sites by call ID, resolved on the first call
+        site_entries: dict[str, ProfileEntry | None] = {}
+        # The last isolated function and its wrapper by call ID
+        wrappers: dict[str, tuple[Callable, Callable]] = {}
+
+        def isolate_function(func, call_id, parent_scope, closure_argument_count=-1, call_counter=0):
+            isolated = original_isolate_function(func, call_id, parent_scope, closure_argument_count,
+                                                 call_counter)
+            try:
+                site_entry = site_entries[call_id]
+            except KeyError:
+                site = call_sites.get(call_id)
+                site_entry = site_entries[call_id] = \
+                    entry(call_id, site.name, f"{file_name}:{site.lineno}") if site else None
+            if site_entry is None:
+                return isolated
+
+            # Cached isolated functions are wrapped only once
+            last = wrappers.get(call_id)
+            if last is not None and last[0] is isolated:
+                return last[1]
+
+            # Functions inside `main()` are new instances on every call, so the wrapper must be cheap to create
+            def timed_call(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return isolated(*args, **kwargs)
+                finally:
+                    site_entry.total += perf_counter() - start
+                    site_entry.calls += 1
+
+            wrappers[call_id] = (isolated, timed_call)
+            return timed_call
+
+        # The transformed script module calls isolate_function through its globals
+        if hasattr(script_module, 'isolate_function'):
+            self._patches.append((script_module, 'isolate_function', script_module.isolate_function))
+            script_module.isolate_function = isolate_function
+
+        self._main_entry = self.patch(script_module, 'main', 'main()', file_name)
+        self.patch(Position, 'process_orders', 'Position.process_orders()')
+        for writer_class in (CSVWriter, ColumnarWriter):
+            self.patch(writer_class, 'write', f'{writer_class.__name__}.write()')
+            self.patch(writer_class, 'write_plot', f'{writer_class.__name__}.write_plot()')
+
+    def uninstall(self):
+        """
+        Stop profiling, restore the original functions
+        """
+        for obj, attr, original in reversed(self._patches):
+            setattr(obj, attr, original)
+        self._patches.clear()
+
+    @property
+    def bars(self) -> int:
+        """
+        The number of profiled bars (calls of the `main()` function)
+        """
+        return self._main_entry.calls if self._main_entry else 0
+
+    @property
+    def total(self) -> float:
+        """
+        Total measured time in seconds. Call sites run inside `main()`, so only the patched functions are summed.
+        """
+        return sum(entry.total for key, entry in self.entries.items() if isinstance(key, tuple))
+
+    def report(self) -> list[ProfileEntry]:
+        """
+        The entries sorted by total time, the slowest first
+
+        :return: The entries, which were called at least once
+        """
+        return sorted((e for e in self.entries.values() if e.calls), key=lambda e: e.total, reverse=True)
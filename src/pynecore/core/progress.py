@@ -0,0 +1,102 @@
+"""
+Progress reporting of script runs
+
+Reporting the progress on every bar (creating a datetime, calling a callback, putting it into a queue) is
+expensive compared to running a small script. `ScriptRunner` only updates the counters of a `RunProgress`
+object on every bar, monitors can sample it at their own rate from another thread (see `ProgressMonitor`).
+"""
+from typing import Callable
+import threading
+
+__all__ = ['RunProgress', 'ProgressMonitor']
+
+
+class RunProgress:
+    """
+    Progress of a script run, it is updated on every bar by the runner
+    """
+
+    __slots__ = ('bars', 'timestamp', 'total_bars', 'finished')
+
+    def __init__(self, total_bars: int = 0):
+        """
+        :param total_bars: The number of bars to process, 0 if unknown
+        """
+        # Number of processed bars
+        self.bars = 0
+        # Timestamp of the last processed bar in seconds (UTC), 0 if no bar was processed yet
+        self.timestamp = 0
+        self.total_bars = total_bars
+        self.finished = False
+
+    def reset(self):
+        """
+        Reset the progress before a new run
+        """
+        self.bars = 0
+        self.timestamp = 0
+        self.finished = False
+
+    @property
+    def fraction(self) -> float:
+        """
+        The processed part of the bars between 0.0 and 1.0, 0.0 if the number of bars is unknown
+        """
+        if self.finished:
+            return 1.0
+        if not self.total_bars:
+            return 0.0
+        return min(self.bars / self.total_bars, 1.0)
+
+
+class ProgressMonitor:
+    """
+    Background thread calling a callback with the progress at a fixed rate.
+
+    The callback is also called once more when the monitor is stopped, so the final state is always reported.
+    It can be used as a context manager.
+    """
+
+    __slots__ = ('progress', 'callback', 'interval', '_stop_event', '_thread')
+
+    def __init__(self, progress: RunProgress, callback: Callable[[RunProgress], None], interval: float = 1 / 30):
+        """
+        :param progress: The progress to monitor, e.g. `ScriptRunner.progress`
+        :param callback: Function to call with the progress
+        :param interval: Time between the calls in seconds
+        """
+        self.progress = progress
+        self.callback = callback
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.callback(self.progress)
+
+    def start(self):
+        """
+        Start the monitor thread
+        """
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="ProgressMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the monitor thread and report the final progress
+        """
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+        self.callback(self.progress)
+
+    def __enter__(self) -> 'ProgressMonitor':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -53,6 +53,9 @@ class InputData:
 _old_input_values: dict[str, Any] = {}
 inputs: dict[str | None, InputData] = {}
 
+# Input values override the values of the toml file (e.g. parameter sets of batch runs)
+_input_overrides: dict[str, Any] = {}
+
 
 # noinspection PyShadowingBuiltins,PyShadowingNames
 @dataclass(kw_only=True, slots=True)
@@ -232,6 +235,10 @@ class Script:
         if toml_path.exists():
             self.load(toml_path)
 
+        for arg_name, value in _input_overrides.items():
+            _old_input_values[arg_name] = value
+            _old_input_values[arg_name + '__global__'] = value  # For strict mode
+
         # Pyramiding must be at least 1
         if self.pyramiding <= 0:
             self.pyramiding = 1
@@ -245,8 +252,10 @@ class Script:
             setattr(func, 'script', self)
 
             if self.script_type in (_script_type.indicator, _script_type.strategy):
-                # Save toml file if not in pytest and not disabled by env var PYNE_SAVE_SCRIPT_TOML = 0
-                if os.environ.get('PYNE_SAVE_SCRIPT_TOML', '1') == '1' and 'pytest' not in sys.modules:
+                # Save toml file if not in pytest and not disabled by env var PYNE_SAVE_SCRIPT_TOML = 0,
+                # overridden input values must not be saved
+                if (os.environ.get('PYNE_SAVE_SCRIPT_TOML', '1') == '1' and 'pytest' not in sys.modules
+                        and not _input_overrides):
                     self.save(toml_path)
 
             _old_input_values.clear()
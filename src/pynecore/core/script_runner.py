@@ -1,6 +1,8 @@
-from typing import Iterable, Iterator, Callable, TYPE_CHECKING, Any
+from typing import Iterable, Iterator, Callable, TYPE_CHECKING, Any, NamedTuple
 from types import ModuleType
+import os
 import sys
+from time import monotonic
 from pathlib import Path
 from datetime import datetime, UTC
 
@@ -11,8 +13,15 @@ import sys, re, uuid
 
 from pynecore.types.ohlcv import OHLCV
 from pynecore.core.syminfo import SymInfo
+from pynecore.core.session_calendar import SessionCalendar
+from pynecore.core.datetime import TimeContext
+from pynecore.core.progress import RunProgress
 from pynecore.core.csv_file import CSVWriter
-from pynecore.core.strategy_stats import calculate_strategy_statistics, write_strategy_statistics_csv
+from pynecore.core.ohlcv_file import OHLCVRange
+from pynecore.core.columnar_file import ColumnarWriter
+from pynecore.core.output_sink import create_output_sink, OutputSink
+from pynecore.core.strategy_stats import (StrategyStatsAccumulator, write_strategy_statistics_csv,
+                                          StrategyStatistics)
 
 from pynecore.types import script_type
 
@@ -20,10 +29,12 @@ if TYPE_CHECKING:
     from zoneinfo import ZoneInfo  # noqa
     from pynecore.core.script import script
     from pynecore.lib.strategy import Trade  # noqa
+    from pynecore.core.profiler import Profiler  # noqa
 
 __all__ = [
     'import_script',
     'ScriptRunner',
+    'RunResult',
 ]
 
 
@@ -93,8 +104,11 @@ def _set_lib_properties(ohlcv: OHLCV, bar_index: int, tz: 'ZoneInfo', lib: Modul
     lib.ohlc4 = (lib.open + lib.high + lib.low + lib.close) / 4.0
     lib.hlcc4 = (lib.high + lib.low + 2 * lib.close) / 4.0
 
-    dt = lib._datetime = datetime.fromtimestamp(ohlcv.timestamp, UTC).astimezone(tz)
-    lib._time = lib.last_bar_time = int(dt.timestamp() * 1000)  # PineScript representation of time
+    time_context = lib._time_context
+    if time_context.tz is not tz:
+        time_context = lib._time_context = TimeContext(tz)
+    time_context.set(ohlcv.timestamp)
+    lib._time = lib.last_bar_time = int(ohlcv.timestamp * 1000)  # PineScript representation of time
 
 
 def _set_lib_syminfo_properties(syminfo: SymInfo, lib: ModuleType):
@@ -118,6 +132,8 @@ def _set_lib_syminfo_properties(syminfo: SymInfo, lib: ModuleType):
     lib.syminfo._opening_hours = syminfo.opening_hours
     lib.syminfo._session_starts = syminfo.session_starts
     lib.syminfo._session_ends = syminfo.session_ends
+    lib.syminfo._session_calendar = SessionCalendar(syminfo.opening_hours, syminfo.session_starts,
+                                                    syminfo.session_ends)
 
     if syminfo.type == 'crypto':
         decimals = 6 if syminfo.basecurrency == 'BTC' else 4  # TODO: is it correct?
@@ -147,13 +163,87 @@ def _reset_lib_vars(lib: ModuleType):
     lib.hlcc4 = Source("hlcc4")
 
     lib._time = 0
-    lib._datetime = datetime.fromtimestamp(0, UTC)
+    lib._time_context = TimeContext(UTC)
 
     lib._lib_semaphore = False
 
     lib.barstate.isfirst = True
     lib.barstate.islast = False
 
+    # Remove drawings of the previous run
+    from ..lib import label, line, box, polyline, linefill
+    for drawing_module in (label, line, box, polyline, linefill):
+        drawing_module._registry.clear()  # noqa
+
+
+class RunResult(NamedTuple):
+    """
+    Result of a script run of a batch
+    """
+    data_path: Path
+    inputs: dict[str, Any] | None
+    statistics: StrategyStatistics | None = None
+    error: str | None = None
+
+
+def _init_batch_worker(sys_paths: list[str]):
+    """
+    Initialize a batch worker process, import everything needed to run scripts
+    """
+    from . import import_hook  # noqa
+    from .. import lib  # noqa
+
+    for path in reversed(sys_paths):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    # Workers must not write the toml file of the script concurrently
+    os.environ['PYNE_SAVE_SCRIPT_TOML'] = '0'
+
+
+def _run_batch_job(script_path: Path, data_path: Path, inputs: dict[str, Any] | None,
+                   time_from: int | None, time_to: int | None) -> RunResult:
+    """
+    Run a script on a data file in a batch worker process
+    """
+    from .ohlcv_file import OHLCVReader
+
+    try:
+        syminfo = SymInfo.load_toml(data_path.with_suffix('.toml'))
+        with OHLCVReader(data_path) as reader:
+            start = time_from if time_from is not None else reader.start_timestamp
+            end = time_to if time_to is not None else reader.end_timestamp
+            size = reader.get_size(start, end, skip_gaps=True)
+            runner = ScriptRunner(script_path, reader.read_range(start, end), syminfo,
+                                  last_bar_index=size - 1, inputs=inputs)
+            runner.run()
+        return RunResult(data_path, inputs, runner.statistics)
+    except Exception as e:  # One failing job must not stop the whole batch
+        return RunResult(data_path, inputs, error=f"{type(e).__name__}: {e}")
+
+
+def _format_percent(value: float) -> str:
+    """
+    Format a percent value of the trades CSV
+    """
+    return f"{value:.2f}"
+
+
+def _write_summary_row(writer: CSVWriter, result: RunResult):
+    """
+    Write a run result as a row of the summary CSV
+    """
+    import json
+    from dataclasses import fields
+
+    row: dict[str, Any] = {
+        'data': result.data_path.stem,
+        'inputs': json.dumps(result.inputs) if result.inputs else '',
+        'error': result.error or '',
+    }
+    for f in fields(StrategyStatistics):
+        row[f.name] = getattr(result.statistics, f.name) if result.statistics else ''
+    writer.write_dict(row)
+
 
 class ScriptRunner:
     """
@@ -161,13 +251,15 @@ class ScriptRunner:
     """
 
     __slots__ = ('script_module', 'script', 'ohlcv_iter', 'syminfo', 'update_syminfo_every_run',
-                 'bar_index', 'tz', 'plot_writer', 'strat_writer', 'trades_writer', 'last_bar_index',
-                 'equity_curve', 'first_price', 'last_price', 'last_bar_signals')
+                 'bar_index', 'tz', 'plot_writer', 'strat_writer', 'trades_writer', 'equity_writer',
+                 'last_bar_index', 'strategy_stats', 'first_price', 'last_price', 'last_bar_signals', 'batch',
+                 'statistics', 'profiler', 'progress')
 
     def __init__(self, script_path: Path, ohlcv_iter: Iterable[OHLCV], syminfo: SymInfo, *,
                  plot_path: Path | None = None, strat_path: Path | None = None,
-                 trade_path: Path | None = None,
-                 update_syminfo_every_run: bool = False, last_bar_index=0):
+                 trade_path: Path | None = None, equity_path: Path | None = None,
+                 update_syminfo_every_run: bool = False, last_bar_index=0, batch: bool = False,
+                 inputs: dict[str, Any] | None = None, profiler: 'Profiler | None' = None):
         """
         Initialize the script runner
 
@@ -177,14 +269,28 @@ class ScriptRunner:
         :param plot_path: Path to save the plot data
         :param strat_path: Path to save the strategy results
         :param trade_path: Path to save the trade data of the strategy
+        :param equity_path: Path to save the equity of the strategy on every bar, it is ignored for indicators
+                            and libraries (`equity_writer` is None)
         :param update_syminfo_every_run: If it is needed to update the syminfo lib in every run,
                                          needed for parallel script executions
         :param last_bar_index: Last bar index, the index of the last bar of the historical data
+        :param batch: Calculate the supported TA calls of indicators over the whole data in advance,
+                      it needs NumPy, otherwise (and for strategies) the script runs bar by bar as usual
+        :param inputs: Input values by input (argument) name, they override the values of the script's toml file
+        :param profiler: Profiler to measure the time of the parts of the bar loop
         :raises ImportError: If the script does not have a 'main' function
         :raises ImportError: If the 'main' function is not decorated with @script.[indicator|strategy|library]
         :raises OSError: If the plot file could not be opened
         """
-        self.script_module = import_script(script_path)
+        if inputs:
+            from . import script as script_module
+            script_module._input_overrides.update(inputs)
+            try:
+                self.script_module = import_script(script_path)
+            finally:
+                script_module._input_overrides.clear()
+        else:
+            self.script_module = import_script(script_path)
 
         if not hasattr(self.script_module.main, 'script'):
             raise ImportError(f"The 'main' function must be decorated with "
@@ -199,38 +305,57 @@ class ScriptRunner:
         self.syminfo = syminfo
         self.update_syminfo_every_run = update_syminfo_every_run
         self.last_bar_index = last_bar_index
+        self.batch = batch
+        self.profiler = profiler
         self.bar_index = 0
 
         self.tz = _parse_timezone(syminfo.timezone)
 
         # Initialize tracking variables for statistics
-        self.equity_curve: list[float] = []
+        self.strategy_stats = StrategyStatsAccumulator()
         self.first_price: float | None = None
         self.last_price: float | None = None
+        # Statistics of the last run of a strategy
+        self.statistics: StrategyStatistics | None = None
+        # Progress of the run, it can be sampled from other threads
+        self.progress = RunProgress(last_bar_index + 1 if last_bar_index else 0)
 
-        self.plot_writer = CSVWriter(
-            plot_path, float_fmt=f".8g"
-        ) if plot_path else None
+        # Plot, trade and equity files are written as CSV or binary columnar (`.pcol`) files
+        self.plot_writer: OutputSink | None = create_output_sink(plot_path) if plot_path else None
         self.strat_writer = CSVWriter(strat_path, headers=(
             "Metric",
             f"All {syminfo.currency}", "All %",
             f"Long {syminfo.currency}", "Long %",
             f"Short {syminfo.currency}", "Short %",
         )) if strat_path else None
-        self.trades_writer = CSVWriter(trade_path, headers=(
+        trade_headers = (
             "Trade #", "Bar Index", "Type", "Signal", "Date/Time", f"Price {syminfo.currency}",
             "Contracts", f"Profit {syminfo.currency}", "Profit %", f"Cumulative profit {syminfo.currency}",
             "Cumulative profit %", f"Run-up {syminfo.currency}", "Run-up %", f"Drawdown {syminfo.currency}",
             "Drawdown %",
-        )) if trade_path else None
+        )
+        # In columnar files times are stored as UNIX timestamps in milliseconds, percents as floats
+        trade_types = dict(zip(trade_headers, ('q', 'q', 's', 's', 'q') + ('d',) * 10))
+        self.trades_writer: OutputSink | None = create_output_sink(
+            trade_path, headers=trade_headers, types=trade_types
+        ) if trade_path else None
+        self.equity_writer: OutputSink | None = create_output_sink(
+            equity_path, headers=("time", "equity"), types={"time": 'q', "equity": 'd'}
+        ) if equity_path and self.script.script_type == script_type.strategy else None
 
     # noinspection PyProtectedMember
-    def run_iter(self, on_progress: Callable[[datetime], None] | None = None) \
+    def run_iter(self, on_progress: Callable[[datetime], None] | None = None, *,
+                 progress_every: int = 1, progress_interval: float | None = None) \
             -> Iterator[tuple[OHLCV, dict[str, Any]] | tuple[OHLCV, dict[str, Any], list['Trade']]]:
         """
         Run the script on the data
 
-        :param on_progress: Callback to call on every iteration
+        The progress of the run is always available in `self.progress`, which is cheaper to sample
+        (e.g. with a `ProgressMonitor`) than calling a callback on every bar.
+
+        :param on_progress: Callback to call with the datetime of the bar (in the exchange timezone)
+        :param progress_every: Call `on_progress` only on every this many bars
+        :param progress_interval: Call `on_progress` at most once in this many seconds
         :return: Return a dictionary with all data the sctipt plotted
         :raises AssertionError: If the 'main' function does not return a dictionary
         """
@@ -255,6 +380,13 @@ class ScriptRunner:
             _set_lib_syminfo_properties(self.syminfo, lib)
             self.tz = _parse_timezone(lib.syminfo.timezone)
 
+        # Calculate TA calls in advance if possible
+        if self.batch and not is_strat:
+            self._prepare_batch(lib)
+
+        if self.profiler:
+            self.profiler.install(self.script_module, Path(self.script_module.__file__))
+
         # Open plot writer if we have one
         if self.plot_writer:
             self.plot_writer.open()
@@ -264,6 +396,15 @@ class ScriptRunner:
             # Open trade writer if we have one
             if self.trades_writer:
                 self.trades_writer.open()
+            # Open equity writer if we have one
+            if self.equity_writer:
+                self.equity_writer.open()
+
+        # Columnar trade files store raw values, CSV files formatted ones
+        if isinstance(self.trades_writer, ColumnarWriter):
+            fmt_time, fmt_percent = int, float
+        else:
+            fmt_time, fmt_percent = string.format_time, _format_percent
 
         # Clear plot data
         lib._plot_data.clear()
@@ -276,6 +417,12 @@ class ScriptRunner:
 
         self.last_bar_signals = []
 
+        # Progress
+        progress = self.progress
+        progress.reset()
+        progress_countdown = progress_every
+        next_progress_time = 0.0
+
         try:
             for candle in self.ohlcv_iter:
                 # Update syminfo lib properties if needed, other ScriptRunner instances may have changed them
@@ -323,10 +470,7 @@ class ScriptRunner:
                         lib._plot_data.update(res)
 
                     if self.plot_writer and lib._plot_data:
-                        extra_fields = {} if candle.extra_fields is None else dict(candle.extra_fields)
-                        extra_fields.update(lib._plot_data)
-                        updated_candle = candle._replace(extra_fields=extra_fields)
-                        self.plot_writer.write_ohlcv(updated_candle)
+                        self.plot_writer.write_plot(candle, lib._plot_data)
 
                     # Yield plot data to be able to process in a subclass
                     if not is_strat:
@@ -347,53 +491,68 @@ class ScriptRunner:
                             trade.entry_bar_index,
                             "Entry long" if trade.size > 0 else "Entry short",
                             trade.entry_comment if trade.entry_comment else trade.entry_id,
-                            string.format_time(trade.entry_time),  # type: ignore
+                            fmt_time(trade.entry_time),  # type: ignore
                             trade.entry_price,
                             abs(trade.size),
                             trade.profit,
-                            f"{trade.profit_percent:.2f}",
+                            fmt_percent(trade.profit_percent),
                             trade.cum_profit,
-                            f"{trade.cum_profit_percent:.2f}",
+                            fmt_percent(trade.cum_profit_percent),
                             trade.max_runup,
-                            f"{trade.max_runup_percent:.2f}",
+                            fmt_percent(trade.max_runup_percent),
                             trade.max_drawdown,
-                            f"{trade.max_drawdown_percent:.2f}",
+                            fmt_percent(trade.max_drawdown_percent),
                         )
                         self.trades_writer.write(
                             trade_num,
                             trade.exit_bar_index,
                             "Exit long" if trade.size > 0 else "Exit short",
                             trade.exit_comment if trade.exit_comment else trade.exit_id,
-                            string.format_time(trade.exit_time),  # type: ignore
+                            fmt_time(trade.exit_time),  # type: ignore
                             trade.exit_price,
                             abs(trade.size),
                             trade.profit,
-                            f"{trade.profit_percent:.2f}",
+                            fmt_percent(trade.profit_percent),
                             trade.cum_profit,
-                            f"{trade.cum_profit_percent:.2f}",
+                            fmt_percent(trade.cum_profit_percent),
                             trade.max_runup,
-                            f"{trade.max_runup_percent:.2f}",
+                            fmt_percent(trade.max_runup_percent),
                             trade.max_drawdown,
-                            f"{trade.max_drawdown_percent:.2f}",
+                            fmt_percent(trade.max_drawdown_percent),
                         )
 
                 # Clear plot data
                 lib._plot_data.clear()
 
-                # Track equity curve for strategies
+                # Update statistics for strategies
                 if is_strat and position:
                     current_equity = float(position.equity) if position.equity else self.script.initial_capital
-                    self.equity_curve.append(current_equity)
+                    self.strategy_stats.add_equity(current_equity)
+                    if self.equity_writer:
+                        self.equity_writer.write(candle.timestamp, current_equity)
+                    self.strategy_stats.add_closed_trades(position.closed_trades)
+
+                # Update progress
+                progress.bars += 1
+                progress.timestamp = candle.timestamp
 
                 # Call the progress callback
-                if on_progress and lib._datetime is not None:
-                    on_progress(lib._datetime.replace(tzinfo=None))
+                if on_progress:
+                    progress_countdown -= 1
+                    if progress_countdown <= 0:
+                        progress_countdown = progress_every
+                        if progress_interval is None:
+                            on_progress(lib._time_context.local_datetime)
+                        elif (now := monotonic()) >= next_progress_time:
+                            next_progress_time = now + progress_interval
+                            on_progress(lib._time_context.local_datetime)
 
                 # Update bar index
                 self.bar_index += 1
                 # It is no longer the first bar
                 barstate.isfirst = False
 
+            progress.finished = True
             if on_progress:
                 on_progress(datetime.max)
 
@@ -411,17 +570,17 @@ class ScriptRunner:
                             trade.entry_bar_index,
                             "Entry long" if trade.size > 0 else "Entry short",
                             trade.entry_id,
-                            string.format_time(trade.entry_time),  # type: ignore
+                            fmt_time(trade.entry_time),  # type: ignore
                             trade.entry_price,
                             abs(trade.size),
                             0.0,  # No profit yet for open trades
-                            "0.00",  # No profit percent yet
+                            fmt_percent(0.0),  # No profit percent yet
                             0.0,  # No cumulative profit change
-                            "0.00",  # No cumulative profit percent change
+                            fmt_percent(0.0),  # No cumulative profit percent change
                             0.0,  # No max runup yet
-                            "0.00",  # No max runup percent yet
+                            fmt_percent(0.0),  # No max runup percent yet
                             0.0,  # No max drawdown yet
-                            "0.00",  # No max drawdown percent yet
+                            fmt_percent(0.0),  # No max drawdown percent yet
                         )
 
                         # Export the exit part with "Open" signal (TradingView compatibility)
@@ -442,35 +601,35 @@ class ScriptRunner:
                                 self.bar_index - 1,  # Last bar index
                                 "Exit long" if trade.size > 0 else "Exit short",
                                 "Open",  # TradingView uses "Open" signal for automatic closes
-                                string.format_time(lib._time),  # type: ignore
+                                fmt_time(lib._time),  # type: ignore
                                 exit_price,
                                 abs(trade.size),
                                 pnl,
-                                f"{pnl_percent:.2f}",
+                                fmt_percent(pnl_percent),
                                 pnl,  # Same as profit for last trade
-                                f"{pnl_percent:.2f}",
+                                fmt_percent(pnl_percent),
                                 max(0.0, pnl),  # Runup
-                                f"{max(0, pnl_percent):.2f}",
+                                fmt_percent(max(0, pnl_percent)),
                                 max(0.0, -pnl),  # Drawdown
-                                f"{max(0, -pnl_percent):.2f}",
+                                fmt_percent(max(0, -pnl_percent)),
                             )
 
+                # Calculate comprehensive statistics
+                self.strategy_stats.add_closed_trades(position.closed_trades)
+                self.statistics = self.strategy_stats.statistics(
+                    position,
+                    self.script.initial_capital,
+                    self.first_price,
+                    self.last_price
+                )
+
                 # Write strategy statistics
-                if self.strat_writer and position:
+                if self.strat_writer:
                     try:
                         # Open strat writer and write statistics
                         self.strat_writer.open()
 
-                        # Calculate comprehensive statistics
-                        stats = calculate_strategy_statistics(
-                            position,
-                            self.script.initial_capital,
-                            self.equity_curve if self.equity_curve else None,
-                            self.first_price,
-                            self.last_price
-                        )
-
-                        write_strategy_statistics_csv(stats, self.strat_writer)
+                        write_strategy_statistics_csv(self.statistics, self.strat_writer)
                         self.strat_writer.close()
 
                     finally:
@@ -483,18 +642,103 @@ class ScriptRunner:
             # Close the trade writer
             if self.trades_writer:
                 self.trades_writer.close()
+            # Close the equity writer
+            if self.equity_writer:
+                self.equity_writer.close()
 
             # Reset library variables
             _reset_lib_vars(lib)
             # Reset function isolation
             function_isolation.reset()
 
-    def run(self, on_progress: Callable[[datetime], None] | None = None):
+            if self.profiler:
+                self.profiler.uninstall()
+
+    def _prepare_batch(self, lib: ModuleType):
+        """
+        Calculate the TA calls of the script, which can be calculated over the whole data in advance
+        """
+        from . import batch_ta, function_isolation
+
+        if not batch_ta.is_available():
+            return
+        calls = batch_ta.find_batch_calls_in_script(Path(self.script_module.__file__))
+        if not calls:
+            return
+
+        # We need the whole data in advance, ranges of OHLCV files can give it as columns
+        if isinstance(self.ohlcv_iter, OHLCVRange):
+            columns = batch_ta.get_source_columns_from_arrays(self.ohlcv_iter.as_arrays(), self.syminfo)
+        else:
+            candles = list(self.ohlcv_iter)
+            self.ohlcv_iter = candles
+            columns = batch_ta.get_source_columns(candles, self.syminfo)
+        function_isolation.set_precalculated(self.script_module.__scope_id__,
+                                             batch_ta.calculate_batch_calls(calls, columns, lib))
+
+    @classmethod
+    def run_batch(cls, script_path: Path, data_paths: Iterable[Path],
+                  input_sets: Iterable[dict[str, Any] | None] | None = None, *,
+                  time_from: int | None = None, time_to: int | None = None,
+                  workers: int | None = None, summary_path: Path | None = None,
+                  sys_paths: Iterable[str] = ()) -> Iterator[RunResult]:
+        """
+        Run a script on many data files and/or input sets in parallel
+
+        Every combination of data files and input sets is run in a pool of worker processes. Script state
+        is global (lib properties, function isolation, series), so every worker runs one script at a time,
+        but workers are kept alive between runs, so the imports are not repeated.
+
+        :param script_path: The path to the script to run
+        :param data_paths: Paths of the OHLCV files, the symbol info is loaded from the toml file next to them
+        :param input_sets: Input values to run the script with, if not specified, the script runs with
+                           the values of its toml file
+        :param time_from: Start timestamp, if not specified, the start of the data
+        :param time_to: End timestamp, if not specified, the end of the data
+        :param workers: Number of worker processes, default is the number of CPUs
+        :param summary_path: Path of the summary CSV with the strategy statistics of every run
+        :param sys_paths: Additional import paths for the workers (e.g. the library directory)
+        :return: Iterator of run results in the order of completion
+        """
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        input_list = list(input_sets) if input_sets is not None else [None]
+        jobs = [(data_path, inputs) for data_path in data_paths for inputs in input_list]
+        if not jobs:
+            return
+
+        summary_writer = CSVWriter(summary_path) if summary_path else None
+        if summary_writer:
+            summary_writer.open()
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(jobs)),
+                                     initializer=_init_batch_worker,
+                                     initargs=(list(sys_paths),)) as executor:
+                futures = [executor.submit(_run_batch_job, script_path, data_path, inputs, time_from, time_to)
+                           for data_path, inputs in jobs]
+                try:
+                    for future in as_completed(futures):
+                        result = future.result()
+                        if summary_writer:
+                            _write_summary_row(summary_writer, result)
+                        yield result
+                finally:
+                    for future in futures:
+                        future.cancel()
+        finally:
+            if summary_writer:
+                summary_writer.close()
+
+    def run(self, on_progress: Callable[[datetime], None] | None = None, *,
+            progress_every: int = 1, progress_interval: float | None = None):
         """
         Run the script on the data
 
-        :param on_progress: Callback to call on every iteration
+        :param on_progress: Callback to call with the datetime of the bar (in the exchange timezone)
+        :param progress_every: Call `on_progress` only on every this many bars
+        :param progress_interval: Call `on_progress` at most once in this many seconds
         :raises AssertionError: If the 'main' function does not return a dictionary
         """
-        for _ in self.run_iter(on_progress=on_progress):
+        for _ in self.run_iter(on_progress=on_progress, progress_every=progress_every,
+                               progress_interval=progress_interval):
             pass
@@ -1,15 +1,20 @@
 from __future__ import annotations
-from typing import TypeVar, Generic, Iterator, cast
+from typing import Any, TypeVar, Generic, Iterator, cast
 
+import math
+from array import array
 from types import ModuleType
 
 # noinspection PyProtectedMember
 from ..types.na import NA
 
-__all__ = ['SeriesImpl', 'inline_series']
+__all__ = ['SeriesImpl', 'FloatSeriesImpl', 'IntSeriesImpl', 'BoolSeriesImpl', 'inline_series']
 
 T = TypeVar('T')
 
+# NA value of int series
+_NA_INT = -2 ** 63
+
 
 class SeriesImpl(Generic[T]):
     """
@@ -48,7 +53,7 @@ class SeriesImpl(Generic[T]):
         self._capacity = self._max_bars_back + 1
 
         # Pre-allocated buffer with None values for better performance
-        self._buffer: list[T | NA | None] = [None] * self._capacity
+        self._buffer: Any = self._new_buffer(self._capacity)
 
         # The next logical write position in a circular manner.
         self._write_pos = 0
@@ -96,7 +101,7 @@ class SeriesImpl(Generic[T]):
             self._max_bars_back_set = new_max_bars_back
             self._capacity = new_capacity
             # Extend pre-allocated buffer with None values
-            self._buffer.extend([None] * (new_capacity - len(self._buffer)))
+            self._buffer.extend(self._new_buffer(new_capacity - len(self._buffer)))
             return
 
         old_buffer = self._buffer
@@ -105,17 +110,19 @@ class SeriesImpl(Generic[T]):
         # Number of items to keep: either all old items or new_capacity, whichever is smaller.
         items_to_keep = min(old_size, new_capacity)
 
-        # Build a new pre-allocated buffer.
-        new_buffer: list[T | NA[T] | None] = [None] * new_capacity
-
-        if items_to_keep > 0 and old_buffer:
+        if items_to_keep > 0:
             # The newest item is at (old_write_pos - 1) in a circular manner.
             # We'll copy the most recent 'items_to_keep' from the old buffer in linear order.
             start_idx = (old_write_pos - items_to_keep) % old_capacity
-
-            for i in range(items_to_keep):
-                src_idx = (start_idx + i) % old_capacity
-                new_buffer[i] = old_buffer[src_idx]
+            end_idx = start_idx + items_to_keep
+            if end_idx <= old_capacity:
+                new_buffer = old_buffer[start_idx:end_idx]
+            else:
+                new_buffer = old_buffer[start_idx:] + old_buffer[:end_idx - old_capacity]
+            # Pre-allocate the rest of the new buffer
+            new_buffer += self._new_buffer(new_capacity - items_to_keep)
+        else:
+            new_buffer = self._new_buffer(new_capacity)
 
         # Update references
         self._buffer = new_buffer
@@ -125,6 +132,42 @@ class SeriesImpl(Generic[T]):
         self._size = items_to_keep
         self._write_pos = items_to_keep  # The next free slot is after the last copied item
 
+    @staticmethod
+    def _new_buffer(size: int) -> Any:
+        """
+        Create a new (empty) buffer part
+
+        :param size: The number of elements
+        :return: The new buffer part
+        """
+        return [None] * size
+
+    def window(self, length: int) -> Any:
+        """
+        Returns the last `length` values, from the oldest to the newest.
+
+        For typed series it is a zero-copy memoryview of the storage if the values are contiguous
+        in the ring buffer, otherwise a copy. The values are in the storage format, so NA is NaN in
+        float series. It is useful to work on the window at once, e.g. with `numpy.frombuffer()`.
+
+        :param length: The number of values, it must not be more than the number of values in the series
+        :return: The values
+        :raises IndexError: If there are less values than `length`
+        """
+        if length < 0 or length > self._size:
+            raise IndexError("Window length out of range!")
+        end = self._write_pos
+        start = end - length
+        if start >= 0:
+            return self._view(start, end)
+        return self._buffer[start + self._capacity:] + self._buffer[:end]
+
+    def _view(self, start: int, end: int) -> Any:
+        """
+        A contiguous part of the buffer
+        """
+        return self._buffer[start:end]
+
     def add(self, value: T | NA[T]) -> T | NA[T]:
         """
         Adds a new candle (data point) to the buffer.
@@ -150,10 +193,9 @@ class SeriesImpl(Generic[T]):
             pos = self._write_pos
             if pos >= self._capacity:
                 pos = 0
-                self._write_pos = 1
-            else:
-                self._write_pos += 1
+            # Store first, so the state is unchanged if the value can't be stored (typed series)
             self._buffer[pos] = value
+            self._write_pos = pos + 1
 
         # Store the last bar index to prevent adding more than one value per bar
         self._last_bar_index = lib.bar_index
@@ -236,6 +278,119 @@ class SeriesImpl(Generic[T]):
         return self._size
 
 
+class _TypedSeriesImpl(SeriesImpl[T]):
+    """
+    Series which stores its values in a typed array instead of a list of objects, NA is stored as a
+    special value. If a value can not be stored in the array (e.g. a float in an int series), the series
+    is converted to a normal `SeriesImpl`.
+    """
+
+    __slots__ = ()
+
+    _typecode: str = 'd'
+    _na_value: Any = math.nan
+
+    @classmethod
+    def _new_buffer(cls, size: int) -> Any:
+        return array(cls._typecode, (cls._na_value,)) * size
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        """
+        Convert a stored value back to the value of the series, subclasses convert their NA value to NA
+        """
+        return value
+
+    def _view(self, start: int, end: int) -> Any:
+        return memoryview(self._buffer)[start:end]
+
+    def _to_generic(self) -> None:
+        """
+        Convert the series to a normal SeriesImpl, storing objects in a list
+        """
+        decode = self._decode
+        self._buffer = [decode(v) for v in self._buffer]
+        self.__class__ = SeriesImpl  # type: ignore
+
+    def add(self, value: T | NA[T]) -> T | NA[T]:
+        if self._last_bar_index == SeriesImpl._lib.bar_index:
+            return self.set(value)
+        try:
+            SeriesImpl.add(self, self._na_value if isinstance(value, NA) else value)  # type: ignore
+        except (TypeError, OverflowError):
+            self._to_generic()
+            SeriesImpl.add(self, value)
+        return value
+
+    def set(self, value: T | NA[T]) -> T | NA[T]:
+        try:
+            SeriesImpl.set(self, self._na_value if isinstance(value, NA) else value)  # type: ignore
+        except (TypeError, OverflowError):
+            self._to_generic()
+            return SeriesImpl.set(self, value)
+        return value if self._size else cast(NA[T], NA())
+
+    def __getitem__(self, key: int | slice) -> T | NA[T] | ReadOnlySeriesView[T]:
+        if type(key) is int and 0 <= key < self._size:
+            pos = self._write_pos - 1 - key
+            if pos < 0:
+                pos += self._capacity
+            return self._decode(self._buffer[pos])
+
+        result = SeriesImpl.__getitem__(self, key)
+        if isinstance(result, ReadOnlySeriesView):
+            return _TypedSeriesView(self._decode, self._buffer, self._capacity, self._write_pos, self._size,
+                                    result._start, result._stop)  # noqa
+        if isinstance(result, NA):
+            return result
+        return self._decode(result)
+
+
+class FloatSeriesImpl(_TypedSeriesImpl[float]):
+    """
+    Float series, values are stored as doubles, NA is NaN
+    """
+
+    __slots__ = ()
+
+    _typecode = 'd'
+    _na_value = math.nan
+
+    @staticmethod
+    def _decode(value: float) -> float | NA[float]:
+        return value if value == value else NA(float)
+
+
+class IntSeriesImpl(_TypedSeriesImpl[int]):
+    """
+    Int series, values are stored as 64-bit integers, NA is the smallest integer
+    """
+
+    __slots__ = ()
+
+    _typecode = 'q'
+    _na_value = _NA_INT
+
+    @staticmethod
+    def _decode(value: int) -> int | NA[int]:
+        return value if value != _NA_INT else NA(int)
+
+
+class BoolSeriesImpl(_TypedSeriesImpl[bool]):
+    """
+    Bool series, values are stored as bytes, NA is -1
+    """
+
+    __slots__ = ()
+
+    _typecode = 'b'
+    _na_value = -1
+
+    @staticmethod
+    def _decode(value: int) -> bool | NA[bool]:
+        return bool(value) if value >= 0 else NA(bool)
+
+
 class ReadOnlySeriesView(Generic[T]):
     """
     A read-only view for a circular buffer slice that follows Pine-like indexing.
@@ -292,7 +447,29 @@ class ReadOnlySeriesView(Generic[T]):
 
     def __repr__(self) -> str:
         """Get string representation"""
-        return f"ReadOnlySeriesView({list(self)})"
+        return f"{type(self).__name__}({list(self)})"
+
+
+class _TypedSeriesView(ReadOnlySeriesView[T]):
+    """
+    Read-only view of a typed series, it converts the stored values
+    """
+    __slots__ = ('_decode',)
+
+    def __init__(self, decode, *args) -> None:
+        """
+        :param decode: Function to convert the stored values
+        """
+        super().__init__(*args)
+        self._decode = decode
+
+    def __getitem__(self, idx: int) -> T | NA[T]:
+        return self._decode(super().__getitem__(idx))
+
+    def __iter__(self) -> Iterator[T | NA[T]]:
+        decode = self._decode
+        for value in super().__iter__():
+            yield decode(value)
 
 
 __series_function_vars__ = {'create_series': ['__series_create_series_series__']}
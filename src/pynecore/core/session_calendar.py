@@ -0,0 +1,186 @@
+from typing import Iterator
+from bisect import bisect_left, bisect_right
+from datetime import datetime, date, time
+
+from .syminfo import SymInfoInterval, SymInfoSession
+
+__all__ = ['SessionCalendar', 'local_seconds', 'DAY_SECONDS']
+
+DAY_SECONDS = 24 * 60 * 60
+
+# 1970-01-01 was a Thursday
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_EPOCH_WEEKDAY = 3
+
+
+def local_seconds(dt: datetime) -> int:
+    """
+    Convert a datetime to wall clock seconds: seconds since 1970-01-01 00:00 of the same timezone,
+    without the UTC offset. Session times are wall clock times, so they can be compared to these directly.
+
+    :param dt: The datetime in the exchange timezone
+    :return: The wall clock time in seconds
+    """
+    return (dt.toordinal() - _EPOCH_ORDINAL) * DAY_SECONDS + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+def _time_seconds(t: time) -> int:
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+class SessionCalendar:
+    """
+    Precompiled trading sessions of a symbol.
+
+    The session boundaries are stored in seconds of day in sorted arrays for every weekday, so the session
+    checks are bisect lookups instead of building datetimes for every bar. All times are wall clock times of
+    the exchange timezone (see `local_seconds()`), so daylight saving time changes are handled by the
+    datetimes of the bars.
+    """
+
+    __slots__ = ('_interval_starts', '_interval_max_ends', '_starts', '_ends', '_overnight_starts')
+
+    def __init__(self, opening_hours: list[SymInfoInterval], session_starts: list[SymInfoSession],
+                 session_ends: list[SymInfoSession]):
+        """
+        :param opening_hours: The opening hours of the symbol
+        :param session_starts: The session starts of the symbol
+        :param session_ends: The session ends of the symbol
+        """
+        # Opening hours by weekday, sorted by start, with the running maximum of the ends
+        self._interval_starts: list[list[int]] = [[] for _ in range(7)]
+        self._interval_max_ends: list[list[int]] = [[] for _ in range(7)]
+        # Start times of overnight sessions by weekday
+        self._overnight_starts: list[set[int]] = [set() for _ in range(7)]
+
+        intervals: list[list[tuple[int, int]]] = [[] for _ in range(7)]
+        for day, start, end in opening_hours:
+            start_sec, end_sec = _time_seconds(start), _time_seconds(end)
+            if end_sec < start_sec:  # Overnight session
+                self._overnight_starts[day].add(start_sec)
+                end_sec += DAY_SECONDS
+            intervals[day].append((start_sec, end_sec))
+        for day, day_intervals in enumerate(intervals):
+            max_end = -1
+            for start_sec, end_sec in sorted(day_intervals):
+                max_end = max(max_end, end_sec)
+                self._interval_starts[day].append(start_sec)
+                self._interval_max_ends[day].append(max_end)
+
+        self._starts: list[list[int]] = [[] for _ in range(7)]
+        for day, t in session_starts:
+            self._starts[day].append(_time_seconds(t))
+        self._ends: list[list[int]] = [[] for _ in range(7)]
+        for day, t in session_ends:
+            self._ends[day].append(_time_seconds(t))
+        for values in self._starts + self._ends:
+            values.sort()
+
+    @staticmethod
+    def weekday(t: int) -> int:
+        """
+        Get the weekday of a wall clock time, Monday is 0
+
+        :param t: Wall clock time in seconds
+        :return: The weekday
+        """
+        return (t // DAY_SECONDS + _EPOCH_WEEKDAY) % 7
+
+    def first_session_start(self, weekday: int) -> int | None:
+        """
+        Get the first session start of a weekday
+
+        :param weekday: The weekday, Monday is 0
+        :return: Seconds of day of the first session start, None if there is no session on that day
+        """
+        starts = self._starts[weekday]
+        return starts[0] if starts else None
+
+    def in_session(self, t: int, tf_sec: int) -> bool:
+        """
+        Check if a candle overlaps with any opening hours interval of its day
+
+        :param t: Wall clock start time of the candle in seconds
+        :param tf_sec: Timeframe in seconds
+        :return: True if the candle overlaps with any session
+        """
+        tod = t % DAY_SECONDS
+        day = (t // DAY_SECONDS + _EPOCH_WEEKDAY) % 7
+        # The intervals starting before the end of the candle, one of them must end after its start
+        i = bisect_right(self._interval_starts[day], tod + tf_sec)
+        return i > 0 and self._interval_max_ends[day][i - 1] > tod
+
+    def is_session_start(self, t: int, tf_sec: int) -> bool:
+        """
+        Check if a session of the day starts in the candle
+
+        :param t: Wall clock start time of the candle in seconds
+        :param tf_sec: Timeframe in seconds
+        :return: True if a session starts in the candle
+        """
+        tod = t % DAY_SECONDS
+        starts = self._starts[(t // DAY_SECONDS + _EPOCH_WEEKDAY) % 7]
+        i = bisect_left(starts, tod)
+        return i < len(starts) and starts[i] < tod + tf_sec
+
+    def is_session_end(self, t: int, tf_sec: int) -> bool:
+        """
+        Check if a session of the day ends in the candle, after its start
+
+        :param t: Wall clock start time of the candle in seconds
+        :param tf_sec: Timeframe in seconds
+        :return: True if a session ends in the candle
+        """
+        tod = t % DAY_SECONDS
+        ends = self._ends[(t // DAY_SECONDS + _EPOCH_WEEKDAY) % 7]
+        i = bisect_right(ends, tod)
+        return i < len(ends) and ends[i] < tod + tf_sec
+
+    def is_new_session(self, t: int, prev_t: int, tf_sec: int) -> bool:
+        """
+        Check if a candle starts a new session
+
+        :param t: Wall clock start time of the candle in seconds
+        :param prev_t: Wall clock start time of the previous candle in seconds
+        :param tf_sec: Timeframe in seconds
+        :return: True if this is the first candle of a new session
+        """
+        tod = t % DAY_SECONDS
+        day = (t // DAY_SECONDS + _EPOCH_WEEKDAY) % 7
+        prev_day = (prev_t // DAY_SECONDS + _EPOCH_WEEKDAY) % 7
+        starts = self._starts[day]
+        if day == prev_day:
+            # A session starts in the candle, after the previous candle
+            i = max(bisect_left(starts, tod), bisect_right(starts, prev_t - (t - tod)))
+            return i < len(starts) and starts[i] < tod + tf_sec
+        # On the first candle of a day, sessions starting later are counted from the previous day, so only
+        # a session (or an overnight session of the previous day) starting right at the candle counts
+        if prev_t >= t:
+            return False
+        i = bisect_left(starts, tod)
+        return (i < len(starts) and starts[i] == tod) or tod in self._overnight_starts[prev_day]
+
+    def new_sessions(self, start: int, end: int, tf_sec: int) -> Iterator[int]:
+        """
+        Find the candles starting a new session on a continuous grid of candles, without checking every
+        candle of the grid.
+
+        :param start: Wall clock start time of the first candle of the grid
+        :param end: Candles starting at or after this are not checked
+        :param tf_sec: Timeframe in seconds
+        :return: Wall clock start times of the candles starting a new session, in order
+        """
+        last = None
+        day0 = start - start % DAY_SECONDS
+        while day0 < end + tf_sec:
+            day = (day0 // DAY_SECONDS + _EPOCH_WEEKDAY) % 7
+            # A new session is always detected by a session start (or an overnight session start of
+            # the previous day) in the candle
+            candidates = set(self._starts[day])
+            candidates.update(self._overnight_starts[(day - 1) % 7])
+            for tod in sorted(candidates):
+                t = start + (day0 + tod - start) // tf_sec * tf_sec
+                if t != last and start <= t < end and self.is_new_session(t, t - tf_sec, tf_sec):
+                    last = t
+                    yield t
+            day0 += DAY_SECONDS
@@ -0,0 +1,147 @@
+"""
+Sliding window for rolling order statistics (median, percentiles, percent rank)
+"""
+from typing import Any
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+
+from ..types.na import NA
+
+__all__ = ['SortedWindow']
+
+
+class SortedWindow:
+    """
+    Sliding window of the last `length` values, which keeps its values in sorted order too.
+
+    Adding a new value and removing the oldest one are binary searches and a block move of the sorted list,
+    so the order statistics don't need to sort or scan the whole window on every bar.
+    NA values take up a place in the window, but they are not part of the order statistics.
+    """
+
+    __slots__ = ('length', '_window', '_sorted')
+
+    def __init__(self, length: int):
+        """
+        :param length: The length of the window
+        """
+        self.length = int(length)
+        self._window: deque[Any] = deque()
+        self._sorted: list[Any] = []
+
+    def __len__(self) -> int:
+        """
+        The number of (non-NA) values in the window
+        """
+        return len(self._sorted)
+
+    @property
+    def is_full(self) -> bool:
+        """
+        True if the window has `length` elements (including NA values)
+        """
+        return len(self._window) >= self.length
+
+    @property
+    def values(self) -> list[Any]:
+        """
+        The sorted values of the window, it must not be modified
+        """
+        return self._sorted
+
+    def push(self, value: Any) -> None:
+        """
+        Add a new value and remove the oldest one if the window is full
+
+        :param value: The new value
+        """
+        window = self._window
+        window.append(value)
+        if not isinstance(value, NA):
+            insort(self._sorted, value)
+        if len(window) > self.length:
+            old = window.popleft()
+            if not isinstance(old, NA):
+                del self._sorted[bisect_left(self._sorted, old)]
+
+    def median(self, lower: bool = False) -> Any:
+        """
+        The median of the window
+
+        :param lower: If True, the lower middle value is returned for even number of values, instead of the
+                      average of the middle values (used for integers)
+        :return: The median or NA if the window is empty
+        """
+        values = self._sorted
+        n = len(values)
+        if not n:
+            return NA(float)
+        mid = n // 2
+        if n % 2:
+            return values[mid]
+        if lower:
+            return values[mid - 1]
+        return (values[mid - 1] + values[mid]) / 2
+
+    def percentile_linear_interpolation(self, percentage: float) -> float | NA[float]:
+        """
+        The percentile using linear interpolation between the two nearest ranks, same as
+        `array.percentile_linear_interpolation()`
+
+        :param percentage: Percentile (0-100)
+        :return: The percentile or NA if the window is empty
+        :raises ValueError: If percentage is not between 0 and 100
+        """
+        if not (0 <= percentage <= 100):
+            raise ValueError("Percentage must be between 0 and 100")
+        values = self._sorted
+        n = len(values)
+        if not n:
+            return NA(float)
+
+        pos = n * percentage / 100.0
+        if pos < 1:
+            return values[0]
+        if pos >= n:
+            return values[-1]
+        if pos.is_integer():
+            pos_int = int(pos)
+            return (values[pos_int - 1] + values[pos_int]) / 2.0
+
+        lower_index = int(pos)
+        frac = pos - lower_index
+        return values[lower_index] + frac * (values[lower_index + 1] - values[lower_index])
+
+    def percentile_nearest_rank(self, percentage: float) -> float | NA[float]:
+        """
+        The percentile using the nearest rank method, same as `array.percentile_nearest_rank()`
+
+        :param percentage: Percentile (0-100)
+        :return: The percentile or NA if the window is empty
+        :raises ValueError: If percentage is not between 0 and 100
+        """
+        if not (0 <= percentage <= 100):
+            raise ValueError("Percentage must be between 0 and 100")
+        values = self._sorted
+        n = len(values)
+        if not n:
+            return NA(float)
+        if percentage == 0:
+            return values[0]
+
+        rank = max(1, min(math.ceil(percentage * n / 100), n))
+        return values[rank - 1]
+
+    def percentrank(self, value: float) -> float | NA[float]:
+        """
+        The percentage of the other values of the window which are less than or equal to `value`,
+        same as `array.percentrank()`. The value must be in the window.
+
+        :param value: The value to rank
+        :return: The percent rank or NA if there are no other values
+        """
+        n = len(self._sorted)
+        if n < 2:
+            return NA(float)
+        return (bisect_right(self._sorted, value) - 1) * 100 / (n - 1)
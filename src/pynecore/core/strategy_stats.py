@@ -7,10 +7,12 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass
+from heapq import heappush, heappop
 
 from ..types.na import NA
 from ..lib.strategy import Trade
 from .csv_file import CSVWriter
+from .trade_store import ClosedTradeStore
 from ..lib.strategy import Position
 
 
@@ -184,6 +186,357 @@ class StrategyStatistics:
         }
 
 
+class _TradeGroupStats:
+    """Running statistics of a group of closed trades (all, long or short)"""
+
+    __slots__ = ('count', 'net_profit', 'bars', 'bars_count',
+                 'wins', 'win_profit', 'win_bars', 'win_bars_count', 'largest_win', 'largest_win_percent',
+                 'losses', 'loss_profit', 'loss_bars', 'loss_bars_count', 'largest_loss', 'largest_loss_percent')
+
+    def __init__(self):
+        self.count = 0
+        self.net_profit = 0.0
+        self.bars = 0
+        self.bars_count = 0
+
+        self.wins = 0
+        self.win_profit = 0.0
+        self.win_bars = 0
+        self.win_bars_count = 0
+        self.largest_win: float | None = None
+        self.largest_win_percent = 0.0
+
+        self.losses = 0
+        self.loss_profit = 0.0
+        self.loss_bars = 0
+        self.loss_bars_count = 0
+        self.largest_loss: float | None = None
+        self.largest_loss_percent = 0.0
+
+    def add(self, trade: Trade, profit: float, bars: int | None):
+        """
+        Add a closed trade
+
+        :param trade: The closed trade
+        :param profit: The profit of the trade
+        :param bars: The number of bars in the trade, None if unknown
+        """
+        self.count += 1
+        self.net_profit += profit
+        if bars is not None:
+            self.bars += bars
+            self.bars_count += 1
+
+        if profit > 0:
+            self.wins += 1
+            self.win_profit += profit
+            if bars is not None:
+                self.win_bars += bars
+                self.win_bars_count += 1
+            if self.largest_win is None or profit > self.largest_win:
+                self.largest_win = profit
+                self.largest_win_percent = float(trade.profit_percent)
+        elif profit < 0:
+            self.losses += 1
+            self.loss_profit += profit
+            if bars is not None:
+                self.loss_bars += bars
+                self.loss_bars_count += 1
+            if self.largest_loss is None or profit < self.largest_loss:
+                self.largest_loss = profit
+                self.largest_loss_percent = float(trade.profit_percent)
+
+
+class StrategyStatsAccumulator:
+    """
+    Incremental strategy statistics.
+
+    Closed trades and the equity of every bar are added one by one, and every metric is updated in O(1), so
+    no trade list or equity curve needs to be kept, and the statistics can be queried at any time of the run.
+    """
+
+    __slots__ = ('all', 'long', 'short', 'commission', 'cons_wins', 'cons_losses', 'max_cons_wins',
+                 'max_cons_losses', 'prev_equity', 'returns', 'return_mean', 'return_m2',
+                 'downside_returns', 'downside_sq_sum', 'trades_seen')
+
+    def __init__(self):
+        self.all = _TradeGroupStats()
+        self.long = _TradeGroupStats()
+        self.short = _TradeGroupStats()
+        self.commission = 0.0
+        self.cons_wins = 0
+        self.cons_losses = 0
+        self.max_cons_wins = 0
+        self.max_cons_losses = 0
+
+        # Moments of bar returns (Welford's algorithm) for Sharpe and Sortino ratios
+        self.prev_equity: float | None = None
+        self.returns = 0
+        self.return_mean = 0.0
+        self.return_m2 = 0.0
+        self.downside_returns = 0
+        self.downside_sq_sum = 0.0
+
+        # Number of trades already added from a closed trade store
+        self.trades_seen = 0
+
+    def add_trade(self, trade: Trade):
+        """
+        Add a closed trade
+
+        :param trade: The closed trade
+        """
+        profit = float(trade.profit)
+        bars = trade.exit_bar_index - trade.entry_bar_index if trade.exit_bar_index >= 0 else None
+        self.commission += trade.commission
+        self.all.add(trade, profit, bars)
+        if trade.sign > 0:
+            self.long.add(trade, profit, bars)
+        elif trade.sign < 0:
+            self.short.add(trade, profit, bars)
+
+        # Consecutive wins and losses
+        if profit > 0:
+            self.cons_wins += 1
+            self.cons_losses = 0
+            self.max_cons_wins = max(self.max_cons_wins, self.cons_wins)
+        elif profit < 0:
+            self.cons_losses += 1
+            self.cons_wins = 0
+            self.max_cons_losses = max(self.max_cons_losses, self.cons_losses)
+        else:
+            self.cons_wins = self.cons_losses = 0
+
+    def add_closed_trades(self, closed_trades: ClosedTradeStore):
+        """
+        Add the trades which were closed since the last call
+
+        :param closed_trades: The closed trade store of the position
+        """
+        new = closed_trades.count - self.trades_seen
+        if not new:
+            return
+        for trade in closed_trades.trades[-new:]:
+            self.add_trade(trade)
+        self.trades_seen = closed_trades.count
+
+    def add_equity(self, equity: float):
+        """
+        Add the equity at the end of a bar
+
+        :param equity: The equity
+        """
+        prev = self.prev_equity
+        self.prev_equity = equity
+        if not prev:
+            return
+        ret = (equity - prev) / prev
+        self.returns += 1
+        delta = ret - self.return_mean
+        self.return_mean += delta / self.returns
+        self.return_m2 += delta * (ret - self.return_mean)
+        if ret < 0:
+            self.downside_returns += 1
+            self.downside_sq_sum += ret * ret
+
+    def statistics(self, position: Position, initial_capital: float,
+                   first_price: float | None = None, last_price: float | None = None) -> StrategyStatistics:
+        """
+        Get the statistics of the trades and equities added so far
+
+        :param position: The position of the strategy
+        :param initial_capital: Initial capital for percentage calculations
+        :param first_price: First price for buy & hold calculation
+        :param last_price: Last price for buy & hold calculation
+        :return: StrategyStatistics object with all calculated metrics
+        """
+        stats = StrategyStatistics()
+
+        # Basic metrics from position
+        stats.net_profit = float(position.netprofit) if not isinstance(position.netprofit, NA) else 0.0
+        stats.gross_profit = float(position.grossprofit) if not isinstance(position.grossprofit, NA) else 0.0
+        stats.gross_loss = float(position.grossloss) if not isinstance(position.grossloss, NA) else 0.0
+        stats.max_equity_drawdown = float(position.max_drawdown) if not isinstance(position.max_drawdown, NA) \
+            else 0.0
+        stats.max_equity_runup = float(position.max_runup) if not isinstance(position.max_runup, NA) else 0.0
+
+        # Calculate percentages
+        if initial_capital > 0:
+            stats.net_profit_percent = (stats.net_profit / initial_capital) * 100
+            stats.gross_profit_percent = (stats.gross_profit / initial_capital) * 100
+            stats.gross_loss_percent = (stats.gross_loss / initial_capital) * 100
+            stats.max_equity_drawdown_percent = (stats.max_equity_drawdown / initial_capital) * 100
+            stats.max_equity_runup_percent = (stats.max_equity_runup / initial_capital) * 100
+
+        # Buy & Hold calculation
+        if first_price and last_price and first_price > 0:
+            buy_hold_shares = initial_capital / first_price
+            buy_hold_value = buy_hold_shares * last_price
+            stats.buy_and_hold_return = buy_hold_value - initial_capital
+            stats.buy_and_hold_return_percent = (stats.buy_and_hold_return / initial_capital) * 100
+
+        stats.total_trades = position.closed_trades_count
+        stats.winning_trades = position.wintrades
+        stats.losing_trades = position.losstrades
+        stats.total_open_trades = len(position.open_trades)
+
+        # Percent profitable
+        if stats.total_trades > 0:
+            stats.percent_profitable = (stats.winning_trades / stats.total_trades) * 100
+
+        # Profit factor
+        if stats.gross_loss != 0:
+            stats.profit_factor = abs(stats.gross_profit / stats.gross_loss)
+
+        # Calculate trade statistics
+        trades = self.all
+        if trades.count:
+            stats.commission_paid = self.commission
+
+            # Average calculations
+            stats.avg_trade = stats.net_profit / trades.count
+            stats.avg_trade_percent = stats.net_profit_percent / trades.count
+
+            # Winning trades statistics
+            if trades.wins:
+                stats.avg_winning_trade = trades.win_profit / trades.wins
+                stats.avg_winning_trade_percent = stats.avg_winning_trade / initial_capital * 100
+                stats.largest_winning_trade = trades.largest_win
+                stats.largest_winning_trade_percent = trades.largest_win_percent
+                if trades.win_bars_count:
+                    stats.avg_bars_in_winning_trades = trades.win_bars / trades.win_bars_count
+
+            # Losing trades statistics
+            if trades.losses:
+                stats.avg_losing_trade = trades.loss_profit / trades.losses
+                stats.avg_losing_trade_percent = stats.avg_losing_trade / initial_capital * 100
+                stats.largest_losing_trade = trades.largest_loss
+                stats.largest_losing_trade_percent = trades.largest_loss_percent
+                if trades.loss_bars_count:
+                    stats.avg_bars_in_losing_trades = trades.loss_bars / trades.loss_bars_count
+
+            # Ratio of average win to average loss
+            if stats.avg_losing_trade != 0:
+                stats.ratio_avg_win_loss = abs(stats.avg_winning_trade / stats.avg_losing_trade)
+
+            # Average bars in all trades
+            if trades.bars_count:
+                stats.avg_bars_in_trades = trades.bars / trades.bars_count
+
+            # Long statistics
+            long = self.long
+            if long.count:
+                stats.long_trades = long.count
+                stats.long_winning_trades = long.wins
+                stats.long_net_profit = long.net_profit
+                stats.long_net_profit_percent = (stats.long_net_profit / initial_capital) * 100
+
+                if long.wins:
+                    stats.long_gross_profit = long.win_profit
+                    stats.long_gross_profit_percent = (stats.long_gross_profit / initial_capital) * 100
+                    stats.long_largest_winning_trade = long.largest_win
+                    stats.long_largest_winning_trade_percent = long.largest_win_percent
+
+                if long.losses:
+                    stats.long_gross_loss = long.loss_profit
+                    stats.long_gross_loss_percent = (stats.long_gross_loss / initial_capital) * 100
+                    stats.long_largest_losing_trade = long.largest_loss
+                    stats.long_largest_losing_trade_percent = long.largest_loss_percent
+
+                stats.long_avg_trade = stats.long_net_profit / long.count
+                stats.long_avg_trade_percent = stats.long_net_profit_percent / long.count
+                if long.bars_count:
+                    stats.long_avg_bars = long.bars / long.bars_count
+
+            # Short statistics
+            short = self.short
+            if short.count:
+                stats.short_trades = short.count
+                stats.short_winning_trades = short.wins
+                stats.short_net_profit = short.net_profit
+                stats.short_net_profit_percent = (stats.short_net_profit / initial_capital) * 100
+
+                if short.wins:
+                    stats.short_gross_profit = short.win_profit
+                    stats.short_gross_profit_percent = (stats.short_gross_profit / initial_capital) * 100
+                    stats.short_largest_winning_trade = short.largest_win
+                    stats.short_largest_winning_trade_percent = short.largest_win_percent
+
+                if short.losses:
+                    stats.short_gross_loss = short.loss_profit
+                    stats.short_gross_loss_percent = (stats.short_gross_loss / initial_capital) * 100
+                    stats.short_largest_losing_trade = short.largest_loss
+                    stats.short_largest_losing_trade_percent = short.largest_loss_percent
+
+                stats.short_avg_trade = stats.short_net_profit / short.count
+                stats.short_avg_trade_percent = stats.short_net_profit_percent / short.count
+                if short.bars_count:
+                    stats.short_avg_bars = short.bars / short.bars_count
+
+            # Max consecutive wins/losses
+            stats.max_cons_winning_trades = self.max_cons_wins
+            stats.max_cons_losing_trades = self.max_cons_losses
+
+        stats.max_contracts_held = _max_contracts_held(position)
+
+        # Sharpe and Sortino ratios
+        if self.returns:
+            avg_return = self.return_mean
+
+            # Sharpe ratio calculation
+            if self.returns > 1:
+                std_dev = math.sqrt(self.return_m2 / (self.returns - 1))
+                if std_dev > 0:
+                    # Annualized Sharpe ratio (assuming daily returns and 252 trading days)
+                    stats.sharpe_ratio = (avg_return * 252) / (std_dev * math.sqrt(252))
+
+            # Sortino ratio calculation
+            if self.downside_returns > 1:
+                downside_std = math.sqrt(self.downside_sq_sum / self.downside_returns)
+                if downside_std > 0:
+                    # Annualized Sortino ratio
+                    stats.sortino_ratio = (avg_return * 252) / (downside_std * math.sqrt(252))
+
+        return stats
+
+
+def _max_contracts_held(position: Position) -> float:
+    """
+    Calculate the maximum of the summed size of the trades open at the same time, checked at every entry.
+    It uses the columns of the kept closed trades and the open trades.
+
+    :param position: The position of the strategy
+    :return: The maximum contracts held
+    """
+    closed_trades = position.closed_trades
+    entry_times = closed_trades.column('entry_time')
+    exit_times = closed_trades.column('exit_time')
+    sizes = closed_trades.column('size')
+    for trade in position.open_trades:
+        entry_times.append(trade.entry_time)
+        exit_times.append(trade.exit_time)
+        sizes.append(trade.size)
+
+    max_size = 0.0
+    current_size = 0.0
+    # (exit time, size) of the trades open at the current entry, open trades never exit
+    current: list[tuple[float, float]] = []
+    # The trades ordered by entry time, the same way as a stable sort
+    for i in sorted(range(len(entry_times)), key=entry_times.__getitem__):
+        entry_time = entry_times[i]
+        exit_time = exit_times[i]
+        size = abs(sizes[i])
+        heappush(current, (exit_time if exit_time >= 0 else math.inf, size))
+        current_size += size
+        # Remove trades exited before this entry
+        while current[0][0] <= entry_time:
+            current_size -= heappop(current)[1]
+            if not current:
+                break
+        max_size = max(max_size, current_size)
+    return max_size
+
+
 def calculate_strategy_statistics(
         position: Position,
         initial_capital: float,
@@ -194,6 +547,8 @@ def calculate_strategy_statistics(
     """
     Calculate comprehensive strategy statistics from position data.
 
+    During a run `StrategyStatsAccumulator` can be used instead, which does not need the equity curve.
+
     :param position: Position object containing all trade data
     :param initial_capital: Initial capital for percentage calculations
     :param equity_curve: List of equity values for Sharpe/Sortino calculations
@@ -201,242 +556,11 @@ def calculate_strategy_statistics(
     :param last_price: Last price for buy & hold calculation
     :return: StrategyStatistics object with all calculated metrics
     """
-    stats = StrategyStatistics()
-
-    # Basic metrics from position
-    stats.net_profit = float(position.netprofit) if not isinstance(position.netprofit, NA) else 0.0
-    stats.gross_profit = float(position.grossprofit) if not isinstance(position.grossprofit, NA) else 0.0
-    stats.gross_loss = float(position.grossloss) if not isinstance(position.grossloss, NA) else 0.0
-    stats.max_equity_drawdown = float(position.max_drawdown) if not isinstance(position.max_drawdown, NA) else 0.0
-    stats.max_equity_runup = float(position.max_runup) if not isinstance(position.max_runup, NA) else 0.0
-
-    # Calculate percentages
-    if initial_capital > 0:
-        stats.net_profit_percent = (stats.net_profit / initial_capital) * 100
-        stats.gross_profit_percent = (stats.gross_profit / initial_capital) * 100
-        stats.gross_loss_percent = (stats.gross_loss / initial_capital) * 100
-        stats.max_equity_drawdown_percent = (stats.max_equity_drawdown / initial_capital) * 100
-        stats.max_equity_runup_percent = (stats.max_equity_runup / initial_capital) * 100
-
-    # Buy & Hold calculation
-    if first_price and last_price and first_price > 0:
-        buy_hold_shares = initial_capital / first_price
-        buy_hold_value = buy_hold_shares * last_price
-        stats.buy_and_hold_return = buy_hold_value - initial_capital
-        stats.buy_and_hold_return_percent = (stats.buy_and_hold_return / initial_capital) * 100
-
-    # Get all trades (closed + open)
-    all_trades: list[Trade] = list(position.closed_trades) + position.open_trades
-    closed_trades = list(position.closed_trades)
-
-    stats.total_trades = position.closed_trades_count
-    stats.winning_trades = position.wintrades
-    stats.losing_trades = position.losstrades
-    stats.total_open_trades = len(position.open_trades)
-
-    # Percent profitable
-    if stats.total_trades > 0:
-        stats.percent_profitable = (stats.winning_trades / stats.total_trades) * 100
-
-    # Profit factor
-    if stats.gross_loss != 0:
-        stats.profit_factor = abs(stats.gross_profit / stats.gross_loss)
-
-    # Calculate trade statistics
-    if closed_trades:
-        # Commission
-        stats.commission_paid = sum(trade.commission for trade in closed_trades)
-
-        # Average calculations
-        stats.avg_trade = stats.net_profit / len(closed_trades)
-        stats.avg_trade_percent = stats.net_profit_percent / len(closed_trades)
-
-        # Separate winning and losing trades
-        winning_trades = [t for t in closed_trades if float(t.profit) > 0]
-        losing_trades = [t for t in closed_trades if float(t.profit) < 0]
-
-        # Winning trades statistics
-        if winning_trades:
-            total_win_profit = sum(float(t.profit) for t in winning_trades)
-            stats.avg_winning_trade = total_win_profit / len(winning_trades)
-            stats.avg_winning_trade_percent = stats.avg_winning_trade / initial_capital * 100
-
-            # Largest winning trade
-            max_win = max(winning_trades, key=lambda t: float(t.profit))
-            stats.largest_winning_trade = float(max_win.profit)
-            stats.largest_winning_trade_percent = float(max_win.profit_percent)
-
-            # Average bars in winning trades
-            bars_in_wins = [t.exit_bar_index - t.entry_bar_index for t in winning_trades if t.exit_bar_index >= 0]
-            if bars_in_wins:
-                stats.avg_bars_in_winning_trades = sum(bars_in_wins) / len(bars_in_wins)
-
-        # Losing trades statistics
-        if losing_trades:
-            total_loss_profit = sum(float(t.profit) for t in losing_trades)
-            stats.avg_losing_trade = total_loss_profit / len(losing_trades)
-            stats.avg_losing_trade_percent = stats.avg_losing_trade / initial_capital * 100
-
-            # Largest losing trade
-            max_loss = min(losing_trades, key=lambda t: float(t.profit))
-            stats.largest_losing_trade = float(max_loss.profit)
-            stats.largest_losing_trade_percent = float(max_loss.profit_percent)
-
-            # Average bars in losing trades
-            bars_in_losses = [t.exit_bar_index - t.entry_bar_index for t in losing_trades if t.exit_bar_index >= 0]
-            if bars_in_losses:
-                stats.avg_bars_in_losing_trades = sum(bars_in_losses) / len(bars_in_losses)
-
-        # Ratio of average win to average loss
-        if stats.avg_losing_trade != 0:
-            stats.ratio_avg_win_loss = abs(stats.avg_winning_trade / stats.avg_losing_trade)
-
-        # Average bars in all trades
-        bars_in_trades = [t.exit_bar_index - t.entry_bar_index for t in closed_trades if t.exit_bar_index >= 0]
-        if bars_in_trades:
-            stats.avg_bars_in_trades = sum(bars_in_trades) / len(bars_in_trades)
-
-        # Long/Short breakdown
-        long_trades = [t for t in closed_trades if t.sign > 0]
-        short_trades = [t for t in closed_trades if t.sign < 0]
-
-        # Long statistics
-        if long_trades:
-            stats.long_trades = len(long_trades)
-            long_winning = [t for t in long_trades if float(t.profit) > 0]
-            long_losing = [t for t in long_trades if float(t.profit) < 0]
-
-            stats.long_winning_trades = len(long_winning)
-            stats.long_net_profit = sum(float(t.profit) for t in long_trades)
-            stats.long_net_profit_percent = (stats.long_net_profit / initial_capital) * 100
-
-            if long_winning:
-                stats.long_gross_profit = sum(float(t.profit) for t in long_winning)
-                stats.long_gross_profit_percent = (stats.long_gross_profit / initial_capital) * 100
-                max_long_win = max(long_winning, key=lambda t: float(t.profit))
-                stats.long_largest_winning_trade = float(max_long_win.profit)
-                stats.long_largest_winning_trade_percent = float(max_long_win.profit_percent)
-
-            if long_losing:
-                stats.long_gross_loss = sum(float(t.profit) for t in long_losing)
-                stats.long_gross_loss_percent = (stats.long_gross_loss / initial_capital) * 100
-                max_long_loss = min(long_losing, key=lambda t: float(t.profit))
-                stats.long_largest_losing_trade = float(max_long_loss.profit)
-                stats.long_largest_losing_trade_percent = float(max_long_loss.profit_percent)
-
-            stats.long_avg_trade = stats.long_net_profit / len(long_trades)
-            stats.long_avg_trade_percent = stats.long_net_profit_percent / len(long_trades)
-
-            long_bars = [t.exit_bar_index - t.entry_bar_index for t in long_trades if t.exit_bar_index >= 0]
-            if long_bars:
-                stats.long_avg_bars = sum(long_bars) / len(long_bars)
-
-        # Short statistics
-        if short_trades:
-            stats.short_trades = len(short_trades)
-            short_winning = [t for t in short_trades if float(t.profit) > 0]
-            short_losing = [t for t in short_trades if float(t.profit) < 0]
-
-            stats.short_winning_trades = len(short_winning)
-            stats.short_net_profit = sum(float(t.profit) for t in short_trades)
-            stats.short_net_profit_percent = (stats.short_net_profit / initial_capital) * 100
-
-            if short_winning:
-                stats.short_gross_profit = sum(float(t.profit) for t in short_winning)
-                stats.short_gross_profit_percent = (stats.short_gross_profit / initial_capital) * 100
-                max_short_win = max(short_winning, key=lambda t: float(t.profit))
-                stats.short_largest_winning_trade = float(max_short_win.profit)
-                stats.short_largest_winning_trade_percent = float(max_short_win.profit_percent)
-
-            if short_losing:
-                stats.short_gross_loss = sum(float(t.profit) for t in short_losing)
-                stats.short_gross_loss_percent = (stats.short_gross_loss / initial_capital) * 100
-                max_short_loss = min(short_losing, key=lambda t: float(t.profit))
-                stats.short_largest_losing_trade = float(max_short_loss.profit)
-                stats.short_largest_losing_trade_percent = float(max_short_loss.profit_percent)
-
-            stats.short_avg_trade = stats.short_net_profit / len(short_trades)
-            stats.short_avg_trade_percent = stats.short_net_profit_percent / len(short_trades)
-
-            short_bars = [t.exit_bar_index - t.entry_bar_index for t in short_trades if t.exit_bar_index >= 0]
-            if short_bars:
-                stats.short_avg_bars = sum(short_bars) / len(short_bars)
-
-        # Max consecutive wins/losses
-        if closed_trades:
-            current_wins = 0
-            current_losses = 0
-            max_wins = 0
-            max_losses = 0
-
-            for trade in closed_trades:
-                profit = float(trade.profit)
-                if profit > 0:
-                    current_wins += 1
-                    current_losses = 0
-                    max_wins = max(max_wins, current_wins)
-                elif profit < 0:
-                    current_losses += 1
-                    current_wins = 0
-                    max_losses = max(max_losses, current_losses)
-                else:
-                    current_wins = 0
-                    current_losses = 0
-
-            stats.max_cons_winning_trades = max_wins
-            stats.max_cons_losing_trades = max_losses
-
-    # Max contracts held
-    if all_trades:
-        max_size = 0.0
-        current_positions: list[Trade] = []
-
-        # Sort all trades by entry time
-        sorted_trades = sorted(all_trades, key=lambda t: t.entry_time)
-
-        for trade in sorted_trades:
-            # Add to current positions
-            current_positions.append(trade)
-
-            # Remove closed positions that exit before this entry
-            current_positions = [t for t in current_positions
-                                 if t.exit_time < 0 or t.exit_time > trade.entry_time]
-
-            # Calculate current size
-            current_size = sum(abs(t.size) for t in current_positions)
-            max_size = max(max_size, current_size)
-
-        stats.max_contracts_held = max_size
-
-    # Sharpe and Sortino ratios (if equity curve provided)
-    if equity_curve and len(equity_curve) > 1:
-        returns = []
-        for i in range(1, len(equity_curve)):
-            if equity_curve[i - 1] != 0:
-                ret = (equity_curve[i] - equity_curve[i - 1]) / equity_curve[i - 1]
-                returns.append(ret)
-
-        if returns:
-            avg_return = sum(returns) / len(returns)
-
-            # Sharpe ratio calculation
-            if len(returns) > 1:
-                variance = sum((r - avg_return) ** 2 for r in returns) / (len(returns) - 1)
-                std_dev = math.sqrt(variance)
-                if std_dev > 0:
-                    # Annualized Sharpe ratio (assuming daily returns and 252 trading days)
-                    stats.sharpe_ratio = (avg_return * 252) / (std_dev * math.sqrt(252))
-
-            # Sortino ratio calculation
-            downside_returns = [r for r in returns if r < 0]
-            if len(downside_returns) > 1:
-                downside_variance = sum(r ** 2 for r in downside_returns) / len(downside_returns)
-                downside_std = math.sqrt(downside_variance)
-                if downside_std > 0:
-                    # Annualized Sortino ratio
-                    stats.sortino_ratio = (avg_return * 252) / (downside_std * math.sqrt(252))
-
-    return stats
+    accumulator = StrategyStatsAccumulator()
+    accumulator.add_closed_trades(position.closed_trades)
+    for equity in equity_curve or ():
+        accumulator.add_equity(equity)
+    return accumulator.statistics(position, initial_capital, first_price, last_price)
 
 
 def write_strategy_statistics_csv(
@@ -0,0 +1,139 @@
+from typing import TYPE_CHECKING, Iterator, overload
+from array import array
+
+if TYPE_CHECKING:
+    from ..lib.strategy import Trade
+
+__all__ = ['ClosedTradeStore', 'MAX_CLOSED_TRADES', 'COLUMNS']
+
+# TradingView keeps only the last 9000 closed trades
+MAX_CLOSED_TRADES = 9000
+
+# Numeric fields stored in columns, with their array type codes
+COLUMNS: dict[str, str] = {
+    'size': 'd',
+    'entry_bar_index': 'q',
+    'entry_time': 'q',
+    'entry_price': 'd',
+    'exit_bar_index': 'q',
+    'exit_time': 'q',
+    'exit_price': 'd',
+    'commission': 'd',
+    'max_drawdown': 'd',
+    'max_drawdown_percent': 'd',
+    'max_runup': 'd',
+    'max_runup_percent': 'd',
+    'profit': 'd',
+    'profit_percent': 'd',
+}
+
+
+class ClosedTradeStore:
+    """
+    Store of the closed trades of a strategy.
+
+    The trades are in a plain list (`trades`), so they can be accessed by index in O(1), unlike in a `deque`,
+    where indexing is O(n) toward the middle. The numeric fields of the trades are also stored in typed columns,
+    so they can be read or summed without touching the trade objects. Only the last `maxlen` trades are kept,
+    like in TradingView, but the running aggregates (`count`, `profit_sum()`) count the removed trades as well.
+
+    Trades must be added when their fields are final, later changes are not seen by the columns.
+    """
+
+    __slots__ = ('maxlen', 'count', 'trades', '_start', '_columns', '_profit_totals', '_profit_total')
+
+    def __init__(self, maxlen: int = MAX_CLOSED_TRADES):
+        """
+        :param maxlen: The maximum number of trades kept
+        """
+        self.maxlen = maxlen
+        # Number of all trades ever added
+        self.count = 0
+        # The kept trades, the oldest first
+        self.trades: list[Trade] = []
+        # The columns may contain removed trades at their start, they are compacted in batches
+        self._start = 0
+        self._columns: dict[str, array] = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        # Running total of the profits before every trade
+        self._profit_totals = array('d')
+        self._profit_total = 0.0
+
+    def append(self, trade: 'Trade') -> None:
+        """
+        Add a closed trade, the oldest one is removed if the store is full
+
+        :param trade: The closed trade
+        """
+        trades = self.trades
+        trades.append(trade)
+        for name, column in self._columns.items():
+            column.append(getattr(trade, name))
+        self._profit_totals.append(self._profit_total)
+        self._profit_total += trade.profit
+        self.count += 1
+
+        if len(trades) > self.maxlen:
+            del trades[0]
+            self._start += 1
+            if self._start >= self.maxlen:
+                start = self._start
+                for column in self._columns.values():
+                    del column[:start]
+                del self._profit_totals[:start]
+                self._start = 0
+
+    def column(self, name: str, last: int | None = None) -> list[float] | list[int]:
+        """
+        Get the values of a numeric field of the kept trades, the oldest first
+
+        :param name: The name of the field, one of `COLUMNS`
+        :param last: Only the last this many trades
+        :return: The values
+        """
+        start = self._start
+        if last is not None:
+            start += max(len(self.trades) - last, 0)
+        return self._columns[name][start:].tolist()
+
+    def profit_sum(self, last: int | None = None) -> float:
+        """
+        Sum of the profits of the last trades in O(1)
+
+        :param last: Sum the profit of the last this many kept trades, None to sum all trades ever closed
+        :return: The sum of the profits
+        """
+        if last is None:
+            return self._profit_total
+        last = min(last, len(self.trades))
+        if last <= 0:
+            return 0.0
+        return self._profit_total - self._profit_totals[-last]
+
+    def clear(self) -> None:
+        """
+        Remove all trades
+        """
+        self.count = 0
+        self.trades.clear()
+        self._start = 0
+        for name, typecode in COLUMNS.items():
+            self._columns[name] = array(typecode)
+        self._profit_totals = array('d')
+        self._profit_total = 0.0
+
+    @overload
+    def __getitem__(self, index: int) -> 'Trade':
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list['Trade']:
+        ...
+
+    def __getitem__(self, index):
+        return self.trades[index]
+
+    def __len__(self) -> int:
+        return len(self.trades)
+
+    def __iter__(self) -> Iterator['Trade']:
+        return iter(self.trades)
@@ -25,7 +25,8 @@ from . import timeframe as timeframe_module
 from . import session as session_module
 
 from pynecore.core.overload import overload
-from pynecore.core.datetime import parse_datestring as _parse_datestring, parse_timezone as _parse_timezone
+from pynecore.core.datetime import (parse_datestring as _parse_datestring, parse_timezone as _parse_timezone,
+                                   TimeContext as _TimeContext)
 from ..core.resampler import Resampler
 
 __all__ = [
@@ -86,8 +87,8 @@ hlcc4: Series[float] | NA[float] = Source("hlcc4")
 _time: int = 0
 last_bar_time: int = 0
 
-# Datetime object in the exchange timezone
-_datetime: datetime = datetime.fromtimestamp(0, UTC)
+# Time of the current bar in the exchange timezone, `_datetime` is created from it when it is accessed
+_time_context: _TimeContext = _TimeContext(UTC)
 
 # Script settings from `script.indicator`, `script.strategy` or `script.library`
 _script: script | None = None
@@ -98,6 +99,13 @@ _plot_data: dict[str, Any] = {}
 # Lib semaphore - to prevent lib`s main function to do things it must not (plot, strategy things, etc.)
 _lib_semaphore = False
 
+
+def __getattr__(name: str) -> Any:
+    # Datetime object of the current bar in the exchange timezone, it is created only if it is needed
+    if name == '_datetime':
+        return _time_context.datetime
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 #
 # Callable modules
 #
@@ -128,11 +136,19 @@ def max_bars_back(var: Any, num: int) -> None:
 # noinspection PyShadowingNames
 def _get_dt(time: int | None = None, timezone: str | None = None) -> datetime:
     """ Get datetime object from time and timezone """
-    dt = _datetime if time is None else datetime.fromtimestamp(time / 1000, UTC)
+    dt = _time_context.datetime if time is None else datetime.fromtimestamp(time / 1000, UTC)
     assert dt is not None
     return dt.astimezone(_parse_timezone(timezone))
 
 
+# noinspection PyShadowingNames
+def _get_local_time(time: int | None = None, timezone: str | None = None) -> datetime | _TimeContext:
+    """ Get the local time fields of time and timezone, the time context is used for the current bar """
+    if timezone is None and (time is None or time == _time):
+        return _time_context
+    return _get_dt(time, timezone)
+
+
 @lru_cache(maxsize=1024)
 @overload
 def timestamp(date_string: DateStr) -> int:  # It is more pythonic, but not supported by Pine Script
@@ -328,7 +344,7 @@ def dayofmonth(time: int | None = None, timezone: str | None = None) -> int:
     :param timezone: The timezone of the time, if not specified the exchange timezone is used
     :return: The day of the month
     """
-    return _get_dt(time, timezone).day
+    return _get_local_time(time, timezone).day
 
 
 # noinspection PyShadowingNames
@@ -341,7 +357,7 @@ def dayofweek(time: int | None = None, timezone: str | None = None) -> int:
     :param timezone: The timezone of the time, if not specified the exchange timezone is used
     :return: The day of the week, 1 is Sunday, 2 is Monday, ..., 7 is Saturday
     """
-    res = _get_dt(time, timezone).weekday() + 2
+    res = _get_local_time(time, timezone).weekday() + 2
     if res == 8:
         res = 1
     return res
@@ -357,7 +373,7 @@ def hour(time: int | None = None, timezone: str | None = None) -> int:
     :param timezone: The timezone of the time, if not specified the exchange timezone is used
     :return: The hour of the day
     """
-    return _get_dt(time, timezone).hour
+    return _get_local_time(time, timezone).hour
 
 
 # noinspection PyShadowingNames
@@ -370,7 +386,7 @@ def minute(time: int | None = None, timezone: str | None = None) -> int:
     :param timezone: The timezone of the time, if not specified the exchange timezone is used
     :return: The minute of the hour
     """
-    return _get_dt(time, timezone).minute
+    return _get_local_time(time, timezone).minute
 
 
 # noinspection PyShadowingNames
@@ -383,7 +399,7 @@ def month(time: int | None = None, timezone: str | None = None) -> int:
     :param timezone: The timezone of the time, if not specified the exchange timezone is used
     :return: The month of the year
     """
-    return _get_dt(time, timezone).month
+    return _get_local_time(time, timezone).month
 
 
 # noinspection PyShadowingNames
@@ -396,7 +412,7 @@ def second(time: int | None = None, timezone: str | None = None) -> int:
     :param timezone: The timezone of the time, if not specified the exchange timezone is used
     :return: The second of the minute
     """
-    return _get_dt(time, timezone).second
+    return _get_local_time(time, timezone).second
 
 
 ### Session parsing and validation helpers ###
@@ -688,4 +704,4 @@ def year(time: int | None = None, timezone: str | None = None) -> int:
     :param timezone: The timezone of the time, if not specified the exchange timezone is used
     :return: The year
     """
-    return _get_dt(time, timezone).year
+    return _get_local_time(time, timezone).year
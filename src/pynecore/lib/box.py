@@ -2,6 +2,7 @@ from copy import copy as _copy
 
 from ..core.overload import overload
 from ..core.module_property import module_property
+from ..core.drawing_registry import DrawingRegistry
 
 from ..types.box import Box
 from ..types.na import NA
@@ -9,7 +10,7 @@ from ..types.chart import ChartPoint
 from ..lib import (color as _color, extend as _extend, xloc as _xloc, size as _size, line as _line,
                    text as _text, font as _font)
 
-_registry: list[Box] = []
+_registry: DrawingRegistry[Box] = DrawingRegistry('max_boxes_count')
 
 
 @overload
@@ -72,7 +73,7 @@ def new(top_left: ChartPoint, bottom_right: ChartPoint, border_color: _color.Col
         text_formatting=text_formatting,
         force_overlay=force_overlay,
     )
-    _registry.append(box)
+    _registry.add(box)
     return box
 
 
@@ -133,7 +134,7 @@ def new(left: int, top: float, right: int, bottom: float,
         text_formatting=text_formatting,
         force_overlay=force_overlay,
     )
-    _registry.append(box)
+    _registry.add(box)
     return box
 
 
@@ -141,7 +142,7 @@ def new(left: int, top: float, right: int, bottom: float,
 @module_property
 def all() -> list[Box]:
     """Returns all box objects"""
-    return _registry
+    return _registry.all()
 
 
 # noinspection PyShadowingBuiltins
@@ -155,7 +156,7 @@ def delete(id):
 def copy(id):
     if isinstance(id, NA):
         return NA(Box)
-    return _copy(id)
+    return _registry.add(_copy(id))
 
 
 # Setter methods
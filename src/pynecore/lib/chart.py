@@ -43,4 +43,4 @@ def left_visible_bar_time() -> int:
 # noinspection PyProtectedMember
 @module_property
 def right_visible_bar_time() -> int:
-    return int(lib._datetime.timestamp() * 1000)
+    return lib._time
@@ -2,12 +2,13 @@ from copy import copy as _copy
 
 from ..core.overload import overload
 from ..core.module_property import module_property
+from ..core.drawing_registry import DrawingRegistry
 from ..types.chart import ChartPoint
 from ..types.label import LabelStyleEnum, Label
 from ..types.na import NA
 from ..lib import xloc as _xloc, yloc as _yloc, color as _color, size as _size, text as _text, font as _font
 
-_registry: list[Label] = []
+_registry: DrawingRegistry[Label] = DrawingRegistry('max_labels_count')
 
 # Label style constants
 style_none = LabelStyleEnum()
@@ -80,7 +81,7 @@ def new(point: ChartPoint, text: str = "", xloc: _xloc.XLoc = _xloc.bar_index,
         force_overlay=force_overlay,
         text_formatting=text_formatting or _text.format_none
     )
-    _registry.append(label_obj)
+    _registry.add(label_obj)
     return label_obj
 
 
@@ -126,7 +127,7 @@ def new(x: int, y: int | float, text: str = "", xloc: _xloc.XLoc = _xloc.bar_ind
         force_overlay=force_overlay,
         text_formatting=text_formatting or _text.format_none
     )
-    _registry.append(label_obj)
+    _registry.add(label_obj)
     return label_obj
 
 
@@ -134,7 +135,7 @@ def new(x: int, y: int | float, text: str = "", xloc: _xloc.XLoc = _xloc.bar_ind
 @module_property
 def all() -> list[Label]:
     """Returns all label objects"""
-    return _registry
+    return _registry.all()
 
 
 # noinspection PyShadowingBuiltins
@@ -150,7 +151,7 @@ def copy(id):
     """Copy label object"""
     if isinstance(id, NA):
         return NA(Label)
-    return _copy(id)
+    return _registry.add(_copy(id))
 
 
 # noinspection PyShadowingBuiltins
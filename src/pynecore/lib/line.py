@@ -2,12 +2,13 @@ from copy import copy as _copy
 
 from ..core.overload import overload
 from ..core.module_property import module_property
+from ..core.drawing_registry import DrawingRegistry
 from ..types.chart import ChartPoint
 from ..types.line import LineEnum, Line
 from ..types.na import NA
 from ..lib import xloc as _xloc, extend as _extend, color as _color
 
-_registry: list[Line] = []
+_registry: DrawingRegistry[Line] = DrawingRegistry('max_lines_count')
 
 style_arrow_both = LineEnum()
 style_arrow_left = LineEnum()
@@ -57,7 +58,7 @@ def new(first_point: ChartPoint, second_point: ChartPoint, xloc: _xloc.XLoc = _x
         width=width,
         force_overlay=force_overlay
     )
-    _registry.append(line_obj)
+    _registry.add(line_obj)
     return line_obj
 
 
@@ -95,7 +96,7 @@ def new(x1: int, y1: float, x2: int, y2: float,
         width=width,
         force_overlay=force_overlay
     )
-    _registry.append(line_obj)
+    _registry.add(line_obj)
     return line_obj
 
 
@@ -103,7 +104,7 @@ def new(x1: int, y1: float, x2: int, y2: float,
 @module_property
 def all() -> list[Line]:
     """Returns all line objects"""
-    return _registry
+    return _registry.all()
 
 
 # noinspection PyShadowingBuiltins
@@ -119,7 +120,7 @@ def copy(id):
     """Copy line object"""
     if isinstance(id, NA):
         return NA(Line)
-    return _copy(id)
+    return _registry.add(_copy(id))
 
 
 # noinspection PyShadowingBuiltins
@@ -1,9 +1,10 @@
+from ..core.drawing_registry import DrawingRegistry
 from ..types.linefill import LineFill
 from ..types.line import Line
 from ..types.na import NA
 from ..lib import color as _color
 
-_registry: list[LineFill] = []
+_registry: DrawingRegistry[LineFill] = DrawingRegistry()
 
 
 # noinspection PyShadowingBuiltins
@@ -25,7 +26,7 @@ def new(line1: Line, line2: Line, color: _color.Color) -> LineFill | NA[LineFill
         line2=line2,
         color=color
     )
-    _registry.append(linefill_obj)
+    _registry.add(linefill_obj)
     return linefill_obj
 
 
@@ -38,8 +39,7 @@ def delete(id: LineFill) -> None:
     """
     if isinstance(id, NA):
         return
-    if id in _registry:
-        _registry.remove(id)
+    _registry.remove(id)
 
 
 # noinspection PyShadowingBuiltins
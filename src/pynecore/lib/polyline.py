@@ -1,13 +1,12 @@
-from copy import copy as _copy
-
 from ..core.module_property import module_property
+from ..core.drawing_registry import DrawingRegistry
 from ..types.chart import ChartPoint
 from ..types.polyline import Polyline
 from ..types.na import NA
 from ..lib import xloc as _xloc, color as _color
 from ..types.line import LineEnum
 
-_registry: list[Polyline] = []
+_registry: DrawingRegistry[Polyline] = DrawingRegistry('max_polylines_count')
 
 # Line style constants (same as in line.py)
 style_arrow_both = LineEnum()
@@ -56,7 +55,7 @@ def new(points: list[ChartPoint], curved: bool = False, closed: bool = False,
         line_width=line_width,
         force_overlay=force_overlay
     )
-    _registry.append(polyline_obj)
+    _registry.add(polyline_obj)
     return polyline_obj
 
 
@@ -69,8 +68,7 @@ def delete(id: Polyline) -> None:
     """
     if isinstance(id, NA):
         return
-    if id in _registry:
-        _registry.remove(id)
+    _registry.remove(id)
 
 
 # noinspection PyShadowingBuiltins
@@ -81,4 +79,4 @@ def all() -> list[Polyline]:
 
     :return: Array of all polyline objects
     """
-    return _copy(_registry)
+    return _registry.all()
@@ -1,11 +1,12 @@
 from typing import cast, TYPE_CHECKING
 
 from datetime import datetime, UTC
-from collections import deque, defaultdict
+from collections import defaultdict
 from copy import copy
-from bisect import insort, bisect_left
+from bisect import insort, bisect_left, bisect_right
 
 from ...core.module_property import module_property
+from ...core.trade_store import ClosedTradeStore
 from ... import lib
 from .. import syminfo
 
@@ -221,14 +222,63 @@ class PriceOrderBook:
     """
     Price-based sorted order storage.
     An order can appear multiple times at different prices.
+
+    The stop and limit prices are also indexed by the direction of the price movement which triggers them,
+    so the orders which would be filled at the open of a bar (because of a gap) can be found with range
+    queries, without checking every order on every bar.
     """
 
-    __slots__ = ('price_levels', 'orders_at_price', 'order_prices')
+    __slots__ = ('price_levels', 'orders_at_price', 'order_prices',
+                 'rising_levels', 'orders_rising', 'falling_levels', 'orders_falling', 'order_triggers')
 
     def __init__(self):
         self.price_levels = []  # Sorted list of prices
         self.orders_at_price = defaultdict(list)  # price -> [Order]
         self.order_prices = defaultdict(set)  # Order -> {prices}
+        # Long stops and short limits, triggered when the price rises to them
+        self.rising_levels = []  # Sorted list of prices
+        self.orders_rising = defaultdict(list)  # price -> [Order]
+        # Short stops and long limits, triggered when the price falls to them
+        self.falling_levels = []  # Sorted list of prices
+        self.orders_falling = defaultdict(list)  # price -> [Order]
+        self.order_triggers = {}  # Order -> [(rising, price)]
+
+    def update_triggers(self, order: Order):
+        """
+        Update the trigger prices of an order from its current stop, limit and size,
+        it must be called if these are changed while the order is in the order book
+        """
+        self._remove_triggers(order)
+        if not self.order_prices.get(order):
+            return
+
+        triggers = []
+        if order.stop is not None and order.size != 0.0:
+            triggers.append((order.size > 0, order.stop))
+        if order.limit is not None and order.size != 0.0:
+            triggers.append((order.size < 0, order.limit))
+
+        for rising, price in triggers:
+            levels, orders = ((self.rising_levels, self.orders_rising) if rising
+                              else (self.falling_levels, self.orders_falling))
+            if price not in orders:
+                insort(levels, price)
+            orders[price].append(order)
+        if triggers:
+            self.order_triggers[order] = triggers
+
+    def _remove_triggers(self, order: Order):
+        """Remove the trigger prices of an order"""
+        triggers = self.order_triggers.pop(order, None)
+        if not triggers:
+            return
+        for rising, price in triggers:
+            levels, orders = ((self.rising_levels, self.orders_rising) if rising
+                              else (self.falling_levels, self.orders_falling))
+            orders[price].remove(order)
+            if not orders[price]:
+                del levels[bisect_left(levels, price)]
+                del orders[price]
 
     def add_order(self, order: Order):
         """Add order to all its relevant price levels"""
@@ -256,11 +306,17 @@ class PriceOrderBook:
             self.orders_at_price[price].append(order)
             self.order_prices[order].add(price)
 
+        self.update_triggers(order)
+
     def remove_order(self, order: Order):
         """Remove order from all price levels"""
+        self._remove_triggers(order)
         for price in list(self.order_prices[order]):
-            self.orders_at_price[price].remove(order)
-            if not self.orders_at_price[price]:
+            orders = self.orders_at_price[price]
+            # The order is there more than once if more of its prices are the same
+            while order in orders:
+                orders.remove(order)
+            if not orders:
                 idx = bisect_left(self.price_levels, price)
                 if idx < len(self.price_levels) and self.price_levels[idx] == price:
                     del self.price_levels[idx]
@@ -273,7 +329,9 @@ class PriceOrderBook:
         if order.stop is not None and order.stop in self.order_prices[order]:
             old_stop = order.stop
             self.orders_at_price[old_stop].remove(order)
-            self.order_prices[order].remove(old_stop)
+            # The limit or the trail price can be at the same price
+            if order not in self.orders_at_price[old_stop]:
+                self.order_prices[order].remove(old_stop)
             if not self.orders_at_price[old_stop]:
                 idx = bisect_left(self.price_levels, old_stop)
                 if idx < len(self.price_levels) and self.price_levels[idx] == old_stop:
@@ -288,6 +346,7 @@ class PriceOrderBook:
             insort(self.price_levels, new_stop)
         self.orders_at_price[new_stop].append(order)
         self.order_prices[order].add(new_stop)
+        self.update_triggers(order)
 
     def iter_orders(self, *, desc=False, min_price: float | None = None, max_price: float | None = None):
         """
@@ -351,11 +410,46 @@ class PriceOrderBook:
                 # Create a copy to avoid iteration issues when orders are removed during iteration
                 yield from list(self.orders_at_price[p])
 
+    def iter_gap_orders(self, price: float):
+        """
+        Iterate over the orders which may be filled at once if the price jumps (gaps) to the given price:
+        long stops and short limits at or below it, short stops and long limits at or above it.
+
+        The orders are yielded the same way as `iter_orders()` would yield them, only the orders which can
+        not be triggered are left out.
+
+        :param price: The price, usually the open of the bar
+        :return: Generator yielding Order objects
+        """
+        candidates = {}
+        for p in self.rising_levels[:bisect_right(self.rising_levels, price)]:
+            candidates.update(dict.fromkeys(self.orders_rising[p]))
+        for p in self.falling_levels[bisect_left(self.falling_levels, price):]:
+            candidates.update(dict.fromkeys(self.orders_falling[p]))
+        if not candidates:
+            return
+
+        # Find all places of the orders in the order book to keep the order of `iter_orders()`
+        places = []
+        for order in candidates:
+            for p in self.order_prices[order]:
+                for index, other in enumerate(self.orders_at_price[p]):
+                    if other is order:
+                        places.append((p, index, order))
+        places.sort(key=lambda place: (place[0], place[1]))
+        for _, _, order in places:
+            yield order
+
     def clear(self):
         """Clear all orders"""
         self.price_levels.clear()
         self.orders_at_price.clear()
         self.order_prices.clear()
+        self.rising_levels.clear()
+        self.orders_rising.clear()
+        self.falling_levels.clear()
+        self.orders_falling.clear()
+        self.order_triggers.clear()
 
 
 # noinspection PyProtectedMember,PyShadowingNames
@@ -406,7 +500,7 @@ class Position:
 
         # Trades
         self.open_trades: list[Trade] = []
-        self.closed_trades: deque[Trade] = deque(maxlen=9000)  # 9000 is the limit of TV
+        self.closed_trades = ClosedTradeStore()  # Only the last 9000 trades are kept, like in TV
         self.new_closed_trades: list[Trade] = []
 
         # Trade statistics
@@ -612,7 +706,6 @@ class Position:
 
                     # Add to closed trade
                     new_closed_trades.append(closed_trade)
-                    self.closed_trades.append(closed_trade)
                     self.closed_trades_count += 1
 
                     if order.comment:
@@ -721,6 +814,9 @@ class Position:
                         commission = (commission_value * abs(trade.size)) / closed_trade_size
                         trade.commission += commission
 
+            # Add closed trades to the store, now their fields are final
+            for closed_trade in new_closed_trades:
+                self.closed_trades.append(closed_trade)
             self.new_closed_trades.extend(new_closed_trades)
 
         # New trade
@@ -1081,25 +1177,28 @@ class Position:
         self.drawdown_summ = self.runup_summ = 0.0
         self.new_closed_trades.clear()
 
-        exit_orders = list(self.exit_orders.values())
-
         # Skip exit order processing if there's no open position (TradingView behavior)
         if not self.open_trades:
             # Remove all exit orders when position is flat
-            for order in exit_orders:
+            for order in list(self.exit_orders.values()):
                 self._remove_order(order)
-            exit_orders = []
 
         # For exit orders, calculate limit/stop from entry price if ticks are specified
-        for order in exit_orders:
-            # Try to find the trade with matching entry_id
-            entry_price = None
-            for trade in self.open_trades:
-                if trade.entry_id == order.order_id:
-                    entry_price = trade.entry_price
-                    break
+        entry_prices: dict[str, float] | None = None
+        for order in self.exit_orders.values():
+            if not ((order.profit_ticks is not None and order.limit is None)
+                    or (order.loss_ticks is not None and order.stop is None)
+                    or (order.trail_points_ticks is not None and order.trail_price is None)):
+                continue
+
+            # Entry prices of open trades by entry id, the first matching trade is used
+            if entry_prices is None:
+                entry_prices = {}
+                for trade in self.open_trades:
+                    entry_prices.setdefault(trade.entry_id, trade.entry_price)
 
             # If we found the entry price and have tick values, calculate the actual prices
+            entry_price = entry_prices.get(order.order_id)
             if entry_price is not None:
                 # Determine direction from the order
                 direction = 1.0 if order.size < 0 else -1.0  # Exit order size is negative of position
@@ -1119,9 +1218,12 @@ class Position:
                     order.trail_price = entry_price + direction * syminfo.mintick * order.trail_points_ticks
                     order.trail_price = _price_round(order.trail_price, direction)
 
+                # The gap check uses the new prices
+                self.orderbook.update_triggers(order)
+
         # Check for stop/limit orders that should be converted to market orders due to gaps
         # This must happen BEFORE processing market orders
-        for order in self.orderbook.iter_orders():
+        for order in self.orderbook.iter_gap_orders(self.o):
             # Check if the order would be filled immediately (e.g. due to a gap)
             if self._check_already_filled(order):
                 # Convert to market order
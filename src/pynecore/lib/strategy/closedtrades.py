@@ -28,7 +28,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].commission
+            return lib._script.position.closed_trades.trades[trade_num].commission
         except (IndexError, AssertionError):
             return 0.0
 
@@ -46,7 +46,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].entry_bar_index
+            return lib._script.position.closed_trades.trades[trade_num].entry_bar_index
         except (IndexError, AssertionError):
             return NA(int)
 
@@ -64,7 +64,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].entry_comment
+            return lib._script.position.closed_trades.trades[trade_num].entry_comment
         except (IndexError, AssertionError):
             return NA(str)
 
@@ -82,7 +82,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].entry_id
+            return lib._script.position.closed_trades.trades[trade_num].entry_id
         except (IndexError, AssertionError):
             return NA(str)
 
@@ -100,7 +100,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].entry_price
+            return lib._script.position.closed_trades.trades[trade_num].entry_price
         except (IndexError, AssertionError):
             return NA(float)
 
@@ -118,7 +118,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].entry_time
+            return lib._script.position.closed_trades.trades[trade_num].entry_time
         except (IndexError, AssertionError):
             return NA(int)
 
@@ -136,7 +136,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].exit_bar_index
+            return lib._script.position.closed_trades.trades[trade_num].exit_bar_index
         except (IndexError, AssertionError):
             return NA(int)
 
@@ -154,7 +154,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].exit_comment
+            return lib._script.position.closed_trades.trades[trade_num].exit_comment
         except (IndexError, AssertionError):
             return NA(str)
 
@@ -172,7 +172,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].exit_id
+            return lib._script.position.closed_trades.trades[trade_num].exit_id
         except (IndexError, AssertionError):
             return NA(str)
 
@@ -190,7 +190,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].exit_price
+            return lib._script.position.closed_trades.trades[trade_num].exit_price
         except (IndexError, AssertionError):
             return NA(float)
 
@@ -207,7 +207,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].exit_time
+            return lib._script.position.closed_trades.trades[trade_num].exit_time
         except (IndexError, AssertionError):
             return NA(int)
 
@@ -225,7 +225,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].max_drawdown
+            return lib._script.position.closed_trades.trades[trade_num].max_drawdown
         except (IndexError, AssertionError):
             return 0.0
 
@@ -243,7 +243,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].max_drawdown_percent
+            return lib._script.position.closed_trades.trades[trade_num].max_drawdown_percent
         except (IndexError, AssertionError):
             return 0.0
 
@@ -261,7 +261,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].max_runup
+            return lib._script.position.closed_trades.trades[trade_num].max_runup
         except (IndexError, AssertionError):
             return 0.0
 
@@ -279,7 +279,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].max_runup_percent
+            return lib._script.position.closed_trades.trades[trade_num].max_runup_percent
         except (IndexError, AssertionError):
             return 0.0
 
@@ -297,7 +297,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].profit
+            return lib._script.position.closed_trades.trades[trade_num].profit
         except (IndexError, AssertionError):
             return 0.0
 
@@ -315,7 +315,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].profit_percent
+            return lib._script.position.closed_trades.trades[trade_num].profit_percent
         except (IndexError, AssertionError):
             return 0.0
 
@@ -327,7 +327,7 @@ class ClosedTradesModule(CallableModule):
         try:
             assert lib._script is not None
             assert lib._script.position is not None
-            return lib._script.position.closed_trades[trade_num].size
+            return lib._script.position.closed_trades.trades[trade_num].size
         except (IndexError, AssertionError):
             return 0.0
 
@@ -347,7 +347,7 @@ def closedtrades() -> int:
     if lib._script is None or lib._script.position is None:
         return 0
     position = lib._script.position
-    return len(position.closed_trades)
+    return len(position.closed_trades.trades)
 
 
 #
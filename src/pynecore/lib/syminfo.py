@@ -4,6 +4,7 @@ from ..types.session import Session
 from .session import regular
 
 from ..core.syminfo import SymInfoSession, SymInfoInterval
+from ..core.session_calendar import SessionCalendar
 
 __all__ = [
     "prefix", "description", "ticker", "root", "tickerid", "currency", "basecurrency", "period", "type", "volumetype",
@@ -15,6 +16,7 @@ __all__ = [
 _opening_hours: list[SymInfoInterval] = []
 _session_starts: list[SymInfoSession] = []
 _session_ends: list[SymInfoSession] = []
+_session_calendar: SessionCalendar = SessionCalendar([], [], [])
 
 prefix: str | NA[str] = NA(str)
 description: str | NA[str] = NA(str)
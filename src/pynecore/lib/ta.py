@@ -5,7 +5,6 @@ from typing import TypeVar, cast
 
 import builtins
 import math
-import heapq
 
 from collections import deque
 
@@ -14,6 +13,7 @@ from ..core.module_property import module_property
 from pynecore.core.overload import overload
 
 from ..core import safe_convert
+from ..core.sorted_window import SortedWindow
 
 # We need to use this kind of import to make transformer work
 from pynecore.lib import open, high, low, close, volume, hl2, bar_index, array, session, math as lib_math
@@ -563,7 +563,7 @@ def falling(source: float, length: int) -> bool:
 
 # noinspection PyUnusedLocal
 @overload
-def highest(source: Series[float], length: int, _bars: bool = False, _tuple: bool = False, _check_eq: bool = False) \
+def highest(source: float, length: int, _bars: bool = False, _tuple: bool = False, _check_eq: bool = False) \
         -> float | tuple[float | NA[float], float | NA[float]] | NA[float]:
     """
     Calculate the highest value of the source series with the given length.
@@ -576,28 +576,37 @@ def highest(source: Series[float], length: int, _bars: bool = False, _tuple: boo
     :param _check_eq: If true, check for equality too, internal use only
     :return: The highest value of the source series
     """
-    last_max: Persistent[float | NA] = NA(float)
-    last_max_index: Persistent[int] = 0
-
-    if last_max < source or isinstance(last_max, NA) or (_check_eq and last_max == source):
-        last_max = source
-        last_max_index = 0
-
-    if last_max_index >= length:
-        last_max = source
-        last_max_index = 0
-        for i in builtins.range(1, length):
-            s = source[i]
-            if s > last_max:
-                last_max = s
-                last_max_index = i
-            elif not _check_eq and s == last_max:
-                # For normal highest: update index for equal values
-                last_max_index = i
-            # For pivot detection (_check_eq=True): don't update index for equal values
-
-    max_index = last_max_index
-    last_max_index += 1
+    # Monotonic window: values are decreasing from the oldest to the newest, so the highest is the first
+    values: Persistent[deque[float]] = deque()
+    positions: Persistent[deque[int]] = deque()
+    count: Persistent[int] = 0
+
+    count += 1
+    if not isinstance(source, NA):
+        # Remove the values which can never be the highest anymore. On equal values normally the oldest one
+        # is kept, for pivot detection (_check_eq=True) the newest one
+        if _check_eq:
+            while values and values[-1] <= source:
+                values.pop()
+                positions.pop()
+        else:
+            while values and values[-1] < source:
+                values.pop()
+                positions.pop()
+        values.append(source)
+        positions.append(count)
+
+    # Remove the values which are out of the window
+    while positions and positions[0] <= count - length:
+        values.popleft()
+        positions.popleft()
+
+    if values:
+        last_max = values[0]
+        max_index = count - positions[0]
+    else:
+        last_max = NA(float)
+        max_index = 0
 
     if bar_index < length - 1:
         return NA(float) if not _tuple else (NA(float), NA(float))
@@ -616,7 +625,7 @@ def highest(length: int) -> float | NA[float]:
 
 # noinspection PyUnusedLocal
 @overload
-def highestbars(source: Series[float], length: int) -> float | NA[float]:
+def highestbars(source: float, length: int) -> float | NA[float]:
     """
     Calculate the number of bars since the highest value of the source series with the given length.
 
@@ -760,7 +769,7 @@ def linreg(source: Series[float], length: int, offset: int) -> float | Series[fl
 
 # noinspection PyUnusedLocal
 @overload
-def lowest(source: Series[float], length: int,
+def lowest(source: float, length: int,
            _bars: bool = False, _tuple: bool = False, _check_eq: bool = False) \
         -> float | tuple[float | NA[float], float | NA[float]] | NA[float]:
     """
@@ -774,28 +783,37 @@ def lowest(source: Series[float], length: int,
     :param _check_eq: If true, check for equality too, internal use only
     :return: The lowest value of the source series
     """
-    last_min: Persistent[float | NA[float]] = NA(float)
-    last_min_index: Persistent[int] = 0
-
-    if last_min > source or isinstance(last_min, NA) or (_check_eq and last_min == source):
-        last_min = source
-        last_min_index = 0
-
-    if last_min_index >= length:
-        last_min = source
-        last_min_index = 0
-        for i in builtins.range(1, length):
-            s = source[i]
-            if s < last_min:
-                last_min = s
-                last_min_index = i
-            elif not _check_eq and s == last_min:
-                # For normal lowest: update index for equal values
-                last_min_index = i
-            # For pivot detection (_check_eq=True): don't update index for equal values
-
-    min_index = last_min_index
-    last_min_index += 1
+    # Monotonic window: values are increasing from the oldest to the newest, so the lowest is the first
+    values: Persistent[deque[float]] = deque()
+    positions: Persistent[deque[int]] = deque()
+    count: Persistent[int] = 0
+
+    count += 1
+    if not isinstance(source, NA):
+        # Remove the values which can never be the lowest anymore. On equal values normally the oldest one
+        # is kept, for pivot detection (_check_eq=True) the newest one
+        if _check_eq:
+            while values and values[-1] >= source:
+                values.pop()
+                positions.pop()
+        else:
+            while values and values[-1] > source:
+                values.pop()
+                positions.pop()
+        values.append(source)
+        positions.append(count)
+
+    # Remove the values which are out of the window
+    while positions and positions[0] <= count - length:
+        values.popleft()
+        positions.popleft()
+
+    if values:
+        last_min = values[0]
+        min_index = count - positions[0]
+    else:
+        last_min = NA(float)
+        min_index = 0
 
     if bar_index < length - 1:
         return NA(float) if not _tuple else (NA(float), NA(int))
@@ -814,7 +832,7 @@ def lowest(length: int) -> float | NA:
 
 # noinspection PyUnusedLocal
 @overload
-def lowestbars(source: Series[float], length: int) -> float | NA[float]:
+def lowestbars(source: float, length: int) -> float | NA[float]:
     """
     Calculate the number of bars since the lowest value of the source series with the given length.
 
@@ -889,46 +907,15 @@ def median(source: Series[TFI], length: int) -> TFI | NA[TFI] | Series[TFI]:
     if isinstance(source, NA):
         return NA(cast(type[TFI], type(source)))  # type: ignore
 
-    # Store heaps and window
-    heap_low: Persistent[list[TFI]] = []  # Max heap (negative values)
-    heap_high: Persistent[list[TFI]] = []  # Min heap
-    window: Persistent[list[TFI]] = []  # Recent values for removal
-
-    # Add new value and balance heaps
-    value = source
-    window.append(cast(TFI, value))
-    heapq.heappush(heap_low, -cast(TFI, value))
-    heapq.heappush(heap_high, -heapq.heappop(heap_low))
-
-    if len(heap_low) < len(heap_high):
-        heapq.heappush(heap_low, -heapq.heappop(heap_high))
-
-    # Remove old value if window full
-    if len(window) > length:
-        old = window.pop(0)
-
-        # Remove from correct heap
-        if old <= -heap_low[0]:
-            heap_low.remove(-old)
-            heapq.heapify(heap_low)
-        else:
-            heap_high.remove(old)
-            heapq.heapify(heap_high)
-
-        # Rebalance if needed
-        if len(heap_low) < len(heap_high):
-            heapq.heappush(heap_low, -heapq.heappop(heap_high))
-        elif len(heap_low) > len(heap_high) + 1:
-            heapq.heappush(heap_high, -heapq.heappop(heap_low))
+    window: Persistent[SortedWindow] = SortedWindow(length)
+    window.push(source)
 
     # Return na during warmup
-    if len(window) < length:
+    if not window.is_full:
         return NA(cast(type[TFI], type(source)))  # type: ignore
 
-    # Return median based on heap sizes
-    if len(heap_low) > len(heap_high):
-        return -heap_low[0]  # Max heap root
-    return -heap_low[0] if isinstance(source, int) else (-heap_low[0] + heap_high[0]) / 2  # type: ignore
+    # For integers the lower middle value is used
+    return window.median(lower=isinstance(source, int))
 
 
 def mfi(source: float, length: int) -> float | NA[float]:
@@ -1061,7 +1048,7 @@ def obv() -> float | NA[float]:
     return cum(volume * chg)
 
 
-def percentile_linear_interpolation(source: Series[float], length: int, percentage: int | float) \
+def percentile_linear_interpolation(source: float, length: int, percentage: int | float) \
         -> float | NA[float] | Series[float]:
     """
     Calculates percentile using method of linear interpolation between the two nearest ranks.
@@ -1072,17 +1059,18 @@ def percentile_linear_interpolation(source: Series[float], length: int, percenta
     :return: The percentile of the source series
     """
     assert length > 0, "Invalid length, length must be greater than 0!"
-    if isinstance(source, NA):
-        return NA(float)
     length = int(length)
 
-    if bar_index < length - 1:
+    window: Persistent[SortedWindow] = SortedWindow(length)
+    window.push(source)
+
+    if isinstance(source, NA) or bar_index < length - 1:
         return NA(float)
 
-    return array.percentile_linear_interpolation(source[:length], percentage)  # type: ignore
+    return window.percentile_linear_interpolation(percentage)
 
 
-def percentile_nearest_rank(source: Series[float], length: int, percentage: int | float) \
+def percentile_nearest_rank(source: float, length: int, percentage: int | float) \
         -> float | NA[float] | Series[float]:
     """
     Calculates percentile using the nearest rank method.
@@ -1093,17 +1081,18 @@ def percentile_nearest_rank(source: Series[float], length: int, percentage: int
     :return: The percentile of the source series
     """
     assert length > 0, "Invalid length, length must be greater than 0!"
-    if isinstance(source, NA):
-        return NA(float)
     length = int(length)
 
-    if bar_index < length - 1:
+    window: Persistent[SortedWindow] = SortedWindow(length)
+    window.push(source)
+
+    if isinstance(source, NA) or bar_index < length - 1:
         return NA(float)
 
-    return array.percentile_nearest_rank(source[:length], percentage)  # type: ignore
+    return window.percentile_nearest_rank(percentage)
 
 
-def percentrank(source: Series[float], length: int) -> float | NA[float] | Series[float]:
+def percentrank(source: float, length: int) -> float | NA[float] | Series[float]:
     """
     Percent rank is the percents of how many previous values was less than or equal to the current
     value of given series.
@@ -1113,11 +1102,16 @@ def percentrank(source: Series[float], length: int) -> float | NA[float] | Serie
     :return: The percentage of values less than or equal to the current value
     """
     assert length > 0, "Invalid length, length must be greater than 0!"
+    length = int(length)
+
+    # The current value and the previous `length` values
+    window: Persistent[SortedWindow] = SortedWindow(length + 1)
+    window.push(source)
+
     if isinstance(source, NA) or bar_index < length:
         return NA(float)
-    length = int(length)
 
-    return array.percentrank(source[:length + 1], 0)  # type: ignore
+    return window.percentrank(source)
 
 
 @overload
@@ -1244,7 +1238,7 @@ def pvt() -> float | NA[float]:
 
 
 # noinspection PyShadowingBuiltins
-def range(source: Series[float], length: int) -> float | NA[float]:
+def range(source: float, length: int) -> float | NA[float]:
     """
     Returns the difference between the max and min values in a series.
 
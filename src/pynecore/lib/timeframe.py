@@ -6,6 +6,7 @@ from ..core.module_property import module_property
 from .. import lib
 from . import syminfo as _syminfo
 from pynecore.core.datetime import parse_timezone as _parse_timezone
+from ..core.session_calendar import local_seconds
 
 __all__ = [
     'change',
@@ -83,25 +84,15 @@ def _get_first_session_start_in_day(dt: datetime) -> datetime | None:
     :return: First session start time in UTC
     """
     local_dt = dt.astimezone(_parse_timezone(_syminfo.timezone))
-    weekday = local_dt.weekday()
-
-    # Get all session starts for current weekday
-    day_starts = [
-        time for day, time in _syminfo._session_starts
-        if day == weekday
-    ]
-
-    if not day_starts:
+    first_start = _syminfo._session_calendar.first_session_start(local_dt.weekday())
+    if first_start is None:
         return None
 
-    # Get the earliest session start for the day
-    first_start = min(day_starts)
-
     # Create datetime with the session start time
     ssdt = local_dt.replace(
-        hour=first_start.hour,
-        minute=first_start.minute,
-        second=first_start.second,
+        hour=first_start // 3600,
+        minute=first_start // 60 % 60,
+        second=first_start % 60,
         microsecond=0
     )
 
@@ -140,48 +131,9 @@ def _is_new_session(current_dt: datetime, prev_dt: datetime | None = None, tf_se
     """
     if tf_sec is None:
         tf_sec = in_seconds(_syminfo.period)
-    if prev_dt is None:
-        prev_dt = current_dt - timedelta(seconds=tf_sec)
-
-    current_weekday = current_dt.weekday()
-    prev_weekday = prev_dt.weekday()
-
-    # Get all possible session starts:
-    # 1. Current day sessions
-    # 2. If previous day different, then previous day's overnight sessions
-    session_starts = [
-        ss for day, ss in _syminfo._session_starts
-        if day == current_weekday
-    ]
-
-    if prev_weekday != current_weekday:
-        prev_day_starts = [
-            (ss, se) for day, ss, se in _syminfo._opening_hours
-            if day == prev_weekday and se < ss  # Only overnight sessions
-        ]
-        # Add overnight session starts to check
-        for ss, se in prev_day_starts:
-            session_starts.append(ss)
-
-    # For each session start
-    for start_time in session_starts:
-        session_start = current_dt.replace(
-            hour=start_time.hour,
-            minute=start_time.minute,
-            second=start_time.second,
-            microsecond=0
-        )
-
-        # If it crosses the day boundary, we set it to the previous day
-        if prev_weekday != current_weekday and start_time > current_dt.time():
-            session_start = session_start - timedelta(days=1)
-
-        # If session starts in this bar
-        if (current_dt <= session_start < current_dt + timedelta(seconds=tf_sec) and
-                session_start > prev_dt):
-            return True
-
-    return False
+    t = local_seconds(current_dt)
+    prev_t = t - tf_sec if prev_dt is None else local_seconds(prev_dt)
+    return _syminfo._session_calendar.is_new_session(t, prev_t, tf_sec)
 
 
 __persistent_next_new_year_session: datetime | None = None
@@ -243,16 +195,13 @@ def change(timeframe: str) -> bool:
 
         # Daily timeframe's anchor is the first session of the year
         if _modifier == 'D':
-            _dt = nydt
-
-            while _dt < dt:
-                if _is_new_session(_dt, _dt - timedelta(seconds=xchg_tf_sec), xchg_tf_sec):
-                    __persistent_cycle -= 1
-                    if __persistent_cycle <= 0:
-                        __persistent_last_signal = _dt
-                        __persistent_cycle = _multiplier
-
-                _dt += timedelta(seconds=xchg_tf_sec)
+            # Replay the new sessions of the chart candles from the anchor
+            start_t = local_seconds(nydt)
+            for t in _syminfo._session_calendar.new_sessions(start_t, local_seconds(dt), xchg_tf_sec):
+                __persistent_cycle -= 1
+                if __persistent_cycle <= 0:
+                    __persistent_last_signal = nydt + timedelta(seconds=t - start_t)
+                    __persistent_cycle = _multiplier
 
         # Weekly timeframe's anchor is the first Monday of the year
         elif _modifier == 'W':
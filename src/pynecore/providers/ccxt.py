@@ -9,17 +9,22 @@ else:
     def override(func):
         return func
 import re
-from datetime import datetime, UTC, timedelta
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, UTC
 from pathlib import Path
 from datetime import time
+from threading import Lock
+from time import monotonic, sleep
 import tomllib
 
 from .provider import Provider
 
 from pynecore.core.syminfo import SymInfo, SymInfoInterval, SymInfoSession
+from ..lib.timeframe import in_seconds
 from ..types.ohlcv import OHLCV
 
-__all__ = ['CCXTProvider']
+__all__ = ['CCXTProvider', 'RateLimiter', 'get_rate_limiter']
 
 known_limits = {
     'binance': 1000,
@@ -38,6 +43,54 @@ def add_space_before_uppercase(s):
     return re.sub(r'(?<!^)([A-Z])', r' \1', s)
 
 
+class RateLimiter:
+    """
+    Spaces the requests of concurrent threads, so they start at least `interval` seconds after each other
+    """
+
+    __slots__ = ('interval', '_next', '_lock')
+
+    def __init__(self, interval: float):
+        """
+        :param interval: Minimum time between requests in seconds
+        """
+        self.interval = interval
+        self._next = 0.0
+        self._lock = Lock()
+
+    def wait(self):
+        """
+        Wait until the next request can be sent
+        """
+        with self._lock:
+            now = monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            sleep(slot - now)
+
+
+# Rate limiters by exchange, shared by the providers of the same exchange, e.g. when refreshing many symbols
+_rate_limiters: dict[str, RateLimiter] = {}
+_rate_limiters_lock = Lock()
+
+
+def get_rate_limiter(exchange_id: str, interval: float) -> RateLimiter:
+    """
+    Get the shared rate limiter of an exchange
+
+    :param exchange_id: The ID of the exchange
+    :param interval: Minimum time between requests in seconds
+    :return: The rate limiter
+    """
+    with _rate_limiters_lock:
+        try:
+            return _rate_limiters[exchange_id]
+        except KeyError:
+            rate_limiter = _rate_limiters[exchange_id] = RateLimiter(interval)
+            return rate_limiter
+
+
 class CCXTProvider(Provider):
     """
     CCXT provider
@@ -289,61 +342,89 @@ class CCXTProvider(Provider):
 
     @override
     def download_ohlcv(self, time_from: datetime, time_to: datetime,
-                       on_progress: Callable[[datetime], None] | None = None):
+                       on_progress: Callable[[datetime], None] | None = None, workers: int = 4):
         """
         Download OHLV data
 
+        The time range is split into windows of `limit` bars, which are fetched concurrently, within the rate
+        limit of the exchange. The windows are saved in order, and a checkpoint is saved after every window,
+        so an interrupted download can be continued where it stopped.
+
         :param time_from: The start time
         :param time_to:  The end time
         :param on_progress: Optional callback to call on progress
+        :param workers: Number of concurrent requests
         """
         # Shortcuts for the time_from and time_to
-        tf: datetime = time_from.replace(tzinfo=None)
-        tt: datetime = (time_to if time_to is not None else datetime.now(UTC)).replace(tzinfo=None)
+        tf: datetime = time_from.replace(tzinfo=UTC)
+        tt: datetime = (time_to.replace(tzinfo=UTC) if time_to is not None else datetime.now(UTC))
 
         # Get the limit by exchange or use safe default
         assert self._client.id
         limit = known_limits.get(self._client.id, 100)
 
-        try:
-            # Loop through the time range
-            while tf < tt:
-                if on_progress:
-                    on_progress(tf)
-
-                # Fetch a part of data
+        # Windows of `limit` bars, the end time is inclusive
+        assert self.timeframe is not None
+        interval_ms = in_seconds(self.timeframe) * 1000
+        start_ms = int(tf.timestamp()) * 1000
+        end_ms = int(tt.timestamp()) * 1000 + 1
+        window_ms = limit * interval_ms
+        windows = deque((start, min(start + window_ms, end_ms)) for start in range(start_ms, end_ms, window_ms))
+
+        # The rate limit of CCXT (in milliseconds) is not thread safe, so the requests are spaced here
+        rate_limiter = get_rate_limiter(self._client.id, getattr(self._client, 'rateLimit', 0) / 1000)
+
+        def fetch_window(window_start: int, window_end: int) -> list[OHLCV]:
+            """ Fetch the bars of a window, more pages are fetched if the exchange returns less bars """
+            candles = []
+            since = window_start
+            while since < window_end:
+                rate_limiter.wait()
                 res: list = self._client.fetch_ohlcv(
                     symbol=self.symbol,
                     limit=limit,
                     timeframe=self.xchg_timeframe,
-                    since=self._client.parse8601(tf.isoformat())
+                    since=since
                 )
-
-                # If no data, skip to the next day, maybe the symbol was not yet traded that day
+                res = [r for r in res if since <= r[0] < window_end]
+                # If no data, maybe the symbol was not yet traded in this window
                 if not res:
-                    tf += timedelta(days=1)
-
-                # Process the data
-                for r in res:
-                    t = int(r[0] / 1000)
-                    dt = datetime.fromtimestamp(t, UTC).replace(tzinfo=None)
-                    if dt > tt:
-                        raise StopIteration
-
-                    ohlcv = OHLCV(
-                        timestamp=t,
-                        open=float(r[1]),
-                        high=float(r[2]),
-                        low=float(r[3]),
-                        close=float(r[4]),
-                        volume=float(r[5]),
-                    )
-
-                    self.save_ohlcv_data(ohlcv)
-                    tf = dt + timedelta(minutes=1)  # Move to next time step + 1 minute
-
-        except StopIteration:
-            pass
+                    break
+                candles.extend(OHLCV(
+                    timestamp=int(r[0] / 1000),
+                    open=float(r[1]),
+                    high=float(r[2]),
+                    low=float(r[3]),
+                    close=float(r[4]),
+                    volume=float(r[5]),
+                ) for r in res)
+                since = res[-1][0] + 1
+            return candles
+
+        if on_progress:
+            on_progress(tf.replace(tzinfo=None))
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(windows)))) as executor:
+            futures = deque()
+            try:
+                while windows or futures:
+                    # Only a limited number of windows are fetched ahead
+                    while windows and len(futures) < 2 * workers:
+                        window = windows.popleft()
+                        futures.append((window, executor.submit(fetch_window, *window)))
+
+                    # Save the windows in order
+                    (_, window_end), future = futures.popleft()
+                    candles = future.result()
+                    if candles:
+                        self.save_ohlcv_data(candles)
+                    self.save_checkpoint((window_end + 999) // 1000)
+
+                    if on_progress:
+                        on_progress(datetime.fromtimestamp(window_end / 1000, UTC).replace(tzinfo=None))
+            finally:
+                for _, future in futures:
+                    future.cancel()
 
         if on_progress:
-            on_progress(tt)
+            on_progress(tt.replace(tzinfo=None))
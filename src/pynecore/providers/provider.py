@@ -1,7 +1,9 @@
-from typing import Callable
+from typing import Callable, Iterable, Iterator, NamedTuple
 from abc import abstractmethod, ABCMeta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, UTC
+import os
 import tomllib
 
 from ..types.ohlcv import OHLCV
@@ -37,6 +39,9 @@ class Provider(metaclass=ABCMeta):
     config: dict[str, str] = {}
     """ Config dict for the exchange loaded from providers.toml """
 
+    checkpoint_suffix = '.download'
+    """ Suffix of the download checkpoint file next to the OHLCV file """
+
     @classmethod
     @abstractmethod
     def to_tradingview_timeframe(cls, timeframe: str) -> str:
@@ -73,7 +78,7 @@ class Provider(metaclass=ABCMeta):
         self.timeframe = timeframe
         self.xchg_timeframe = self.to_exchange_timeframe(timeframe) if timeframe else None
         self.ohlcv_path = self.get_ohlcv_path(symbol, timeframe, ohlv_dir) if ohlv_dir else None
-        self.ohlcv_file = OHLCVWriter(self.ohlcv_path) if self.ohlcv_path else None
+        self.ohlcv_file = OHLCVWriter(self.ohlcv_path, index=True) if self.ohlcv_path else None
 
         if not config_dir:  # Default config dir from the parent of the ohlcv_dir
             assert self.ohlcv_path is not None
@@ -150,8 +155,60 @@ class Provider(metaclass=ABCMeta):
         if isinstance(data, OHLCV):
             self.ohlcv_file.write(data)
         else:
-            for candle in data:
-                self.ohlcv_file.write(candle)
+            self.ohlcv_file.write_many(data)
+
+    @property
+    def checkpoint_path(self) -> Path:
+        """
+        Path of the download checkpoint file
+        """
+        assert self.ohlcv_path is not None
+        return Path(str(self.ohlcv_path) + self.checkpoint_suffix)
+
+    def load_checkpoint(self) -> int | None:
+        """
+        Load the download checkpoint
+
+        :return: The timestamp until all data was downloaded (exclusive), or None if there is no checkpoint
+        """
+        try:
+            return int(self.checkpoint_path.read_text().strip())
+        except (OSError, ValueError):
+            return None
+
+    def save_checkpoint(self, timestamp: int):
+        """
+        Save the download checkpoint, all data must be saved before this timestamp
+
+        :param timestamp: The timestamp until all data was downloaded (exclusive)
+        """
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + '.tmp')
+        tmp_path.write_text(f"{timestamp}\n")
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def clear_checkpoint(self):
+        """
+        Remove the download checkpoint, e.g. when the data file is truncated
+        """
+        self.checkpoint_path.unlink(missing_ok=True)
+
+    def get_resume_timestamp(self) -> int | None:
+        """
+        Get the timestamp where the download continues, after the last saved bar or the checkpoint,
+        whichever is later. The OHLCV file must be opened.
+
+        :return: The timestamp or None if there is no data and no checkpoint
+        """
+        assert self.ohlcv_file is not None
+        timestamps = []
+        if self.ohlcv_file.end_timestamp:
+            assert self.ohlcv_file.interval is not None
+            # One interval later to avoid downloading the same data
+            timestamps.append(self.ohlcv_file.end_timestamp + self.ohlcv_file.interval)
+        checkpoint = self.load_checkpoint()
+        if checkpoint is not None:
+            timestamps.append(checkpoint)
+        return max(timestamps) if timestamps else None
 
     @abstractmethod
     def download_ohlcv(self, time_from: datetime, time_to: datetime,
@@ -171,3 +228,75 @@ class Provider(metaclass=ABCMeta):
         Load OHLV data from the file
         """
         return OHLCVReader(str(self.ohlcv_path))
+
+
+class RefreshResult(NamedTuple):
+    """
+    Result of refreshing the data file of a symbol and timeframe
+    """
+    symbol: str
+    timeframe: str
+    path: Path | None
+    previous_end: int | None
+    """ Timestamp of the last bar before the refresh """
+    end: int | None
+    """ Timestamp of the last bar after the refresh """
+    new_bars: int
+    """ Number of appended records (including gap filling records) """
+    error: str | None = None
+
+
+def refresh_ohlcv(provider_class: type[Provider], symbols: Iterable[str], timeframes: Iterable[str],
+                  ohlcv_dir: Path, *, config_dir: Path | None = None, time_to: datetime | None = None,
+                  workers: int = 4) -> Iterator[RefreshResult]:
+    """
+    Append the missing bars to the existing data files of many symbols and timeframes concurrently
+
+    Every data file is continued after its last bar (or from the checkpoint of an interrupted download),
+    earlier data is not rewritten. Files without data are not downloaded, they are reported with an error.
+
+    :param provider_class: The provider class
+    :param symbols: The symbols
+    :param timeframes: The timeframes in TradingView fmt, every symbol is refreshed in all timeframes
+    :param ohlcv_dir: The directory of the data files
+    :param config_dir: The directory of the config file
+    :param time_to: The end time, default is now
+    :param workers: Number of symbols refreshed at the same time
+    :return: Iterator of the results in the order of completion
+    """
+    if time_to is None:
+        time_to = datetime.now(UTC).replace(second=0, microsecond=0)
+    time_to = time_to.replace(tzinfo=None)
+
+    def refresh(symbol: str, timeframe: str) -> RefreshResult:
+        path = None
+        try:
+            provider = provider_class(symbol=symbol, timeframe=timeframe, ohlv_dir=ohlcv_dir, config_dir=config_dir)
+            path = provider.ohlcv_path
+            if path is None or not path.exists():
+                return RefreshResult(symbol, timeframe, path, None, None, 0, "No data, download it first")
+            with provider as ohlcv_writer:
+                previous_end = ohlcv_writer.end_timestamp
+                size = ohlcv_writer.size
+                resume_timestamp = provider.get_resume_timestamp()
+                if resume_timestamp is None:
+                    return RefreshResult(symbol, timeframe, path, None, None, 0, "No data, download it first")
+                time_from = datetime.fromtimestamp(resume_timestamp, UTC).replace(tzinfo=None)
+                if time_from <= time_to:
+                    provider.download_ohlcv(time_from, time_to)
+                return RefreshResult(symbol, timeframe, path, previous_end, ohlcv_writer.end_timestamp,
+                                     ohlcv_writer.size - size)
+        except Exception as e:
+            return RefreshResult(symbol, timeframe, path, None, None, 0, str(e) or type(e).__name__)
+
+    jobs = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+    if not jobs:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(jobs)))) as executor:
+        futures = [executor.submit(refresh, symbol, timeframe) for symbol, timeframe in jobs]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
@@ -32,8 +32,10 @@ Example:
 import ast
 from typing import Set, Dict, List, Optional, cast, Any
 
+from .visitor import FastNodeTransformer, FastNodeVisitor
 
-class ClosureArgumentsTransformer(ast.NodeTransformer):
+
+class ClosureArgumentsTransformer(FastNodeTransformer):
     """Transform closure variables in inner functions to function arguments."""
 
     def __init__(self):
@@ -260,7 +262,7 @@ class ClosureArgumentsTransformer(ast.NodeTransformer):
         return annotation
 
 
-class ClosureVariableCollector(ast.NodeVisitor):
+class ClosureVariableCollector(FastNodeVisitor):
     """Collect closure variables for inner functions."""
 
     def __init__(self):
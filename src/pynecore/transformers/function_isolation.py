@@ -6,6 +6,7 @@ import hashlib
 from pathlib import Path
 
 from ..utils.stdlib_checker import stdlib_checker
+from .visitor import FastNodeTransformer
 
 # Functions that should not be transformed because they:
 # - don't return anything (plotting, display)
@@ -107,7 +108,7 @@ NON_TRANSFORMABLE_FUNCTIONS = {
 }
 
 
-class FunctionIsolationTransformer(ast.NodeTransformer):
+class FunctionIsolationTransformer(FastNodeTransformer):
     """
     Transform function calls to use the isolate_function() wrapper.
     Every function call (except builtins and non-transformable functions)
@@ -134,6 +135,9 @@ class FunctionIsolationTransformer(ast.NodeTransformer):
         self.shadowed_builtins_by_scope: dict[str, set[str]] = {}
         # Track counter variables that need to be initialized per function
         self.function_counters: dict[str, set[str]] = {}
+        # Cached results of builtin and standard library checks, a script calls the same functions many times
+        self._builtin_paths: dict[str, bool] = {}
+        self._stdlib_modules: dict[str, bool] = {}
 
     def _is_dataclass_constructor(self, func: ast.Name | ast.Attribute) -> bool:
         """
@@ -172,14 +176,8 @@ class FunctionIsolationTransformer(ast.NodeTransformer):
         if func_path in NON_TRANSFORMABLE_FUNCTIONS:
             return True
 
-        try:
-            # Try to evaluate the function path to get the actual object
-            obj = eval(func_path)
-            # Check if it's a builtin function/method
-            if isinstance(obj, (types.BuiltinFunctionType, types.BuiltinMethodType)):
-                return True
-        except:  # noqa
-            pass
+        if self._is_builtin_path(func_path):
+            return True
 
         # Handle direct builtin functions
         if '.' not in func_path:
@@ -197,7 +195,31 @@ class FunctionIsolationTransformer(ast.NodeTransformer):
 
         # Get module path
         module_path = func_path.split('.')[0]
-        return stdlib_checker.is_stdlib(module_path)
+        try:
+            return self._stdlib_modules[module_path]
+        except KeyError:
+            is_stdlib = self._stdlib_modules[module_path] = stdlib_checker.is_stdlib(module_path)
+            return is_stdlib
+
+    def _is_builtin_path(self, func_path: str) -> bool:
+        """
+        Check if a function path evaluates to a builtin function/method
+        """
+        try:
+            return self._builtin_paths[func_path]
+        except KeyError:
+            pass
+        is_builtin = False
+        try:
+            # Try to evaluate the function path to get the actual object
+            obj = eval(func_path)
+            # Check if it's a builtin function/method
+            if isinstance(obj, (types.BuiltinFunctionType, types.BuiltinMethodType)):
+                is_builtin = True
+        except:  # noqa
+            pass
+        self._builtin_paths[func_path] = is_builtin
+        return is_builtin
 
     @staticmethod
     def _get_func_path(func: ast.Attribute | ast.Expr) -> str | None:
@@ -1,13 +1,15 @@
 import ast
 from typing import Dict, Set, List, Optional, cast
 
+from .visitor import FastNodeTransformer
+
 NON_MODULE_ATTRS = {
     'input',  # class
     'script',  # class
 }
 
 
-class ImportNormalizerTransformer(ast.NodeTransformer):
+class ImportNormalizerTransformer(FastNodeTransformer):
     """
     AST transformer that normalizes pynecore.lib imports.
     - Converts all lib-related imports to 'from pynecore import lib'
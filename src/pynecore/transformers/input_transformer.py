@@ -1,8 +1,10 @@
 from typing import cast
 import ast
 
+from .visitor import FastNodeTransformer
 
-class InputTransformer(ast.NodeTransformer):
+
+class InputTransformer(FastNodeTransformer):
     """
     Transform input function calls:
     1. Add _id parameter to input calls
@@ -13,7 +15,6 @@ class InputTransformer(ast.NodeTransformer):
 
     def __init__(self):
         self.function_source_vars = {}  # function_name -> {var_name -> source_str}
-        self.current_function = None
         self.has_source_inputs = False
         self.imported_names: set[str] = set()  # Track what's already imported
 
@@ -40,11 +41,8 @@ class InputTransformer(ast.NodeTransformer):
 
         return False
 
-    def visit_arguments(self, node: ast.arguments) -> ast.arguments:
+    def _process_arguments(self, function_name: str, node: ast.arguments):
         """Add _id to input calls in function arguments and collect source vars"""
-        if self.current_function is None:
-            return node
-
         # Loop through arguments and defaults together
         for arg, default in zip(node.args[-len(node.defaults):], node.defaults):
             if default and isinstance(default, ast.Call):
@@ -100,24 +98,19 @@ class InputTransformer(ast.NodeTransformer):
                             source_name = defval_node.id
 
                         if source_name:
-                            if self.current_function not in self.function_source_vars:
-                                self.function_source_vars[self.current_function] = {}
-                            self.function_source_vars[self.current_function][arg.arg] = source_name
+                            if function_name not in self.function_source_vars:
+                                self.function_source_vars[function_name] = {}
+                            self.function_source_vars[function_name][arg.arg] = source_name
                             self.has_source_inputs = True
 
-        return node
-
     def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.FunctionDef:
         """Insert getattr calls at the start of functions for source inputs"""
-        # Save previous function name
-        previous_function = self.current_function
-        self.current_function = node.name
-
-        # Process function arguments and body
+        # Process function arguments and body first, so it can run in a fused walk of the tree
         node = cast(ast.FunctionDef, self.generic_visit(node))
+        self._process_arguments(node.name, node.args)
 
         # Add getattr for each source input in this function
-        source_vars = self.function_source_vars.get(self.current_function, {})
+        source_vars = self.function_source_vars.get(node.name, {})
         for var_name, source_str in source_vars.items():
             # Create: var_name = getattr(lib, var_name, lib.na)
             assign = ast.Assign(
@@ -138,8 +131,6 @@ class InputTransformer(ast.NodeTransformer):
             )
             node.body.insert(0, assign)
 
-        # Restore previous function name
-        self.current_function = previous_function
         return node
 
     def visit_Module(self, node: ast.Module) -> ast.Module:
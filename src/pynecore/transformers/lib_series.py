@@ -1,8 +1,10 @@
 import ast
 from typing import Dict, Set, cast
 
+from .visitor import FastNodeTransformer
 
-class LibrarySeriesTransformer(ast.NodeTransformer):
+
+class LibrarySeriesTransformer(FastNodeTransformer):
     """
     AST transformer that prepares library Series variables for the SeriesTransformer.
     When a library variable is used with indexing, it creates a local Series variable
@@ -3,8 +3,10 @@ import ast
 import json
 from pathlib import Path
 
+from .visitor import FastNodeTransformer
 
-class ModulePropertyTransformer(ast.NodeTransformer):
+
+class ModulePropertyTransformer(FastNodeTransformer):
     """
     Transform lib.xxx references based on JSON configuration.
     If module+name exists in config:
@@ -40,7 +42,8 @@ class ModulePropertyTransformer(ast.NodeTransformer):
                            node.func.id == 'isolate_function')
 
         # Set parent on children
-        for field, value in ast.iter_fields(node):
+        for field in node._fields:
+            value = getattr(node, field, None)
             if isinstance(value, ast.AST):
                 setattr(value, "parent", node)
             elif isinstance(value, list):
@@ -66,10 +69,6 @@ class ModulePropertyTransformer(ast.NodeTransformer):
         if self.in_isolate_function:
             return node
 
-        # Skip if inside type annotations
-        if self._is_in_type_annotation(node):
-            return node
-
         # Retrieve the AST parent node
         parent = getattr(node, 'parent', None)
 
@@ -85,6 +84,10 @@ class ModulePropertyTransformer(ast.NodeTransformer):
         if hasattr(node, '_processed') or not self._is_lib_reference(node):
             return node
 
+        # Skip if inside type annotations, it walks up the tree, so it is checked last
+        if self._is_in_type_annotation(node):
+            return node
+
         # Now it's the topmost attribute (e.g., ...data_window)
         # Check the full module path and the final attribute
         module_path, name = self._get_module_info(node)
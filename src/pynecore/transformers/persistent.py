@@ -1,8 +1,10 @@
 from typing import cast
 import ast
 
+from .visitor import FastNodeTransformer
 
-class PersistentTransformer(ast.NodeTransformer):
+
+class PersistentTransformer(FastNodeTransformer):
     """
     Transform Persistent type annotations and assignments to global variables
     """
@@ -243,7 +245,8 @@ class PersistentTransformer(ast.NodeTransformer):
                         kw.value = ast.Name(id=global_name, ctx=ast.Load())
 
         # Continue with recursion for all child nodes
-        for field, old_value in ast.iter_fields(node):
+        for field in node._fields:
+            old_value = getattr(node, field, None)
             if isinstance(old_value, list):
                 new_values = []
                 for value in old_value:
@@ -1,7 +1,9 @@
 import ast
 
+from .visitor import FastNodeTransformer
 
-class PersistentSeriesTransformer(ast.NodeTransformer):
+
+class PersistentSeriesTransformer(FastNodeTransformer):
     """
     Transform PersistentSeries declarations into Persistent + Series combination.
     Must be applied before PersistentTransformer and SeriesTransformer.
@@ -1,8 +1,10 @@
 from typing import cast, List, Optional
 import ast
 
+from .visitor import FastNodeTransformer
 
-class SafeConvertTransformer(ast.NodeTransformer):
+
+class SafeConvertTransformer(FastNodeTransformer):
     """
     Transformer that converts float(na) and int(na) calls to safe alternatives
     that preserve Pine Script semantics.
@@ -2,8 +2,10 @@ from _ast import Call, BinOp
 from typing import cast
 import ast
 
+from .visitor import FastNodeTransformer
 
-class SafeDivisionTransformer(ast.NodeTransformer):
+
+class SafeDivisionTransformer(FastNodeTransformer):
     """
     Transformer that converts division operations to safe alternatives
     that preserve Pine Script semantics.
@@ -1,8 +1,21 @@
 from typing import cast, Any
 import ast
 
+from .visitor import FastNodeTransformer
 
-class SeriesTransformer(ast.NodeTransformer):
+
+# Series implementations by the type of the series, they store values in typed arrays
+TYPED_SERIES_CLASSES = {
+    'float': 'FloatSeriesImpl',
+    'int': 'IntSeriesImpl',
+    'bool': 'BoolSeriesImpl',
+}
+
+# All series implementations, in the order of import
+SERIES_CLASSES = ('SeriesImpl', 'FloatSeriesImpl', 'IntSeriesImpl', 'BoolSeriesImpl')
+
+
+class SeriesTransformer(FastNodeTransformer):
     """Transform Series type variables in AST"""
 
     def __init__(self):
@@ -16,8 +29,8 @@ class SeriesTransformer(ast.NodeTransformer):
         self.current_function: str | None = None
         self.parent_functions: list[str] = []
 
-        # Tracking created Series
-        self.collected_series: set[str] = set()
+        # Tracking created Series, series name -> implementation class name
+        self.collected_series: dict[str, str] = {}
 
         # Import tracking
         self.has_series_import: bool = False
@@ -35,12 +48,13 @@ class SeriesTransformer(ast.NodeTransformer):
             assign_node.col_offset = col_offset
         return assign_node
 
-    def _register_series(self, var_name: str, scope: str | None = None) -> str:
+    def _register_series(self, var_name: str, annotation: ast.expr | None = None, scope: str | None = None) -> str:
         """
         Register a Series variable and return its global instance name.
 
         Args:
             var_name: The variable name to register
+            annotation: The Series type annotation, used to choose typed implementation
             scope: The scope where the variable is defined (default: current scope)
 
         Returns:
@@ -54,7 +68,7 @@ class SeriesTransformer(ast.NodeTransformer):
         if scope not in self.series_vars:
             self.series_vars[scope] = {}
         self.series_vars[scope][var_name] = series_name
-        self.collected_series.add(series_name)
+        self.collected_series[series_name] = self._get_series_class(annotation)
 
         return series_name
 
@@ -138,10 +152,12 @@ class SeriesTransformer(ast.NodeTransformer):
         )
 
         # Create SeriesImpl import and instances
+        class_names = set(self.collected_series.values())
         imports = [
             ast.ImportFrom(
                 module='pynecore.core.series',
-                names=[ast.alias(name='SeriesImpl', asname=None)],
+                names=[ast.alias(name=class_name, asname=None)
+                       for class_name in SERIES_CLASSES if class_name in class_names],
                 level=0
             )
         ]
@@ -150,7 +166,7 @@ class SeriesTransformer(ast.NodeTransformer):
             self._create_assign_with_lineno(
                 targets=[ast.Name(id=name, ctx=ast.Store())],
                 value=ast.Call(
-                    func=ast.Name(id='SeriesImpl', ctx=ast.Load()),
+                    func=ast.Name(id=self.collected_series[name], ctx=ast.Load()),
                     args=[],
                     keywords=[]
                 ),
@@ -214,7 +230,7 @@ class SeriesTransformer(ast.NodeTransformer):
         series_initializations = []
         for arg in node.args.args:
             if arg.annotation and self._is_series_type(arg.annotation):
-                series_name = self._register_series(arg.arg)
+                series_name = self._register_series(arg.arg, arg.annotation)
                 # Extract inner type from Series[T]
                 if isinstance(arg.annotation, ast.Subscript):
                     arg.annotation = arg.annotation.slice
@@ -275,7 +291,7 @@ class SeriesTransformer(ast.NodeTransformer):
 
         if self._is_series_type(node.annotation):
             var_name = node.target.id
-            series_name = self._register_series(var_name)
+            series_name = self._register_series(var_name, node.annotation)
 
             if node.value is None:
                 return None
@@ -416,6 +432,22 @@ class SeriesTransformer(ast.NodeTransformer):
         # This ensures Subscript nodes in conditional expressions are processed
         return super().generic_visit(node)
 
+    @staticmethod
+    def _get_series_class(annotation: ast.expr | None) -> str:
+        """
+        Get the name of the Series implementation class for the type annotation.
+
+        Args:
+            annotation: The Series type annotation
+
+        Returns:
+            str: Typed implementation for Series[float], Series[int] and Series[bool], SeriesImpl otherwise
+        """
+        if (isinstance(annotation, ast.Subscript) and isinstance(annotation.slice, ast.Name)
+                and annotation.slice.id in TYPED_SERIES_CLASSES):
+            return TYPED_SERIES_CLASSES[annotation.slice.id]
+        return 'SeriesImpl'
+
     @staticmethod
     def _is_series_type(annotation: ast.expr) -> bool:
         """
@@ -0,0 +1,257 @@
+"""
+Fast AST visitor base classes for the transformer pipeline
+
+The standard `ast.NodeVisitor` looks up the visitor method by name and iterates the fields with a generator
+for every node, which is the most of the time of a transformer pass. These classes cache the visitor of every
+node class, skip the nodes which have no children and no own visitor (contexts, operators, constants), and
+only write back fields which are really changed. They work the same way as the standard classes, so they can
+be used as drop-in replacements.
+
+`FusedTransformer` runs several bottom-up transformers in a single walk of the tree.
+"""
+from typing import Any, Callable
+import ast
+from ast import AST
+
+__all__ = ['FastNodeVisitor', 'FastNodeTransformer', 'FusedTransformer', 'fix_missing_locations']
+
+# Deprecated visitor methods, called by `ast.NodeVisitor.visit_Constant`
+_DEPRECATED_CONSTANT_VISITORS = ('visit_Num', 'visit_Str', 'visit_Bytes', 'visit_NameConstant', 'visit_Ellipsis')
+
+
+def _has_children(node_class: type) -> bool:
+    """
+    Check if nodes of a class can have child nodes
+    """
+    return bool(node_class._fields) and node_class is not ast.Constant  # noqa
+
+
+def _keep(node: AST) -> AST:
+    """
+    Visitor of nodes without children
+    """
+    return node
+
+
+def _ignore(_: AST) -> None:
+    """
+    Visitor of nodes without children for `NodeVisitor` classes
+    """
+    return None
+
+
+class FastNodeVisitor(ast.NodeVisitor):
+    """
+    Faster `ast.NodeVisitor`
+    """
+
+    def __new__(cls, *args, **kwargs):
+        self = object.__new__(cls)
+        # Visitors by node class
+        self._visitors = {}
+        return self
+
+    def _find_visitor(self, node_class: type) -> Callable[[AST], Any] | None:
+        """
+        Find the own visitor method of a node class
+
+        :param node_class: The class of the node
+        :return: The bound method or None if only the generic visitor should be used
+        """
+        visitor = getattr(self, 'visit_' + node_class.__name__, None)
+        if (getattr(visitor, '__func__', None) is ast.NodeVisitor.visit_Constant
+                and not any(hasattr(self, name) for name in _DEPRECATED_CONSTANT_VISITORS)):
+            return None
+        return visitor
+
+    def _get_visitor(self, node_class: type) -> Callable[[AST], Any]:
+        """
+        Get the visitor of a node class
+        """
+        visitor = self._find_visitor(node_class)
+        if visitor is not None:
+            return visitor
+        if not _has_children(node_class) and type(self).generic_visit is FastNodeVisitor.generic_visit:
+            return _ignore
+        return self.generic_visit
+
+    def visit(self, node: AST) -> Any:
+        try:
+            visitor = self._visitors[node.__class__]
+        except KeyError:
+            visitor = self._visitors[node.__class__] = self._get_visitor(node.__class__)
+        return visitor(node)
+
+    def generic_visit(self, node: AST) -> None:
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, AST):
+                        visit(item)
+            elif isinstance(value, AST):
+                visit(value)
+
+
+class FastNodeTransformer(ast.NodeTransformer):
+    """
+    Faster `ast.NodeTransformer`
+    """
+
+    __new__ = FastNodeVisitor.__new__
+    _find_visitor = FastNodeVisitor._find_visitor
+    visit = FastNodeVisitor.visit
+
+    def _get_visitor(self, node_class: type) -> Callable[[AST], Any]:
+        """
+        Get the visitor of a node class
+        """
+        visitor = self._find_visitor(node_class)
+        if visitor is not None:
+            return visitor
+        if not _has_children(node_class) and type(self).generic_visit is FastNodeTransformer.generic_visit:
+            return _keep
+        return self.generic_visit
+
+    def generic_visit(self, node: AST) -> AST:
+        visit = self.visit
+        for field in node._fields:
+            old_value = getattr(node, field, None)
+            if isinstance(old_value, list):
+                new_values = []
+                changed = False
+                for value in old_value:
+                    if isinstance(value, AST):
+                        new_value = visit(value)
+                        if new_value is not value:
+                            changed = True
+                            if new_value is None:
+                                continue
+                            if not isinstance(new_value, AST):
+                                new_values.extend(new_value)
+                                continue
+                            value = new_value
+                    new_values.append(value)
+                if changed:
+                    old_value[:] = new_values
+            elif isinstance(old_value, AST):
+                new_node = visit(old_value)
+                if new_node is None:
+                    delattr(node, field)
+                elif new_node is not old_value:
+                    setattr(node, field, new_node)
+        return node
+
+
+class FusedTransformer(FastNodeTransformer):
+    """
+    Run several transformers in a single walk of the tree.
+
+    The transformers must work bottom-up: their visitor methods must call `generic_visit()` before they
+    change the node, and must not depend on state set by the visitors of the parent nodes. The children of a
+    node are visited first, then the visitors of the node are called in the order of the transformers, the
+    same way as if the transformers would run one after the other.
+    """
+
+    def __init__(self, *transformers: FastNodeTransformer):
+        """
+        :param transformers: The transformers to run, in the order of the pipeline
+        """
+        self.transformers = transformers
+        for transformer in transformers:
+            # The children are already visited by the fused walk
+            transformer.generic_visit = _keep  # type: ignore
+
+    def _get_visitor(self, node_class: type) -> Callable[[AST], Any]:
+        """
+        Get the visitor of a node class, it calls the visitors of all transformers
+        """
+        generic_visit = self.generic_visit if _has_children(node_class) else _keep
+        visitors = [(index, visitor) for index, visitor in
+                    enumerate(t._find_visitor(node_class) for t in self.transformers)  # noqa
+                    if visitor is not None]
+        if not visitors:
+            return generic_visit
+        visit_rest = self._visit_rest
+
+        def visit(node: AST):
+            node = generic_visit(node)
+            for index, visitor in visitors:
+                result = visitor(node)
+                if result.__class__ is not node_class:
+                    # Removed or replaced, the rest of the transformers visit the new nodes
+                    return visit_rest(result, index + 1)
+                node = result
+            return node
+
+        return visit
+
+    def _visit_rest(self, result: list[AST] | AST | None, start: int) -> list[AST] | AST | None:
+        """
+        Call the visitors of the transformers from `start` on the nodes returned by a transformer
+        """
+        if result is None:
+            return None
+        nodes = [result] if isinstance(result, AST) else list(result)
+        for transformer in self.transformers[start:]:
+            new_nodes = []
+            for node in nodes:
+                visitor = transformer._find_visitor(node.__class__)  # noqa
+                new_node = visitor(node) if visitor is not None else node
+                if new_node is None:
+                    continue
+                if isinstance(new_node, AST):
+                    new_nodes.append(new_node)
+                else:
+                    new_nodes.extend(new_node)
+            nodes = new_nodes
+        if isinstance(result, AST) and len(nodes) == 1:
+            return nodes[0]
+        return nodes
+
+
+def fix_missing_locations(node: AST) -> AST:
+    """
+    Faster `ast.fix_missing_locations()`: set the missing locations of nodes from their parents
+
+    :param node: The root node
+    :return: The same node
+    """
+    attributes: dict[type, bool] = {}
+    stack: list[tuple[AST, int, int, int | None, int | None]] = [(node, 1, 0, 1, 0)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        node, lineno, col_offset, end_lineno, end_col_offset = pop()
+        node_class = node.__class__
+        try:
+            has_location = attributes[node_class]
+        except KeyError:
+            has_location = attributes[node_class] = 'lineno' in node_class._attributes  # noqa
+        if has_location:
+            try:
+                lineno = node.lineno  # type: ignore
+            except AttributeError:
+                node.lineno = lineno  # type: ignore
+            if getattr(node, 'end_lineno', None) is None:
+                node.end_lineno = end_lineno  # type: ignore
+            else:
+                end_lineno = node.end_lineno  # type: ignore
+            try:
+                col_offset = node.col_offset  # type: ignore
+            except AttributeError:
+                node.col_offset = col_offset  # type: ignore
+            if getattr(node, 'end_col_offset', None) is None:
+                node.end_col_offset = end_col_offset  # type: ignore
+            else:
+                end_col_offset = node.end_col_offset  # type: ignore
+        for field in reversed(node._fields):
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in reversed(value):
+                    if isinstance(item, AST):
+                        push((item, lineno, col_offset, end_lineno, end_col_offset))
+            elif isinstance(value, AST):
+                push((value, lineno, col_offset, end_lineno, end_col_offset))
+    return node
@@ -37,7 +37,7 @@ INDENT = 4
 
 class RunnerProtocol(Protocol):
     def __call__(self, ohlcv_iter: Iterable[OHLCV], syminfo_override: dict[str, Any] | None = None, *,
-                 syminfo_path: Path | None = None) -> ScriptRunner:
+                 syminfo_path: Path | None = None, batch: bool = False) -> ScriptRunner:
         ...
 
 
@@ -292,7 +292,7 @@ def runner(script_path, module_key, syminfo) -> RunnerProtocol:
     del sys.modules[module_key]
 
     def _runner(ohlcv_iter: Iterable[OHLCV], syminfo_override: dict[str, Any] | None = None, *,
-                syminfo_path: Path | None = None) -> ScriptRunner:
+                syminfo_path: Path | None = None, batch: bool = False) -> ScriptRunner:
         nonlocal syminfo
 
         if syminfo_path is not None:
@@ -301,7 +301,7 @@ def runner(script_path, module_key, syminfo) -> RunnerProtocol:
             for key, value in syminfo_override.items():
                 setattr(syminfo, key, value)
 
-        r = ScriptRunner(script_path, ohlcv_iter, syminfo)
+        r = ScriptRunner(script_path, ohlcv_iter, syminfo, batch=batch)
 
         return r
 
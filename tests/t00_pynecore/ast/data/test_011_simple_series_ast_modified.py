@@ -1,8 +1,8 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
-__series_main·s__ = SeriesImpl()
+from pynecore.core.series import IntSeriesImpl
+__series_main·s__ = IntSeriesImpl()
 __series_function_vars__ = {'main': ('__series_main·s__',)}
 
 def main():
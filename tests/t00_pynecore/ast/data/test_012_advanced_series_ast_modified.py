@@ -1,9 +1,9 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
-__series_main·s2__ = SeriesImpl()
-__series_main·test·s__ = SeriesImpl()
+from pynecore.core.series import FloatSeriesImpl, IntSeriesImpl
+__series_main·s2__ = FloatSeriesImpl()
+__series_main·test·s__ = IntSeriesImpl()
 __series_function_vars__ = {'main.test': ('__series_main·test·s__',), 'main': ('__series_main·s2__',)}
 
 def main():
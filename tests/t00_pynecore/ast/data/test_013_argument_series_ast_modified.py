@@ -1,10 +1,10 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
-__series_main·t·s__ = SeriesImpl()
-__series_t2·s1__ = SeriesImpl()
-__series_t2·s__ = SeriesImpl()
+from pynecore.core.series import FloatSeriesImpl
+__series_main·t·s__ = FloatSeriesImpl()
+__series_t2·s1__ = FloatSeriesImpl()
+__series_t2·s__ = FloatSeriesImpl()
 __series_function_vars__ = {'t2': ('__series_t2·s__', '__series_t2·s1__'), 'main.t': ('__series_main·t·s__',)}
 
 def t2(s: float, s1: float):
@@ -1,9 +1,9 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
+from pynecore.core.series import FloatSeriesImpl
 from pynecore.core.function_isolation import isolate_function
-__series_main·t·a__ = SeriesImpl()
+__series_main·t·a__ = FloatSeriesImpl()
 __series_function_vars__ = {'main.t': ('__series_main·t·a__',)}
 __scope_id__ = ''
 
@@ -1,10 +1,10 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
+from pynecore.core.series import FloatSeriesImpl
 from pynecore.core.function_isolation import isolate_function
-__series_t1·a__ = SeriesImpl()
-__series_t2·a__ = SeriesImpl()
+__series_t1·a__ = FloatSeriesImpl()
+__series_t2·a__ = FloatSeriesImpl()
 __series_function_vars__ = {'t1': ('__series_t1·a__',), 't2': ('__series_t2·a__',)}
 __scope_id__ = ''
 
@@ -1,11 +1,11 @@
 """
 @pyne
 """
-from pynecore.core.series import SeriesImpl
+from pynecore.core.series import FloatSeriesImpl
 from pynecore import lib
 import pynecore.lib.ta
 from pynecore.core.function_isolation import isolate_function
-__series_main·e__ = SeriesImpl()
+__series_main·e__ = FloatSeriesImpl()
 __series_function_vars__ = {'main': ('__series_main·e__',)}
 __scope_id__ = ''
 
@@ -0,0 +1,70 @@
+"""
+@pyne
+"""
+import ast
+
+from pynecore.transformers.visitor import FastNodeTransformer, FusedTransformer, fix_missing_locations
+from pynecore.transformers.safe_convert_transformer import SafeConvertTransformer
+from pynecore.transformers.safe_division_transformer import SafeDivisionTransformer
+
+
+def main():
+    pass
+
+
+SOURCE = '''
+def f(a, b=1 / 2):
+    pass
+    x = float(a) / b
+    y = [int(v) / 2 for v in range(3)]
+    return x, y / a if a else -a
+'''
+
+
+class _Edit:
+    """ Removes `pass`, duplicates returns, negates names """
+
+    def visit_Pass(self, node):
+        return None
+
+    def visit_Return(self, node):
+        node = self.generic_visit(node)
+        return [node, ast.Expr(value=ast.Constant(value=1))]
+
+    def visit_UnaryOp(self, node):
+        node = self.generic_visit(node)
+        return node.operand if isinstance(node.op, ast.USub) else node
+
+
+class _StdEdit(_Edit, ast.NodeTransformer):
+    pass
+
+
+class _FastEdit(_Edit, FastNodeTransformer):
+    pass
+
+
+def __test_fast_node_transformer__():
+    """ Fast transformer works the same way as the standard one """
+    expected = _StdEdit().visit(ast.parse(SOURCE))
+    result = _FastEdit().visit(ast.parse(SOURCE))
+    assert ast.dump(result, include_attributes=True) == ast.dump(expected, include_attributes=True)
+    assert 'pass' not in ast.unparse(result)
+
+
+def __test_fused_transformer__():
+    """ Fused transformers give the same result as running them one after the other """
+    expected = ast.parse(SOURCE)
+    for transformer in (_StdEdit(), SafeConvertTransformer(), SafeDivisionTransformer()):
+        expected = transformer.visit(expected)
+    ast.fix_missing_locations(expected)
+
+    result = FusedTransformer(_FastEdit(), SafeConvertTransformer(), SafeDivisionTransformer()).visit(
+        ast.parse(SOURCE))
+    fix_missing_locations(result)
+
+    assert ast.unparse(result) == ast.unparse(expected)
+    assert ast.dump(result, include_attributes=True) == ast.dump(expected, include_attributes=True)
+    assert 'safe_convert.safe_div(safe_convert.safe_float(a), b)' in ast.unparse(result)
+    # The import is added only once
+    assert ast.unparse(result).count('import safe_convert') == 1
@@ -0,0 +1,54 @@
+"""
+@pyne
+"""
+import random
+import statistics
+
+from pynecore.core.sorted_window import SortedWindow
+from pynecore.types.na import NA
+
+
+def main():
+    pass
+
+
+def __test_sorted_window_order_statistics__():
+    """ Sorted window order statistics """
+    rnd = random.Random(42)
+    length = 20
+    window = SortedWindow(length)
+    values = []
+    for _ in range(500):
+        # Many repeated values to test removal of duplicates
+        value = float(rnd.randint(0, 30))
+        window.push(value)
+        values = (values + [value])[-length:]
+
+        assert window.values == sorted(values)
+        assert window.median() == statistics.median(values)
+        assert window.median(lower=True) == statistics.median_low(values)
+        assert window.percentile_nearest_rank(100) == max(values)
+        assert window.percentile_linear_interpolation(0) == min(values)
+        if len(values) > 1:
+            expected = (sum(1 for v in values if v <= value) - 1) * 100 / (len(values) - 1)
+            assert window.percentrank(value) == expected
+    assert window.is_full
+
+
+def __test_sorted_window_na__():
+    """ NA values take up place in the window, but they are not part of the statistics """
+    window = SortedWindow(3)
+    assert isinstance(window.median(), NA)
+
+    window.push(1.0)
+    window.push(NA(float))
+    window.push(3.0)
+    assert window.is_full
+    assert len(window) == 2
+    assert window.median() == 2.0
+
+    window.push(5.0)  # 1.0 is removed
+    assert window.values == [3.0, 5.0]
+    window.push(7.0)  # NA is removed
+    assert window.values == [3.0, 5.0, 7.0]
+    assert window.percentrank(7.0) == 100.0
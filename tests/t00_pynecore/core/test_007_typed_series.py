@@ -0,0 +1,76 @@
+"""
+@pyne
+"""
+import math
+
+from pynecore import lib
+from pynecore.core.series import SeriesImpl, FloatSeriesImpl, IntSeriesImpl, BoolSeriesImpl
+from pynecore.types.na import NA
+
+
+def main():
+    pass
+
+
+def _fill(series: SeriesImpl, values: list) -> None:
+    """ Add values to the series as if they were on consecutive bars """
+    old_bar_index = lib.bar_index
+    try:
+        for i, value in enumerate(values):
+            lib.bar_index = i
+            series.add(value)
+    finally:
+        lib.bar_index = old_bar_index
+
+
+def __test_typed_series_values__():
+    """ Typed series return the same values as a normal series """
+    float_series = FloatSeriesImpl(5)
+    _fill(float_series, [1.5, NA(float), 3.0, 4.25, 5.0, 6.0, 7.5])
+    assert float_series[0] == 7.5
+    assert float_series[1] == 6.0
+    assert float_series[4] == 3.0
+    assert isinstance(float_series[5], NA)  # NA stored
+    assert isinstance(float_series[6], NA)  # Out of range
+    assert list(float_series[0:3]) == [7.5, 6.0, 5.0]
+
+    int_series = IntSeriesImpl(3)
+    _fill(int_series, [1, NA(int), 3])
+    assert int_series[0] == 3 and isinstance(int_series[0], int)
+    assert isinstance(int_series[1], NA)
+
+    bool_series = BoolSeriesImpl(3)
+    _fill(bool_series, [True, False, NA(bool)])
+    assert bool_series[2] is True
+    assert bool_series[1] is False
+    assert isinstance(bool_series[0], NA)
+
+
+def __test_typed_series_fallback__():
+    """ If a value can not be stored in the typed array, the series becomes a normal series """
+    series = IntSeriesImpl(3)
+    _fill(series, [1, 2, 2.5, 'x'])
+    assert type(series) is SeriesImpl
+    assert [series[i] for i in range(4)] == ['x', 2.5, 2, 1]
+
+
+def __test_typed_series_window_and_resize__():
+    """ Window of the last values and resizing """
+    series = FloatSeriesImpl(4)
+    _fill(series, [float(i) for i in range(7)])
+
+    # The window is contiguous in the ring buffer: no copy
+    window = series.window(2)
+    assert isinstance(window, memoryview)
+    assert list(window) == [5.0, 6.0]
+    # Wrapped around: copied
+    assert list(series.window(5)) == [2.0, 3.0, 4.0, 5.0, 6.0]
+
+    series.max_bars_back = 10
+    assert [series[i] for i in range(5)] == [6.0, 5.0, 4.0, 3.0, 2.0]
+    series.max_bars_back = 2
+    assert list(series.window(3)) == [4.0, 5.0, 6.0]
+
+    # NA is NaN in the window of float series
+    _fill(series, [NA(float)])
+    assert math.isnan(series.window(1)[0])
@@ -0,0 +1,106 @@
+"""
+@pyne
+"""
+import sys
+
+from pynecore.core import import_hook
+
+
+def main():
+    pass
+
+
+SCRIPT = '''"""
+@pyne
+"""
+from pynecore.types import Persistent
+
+
+def main():
+    count: Persistent[int] = 0
+    count += 1
+    return count
+'''
+
+
+def __test_transformed_code_cache__(tmp_path, monkeypatch):
+    """ Transformed code is cached, the cache is invalidated by source and transformer pipeline changes """
+    monkeypatch.setenv('PYNE_CACHE_DIR', str(tmp_path / "cache"))
+    monkeypatch.setattr(sys, 'dont_write_bytecode', False)
+    for name in import_hook.DEBUG_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+
+    script_path = tmp_path / "cached_script.py"
+    script_path.write_text(SCRIPT)
+    loader = import_hook.PyneLoader('cached_script', str(script_path))
+
+    transforms = []
+    original_transform_ast = import_hook.transform_ast
+
+    def transform_ast(tree):
+        transforms.append(tree)
+        return original_transform_ast(tree)
+
+    monkeypatch.setattr(import_hook, 'transform_ast', transform_ast)
+
+    def run(code):
+        namespace = {'__name__': 'cached_script'}
+        exec(code, namespace)
+        return [namespace['main']() for _ in range(3)]
+
+    code = loader.get_code('cached_script')
+    assert len(transforms) == 1
+    assert run(code) == [1, 2, 3]
+
+    # Second load comes from the cache
+    assert run(loader.get_code('cached_script')) == [1, 2, 3]
+    assert len(transforms) == 1
+    assert len(list((tmp_path / "cache").rglob("*.pyc"))) == 1
+
+    # Changed source: transformed again, the old entry is replaced
+    script_path.write_text(SCRIPT.replace("count += 1", "count += 2"))
+    assert run(loader.get_code('cached_script')) == [2, 4, 6]
+    assert len(transforms) == 2
+    assert len(list((tmp_path / "cache").rglob("*.pyc"))) == 1
+
+    # Changed transformer pipeline
+    monkeypatch.setattr(import_hook, '_pipeline_version', 'other')
+    loader.get_code('cached_script')
+    assert len(transforms) == 3
+
+    # Corrupt cache file is ignored
+    cache_file, = (tmp_path / "cache").rglob("*.pyc")
+    cache_file.write_bytes(cache_file.read_bytes()[:20])
+    assert run(loader.get_code('cached_script')) == [2, 4, 6]
+    assert len(transforms) == 4
+
+    # Modules only mentioning the marker outside of the module docstring are not cached
+    plain_path = tmp_path / "plain_module.py"
+    plain_path.write_text('"""Plain module"""\n# Scripts are marked with @pyne\nVALUE = 1\n')
+    import_hook.PyneLoader('plain_module', str(plain_path)).get_code('plain_module')
+    assert len(transforms) == 4
+    assert len(list((tmp_path / "cache").rglob("*.pyc"))) == 1
+
+    assert import_hook.has_pyne_docstring(b'#!/usr/bin/env python\n\n"""\n@pyne\n"""\nx = 1\n')
+    assert not import_hook.has_pyne_docstring(b'x = "@pyne"\n')
+    assert not import_hook.has_pyne_docstring(b'"""Not a script"""\n"""@pyne"""\n')
+
+
+def __test_pipeline_version__(monkeypatch):
+    """ The pipeline version depends on the sources the transformed code depends on """
+    from pathlib import Path
+
+    read_paths = []
+    original_read_bytes = Path.read_bytes
+
+    def read_bytes(self):
+        read_paths.append(self.as_posix())
+        return original_read_bytes(self)
+
+    monkeypatch.setattr(import_hook, '_pipeline_version', None)
+    monkeypatch.setattr(Path, 'read_bytes', read_bytes)
+    import_hook.pipeline_version()
+    assert any(p.endswith('/core/import_hook.py') for p in read_paths)
+    assert any(p.endswith('/transformers/import_normalizer.py') for p in read_paths)
+    assert any(p.endswith('/lib/ta.py') for p in read_paths)
+    assert any(p.endswith('/utils/stdlib_checker.py') for p in read_paths)
@@ -0,0 +1,50 @@
+"""
+@pyne
+"""
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
+from pynecore.core.syminfo import SymInfoInterval, SymInfoSession
+from pynecore.core.session_calendar import SessionCalendar, local_seconds
+
+
+def main():
+    pass
+
+
+# Forex like sessions: Sunday 17:00 - Friday 17:00 with a break every day
+CALENDAR = SessionCalendar(
+    [SymInfoInterval(day, time(0), time(16, 59)) for day in range(5)]
+    + [SymInfoInterval(day, time(17, 5), time(0)) for day in range(4)]
+    + [SymInfoInterval(6, time(17), time(0))],
+    [SymInfoSession(day, time(17, 5)) for day in range(4)] + [SymInfoSession(6, time(17))],
+    [SymInfoSession(day, time(16, 59)) for day in range(5)],
+)
+
+TZ = ZoneInfo('US/Eastern')
+
+
+def __test_session_calendar__():
+    """ Session checks of the precompiled session calendar """
+    # Tuesday
+    t = local_seconds(datetime(2024, 10, 22, 17, 0, tzinfo=TZ))
+    assert CALENDAR.weekday(t) == 1
+    assert not CALENDAR.in_session(t, 60)
+    assert CALENDAR.in_session(t, 300)  # Overlaps with the session starting at 17:05
+    assert CALENDAR.is_session_start(t, 3600) and not CALENDAR.is_session_start(t, 300)
+    assert CALENDAR.is_session_end(t - 3600, 3600) and not CALENDAR.is_session_end(t, 3600)
+    assert CALENDAR.is_new_session(t, t - 3600, 3600) and not CALENDAR.is_new_session(t + 3600, t, 3600)
+    # Saturday
+    assert not CALENDAR.in_session(t + 4 * 86400, 3600)
+    assert CALENDAR.first_session_start(6) == 17 * 3600 and CALENDAR.first_session_start(5) is None
+
+
+def __test_session_calendar_new_sessions__():
+    """ New sessions found by the calendar are the same as checking every candle """
+    # Across the daylight saving time change
+    start = local_seconds(datetime(2024, 10, 20, 0, 0, tzinfo=TZ))
+    end = local_seconds(datetime(2024, 11, 20, 0, 0, tzinfo=TZ))
+    for tf_sec in (60, 900, 3600, 4 * 3600):
+        expected = [t for t in range(start, end, tf_sec) if CALENDAR.is_new_session(t, t - tf_sec, tf_sec)]
+        assert expected
+        assert list(CALENDAR.new_sessions(start, end, tf_sec)) == expected
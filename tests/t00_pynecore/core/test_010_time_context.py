@@ -0,0 +1,31 @@
+"""
+@pyne
+"""
+from datetime import datetime, UTC
+from zoneinfo import ZoneInfo
+
+from pynecore.core.datetime import TimeContext
+
+
+def main():
+    pass
+
+
+def __test_time_context__():
+    """ Local time fields of the time context are the same as of datetime, also around DST transitions """
+    for tz_name, day in (('US/Eastern', datetime(2024, 11, 3, tzinfo=UTC)),
+                         ('US/Eastern', datetime(2024, 3, 10, tzinfo=UTC)),
+                         ('Australia/Lord_Howe', datetime(2024, 4, 6, tzinfo=UTC)),
+                         ('America/St_Johns', datetime(2024, 11, 3, tzinfo=UTC)),
+                         ('UTC', datetime(2024, 2, 28, tzinfo=UTC))):
+        tz = ZoneInfo(tz_name)
+        time_context = TimeContext(tz)
+        start = int(day.timestamp()) - 86400
+        for ts in range(start, start + 3 * 86400, 300):
+            time_context.set(ts)
+            dt = datetime.fromtimestamp(ts, UTC).astimezone(tz)
+            assert (time_context.year, time_context.month, time_context.day, time_context.hour,
+                    time_context.minute, time_context.second, time_context.weekday()) == \
+                   (dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second, dt.weekday()), (tz_name, ts)
+            assert time_context.local_datetime == dt.replace(tzinfo=None)
+        assert time_context.datetime == dt and time_context.datetime.tzinfo is tz
@@ -1272,3 +1272,230 @@ def __test_ohlcv_json_conversion_alternative_wrappers__(tmp_path):
         candles = list(reader)
         assert len(candles) == 2
         assert candles[0].close == 105.0
+
+
+def __test_ohlcv_reader_as_arrays__(tmp_path):
+    """Columnar bulk read of OHLCV data"""
+    file_path = tmp_path / "test_arrays.ohlcv"
+
+    # Create test data with a gap at the 6th candle
+    with OHLCVWriter(file_path) as writer:
+        for i in range(10):
+            if i == 5:
+                continue
+            timestamp = 1609459200 + (i * 60)
+            writer.write(OHLCV(timestamp=timestamp, open=100.0 + i, high=110.0 + i, low=90.0 + i, close=105.0 + i,
+                               volume=1000.0 + i))
+
+    with OHLCVReader(file_path) as reader:
+        columns = reader.as_arrays()
+
+        # All records are included, gaps too
+        assert len(columns.timestamp) == 10
+        assert list(columns.timestamp) == [1609459200 + i * 60 for i in range(10)]
+        assert list(columns.close) == [105.0 + i if i != 5 else 109.0 for i in range(10)]
+        assert columns.volume[5] == -1.0
+
+        # Columns should match the candles read one by one
+        for i, candle in enumerate(reader):
+            assert candle.open == columns.open[i]
+            assert candle.high == columns.high[i]
+            assert candle.low == columns.low[i]
+            assert candle.volume == columns.volume[i]
+
+        # Range query works the same way as `read_from`
+        columns = reader.as_arrays(1609459320, 1609459500)
+        assert list(columns.timestamp) == [1609459320, 1609459380, 1609459440, 1609459500]
+        assert list(columns.open) == [102.0, 103.0, 104.0, 109.0]
+        del columns
+
+
+def __test_ohlcv_reader_chunk_boundaries__(tmp_path):
+    """Batched reading across chunk boundaries"""
+    from pynecore.core.ohlcv_file import READ_CHUNK_SIZE
+
+    file_path = tmp_path / "test_chunks.ohlcv"
+    count = READ_CHUNK_SIZE * 2 + 10
+
+    # Every 7th candle is missing, so gaps are spread over all chunks
+    with OHLCVWriter(file_path) as writer:
+        for i in range(count):
+            if i % 7 == 3:
+                continue
+            writer.write(OHLCV(timestamp=1609459200 + i * 60, open=float(i), high=float(i) + 1.0,
+                               low=float(i) - 1.0, close=float(i), volume=1.0))
+
+    with OHLCVReader(file_path) as reader:
+        candles = list(reader)
+        assert len(candles) == count
+        assert all(reader.read(i)[:6] == candles[i][:6] for i in range(0, count, 97))
+
+        real_candles = list(reader.read_from(1609459200))
+        assert len(real_candles) == count - sum(1 for i in range(count) if i % 7 == 3)
+        assert all(candle.volume >= 0 for candle in real_candles)
+        assert [c.timestamp for c in real_candles] == [1609459200 + i * 60 for i in range(count) if i % 7 != 3]
+
+
+def __test_ohlcv_gap_index__(tmp_path):
+    """Gap index sidecar file"""
+    file_path = tmp_path / "test_index.ohlcv"
+    index_path = tmp_path / "test_index.ohlcv.idx"
+
+    # Candles 2, 5, 6 and 7 are missing
+    missing = {2, 5, 6, 7}
+    with OHLCVWriter(file_path, index=True) as writer:
+        for i in range(10):
+            if i in missing:
+                continue
+            writer.write(OHLCV(timestamp=1609459200 + i * 60, open=100.0, high=110.0, low=90.0, close=105.0,
+                               volume=1000.0))
+    assert index_path.exists()
+
+    with OHLCVReader(file_path) as reader:
+        assert reader.index is not None
+        assert reader.index.runs == [(2, 1), (5, 3)]
+        assert reader.get_size(skip_gaps=True) == 6
+        assert reader.get_size(1609459260, 1609459440, skip_gaps=True) == 3
+        assert [c.timestamp for c in reader.read_from(1609459260)] == \
+               [1609459200 + i * 60 for i in range(1, 10) if i not in missing]
+
+    # Appending updates the index
+    with OHLCVWriter(file_path, index=True) as writer:
+        writer.write(OHLCV(timestamp=1609459200 + 12 * 60, open=100.0, high=110.0, low=90.0, close=105.0,
+                           volume=1000.0))
+
+    with OHLCVReader(file_path) as reader:
+        assert reader.index is not None
+        assert reader.index.runs == [(2, 1), (5, 3), (10, 2)]
+        assert reader.get_size(skip_gaps=True) == 7
+
+    # Writing without index removes the (then stale) index
+    with OHLCVWriter(file_path) as writer:
+        writer.write(OHLCV(timestamp=1609459200 + 14 * 60, open=100.0, high=110.0, low=90.0, close=105.0,
+                           volume=1000.0))
+    assert not index_path.exists()
+
+    # Without index the same results are calculated by scanning
+    with OHLCVReader(file_path) as reader:
+        assert reader.index is None
+        assert reader.get_size(skip_gaps=True) == 8
+        assert len(list(reader.read_from(1609459200))) == 8
+
+
+def __test_ohlcv_buffered_write__(tmp_path):
+    """Buffered bulk writing produces the same file as writing candle by candle"""
+    from pynecore.core.ohlcv_file import WRITE_BUFFER_SIZE
+
+    candles = []
+    timestamp = 1609459200
+    for i in range(WRITE_BUFFER_SIZE + 500):
+        # Gaps of different lengths, the last one is longer than the write buffer
+        timestamp += 60 * (1 + (i % 7 == 0) * (i % 5) + (i == WRITE_BUFFER_SIZE + 100) * WRITE_BUFFER_SIZE)
+        price = 100.0 + (i % 50) * 0.25
+        candles.append(OHLCV(timestamp, price, price + 0.5, price - 0.5, price + 0.25, 10.0 + i))
+
+    with OHLCVWriter(tmp_path / "single.ohlcv") as writer:
+        for candle in candles:
+            writer.write(candle)
+        single_tick_size = writer.analyzed_tick_size
+
+    with OHLCVWriter(tmp_path / "bulk.ohlcv") as writer:
+        assert writer.write_many(candles[:1000]) == 1000
+        assert writer.write_many(iter(candles[1000:])) == len(candles) - 1000
+        assert writer.analyzed_tick_size == single_tick_size
+
+    assert (tmp_path / "bulk.ohlcv").read_bytes() == (tmp_path / "single.ohlcv").read_bytes()
+
+    # Buffered mode: the records are written on flush and close
+    file_path = tmp_path / "buffered.ohlcv"
+    with OHLCVWriter(file_path, buffered=True) as writer:
+        for candle in candles[:10]:
+            writer.write(candle)
+        assert writer.size > 10
+        assert os.path.getsize(file_path) == 0
+        writer.flush()
+        assert os.path.getsize(file_path) == writer.size * 24
+        writer.seek(5)
+        writer.truncate()
+        assert os.path.getsize(file_path) == 5 * 24
+
+    with OHLCVWriter(file_path, buffered=True) as writer:
+        writer.write(candles[10])
+
+    with OHLCVReader(file_path) as reader:
+        result = list(reader)
+    with OHLCVReader(tmp_path / "single.ohlcv") as reader:
+        assert result[:5] == list(reader)[:5]
+    assert all(candle.volume == -1.0 for candle in result[5:-1])
+    assert result[-1].timestamp == candles[10].timestamp
+
+
+def __test_ohlcv_parallel_conversion__(tmp_path, monkeypatch):
+    """Parallel parsing of big CSV and TXT files gives the same result as sequential parsing"""
+    from pynecore.core import ohlcv_file
+
+    rows = []
+    timestamp = 1609459200
+    for i in range(500):
+        timestamp += 60 if i % 37 else 300  # With gaps
+        price = 100.0 + (i % 20) * 0.5
+        rows.append((timestamp, price, price + 1.0, price - 1.0, price + 0.5, 1000.0 + i))
+
+    csv_path = tmp_path / "big.csv"
+    csv_path.write_text("timestamp,open,high,low,close,volume\n"
+                        + "".join(",".join(str(v) for v in row) + "\n" for row in rows))
+    txt_path = tmp_path / "big.txt"
+    txt_path.write_text("timestamp\topen\thigh\tlow\tclose\tvolume\n"
+                        + "".join("\t".join(str(v) for v in row) + "\n\n" for row in rows))
+
+    # Every chunk is a few rows, so there are many chunks
+    monkeypatch.setattr(ohlcv_file, 'PARALLEL_CHUNK_SIZE', 1000)
+
+    for path, load in ((csv_path, OHLCVWriter.load_from_csv), (txt_path, OHLCVWriter.load_from_txt)):
+        results = []
+        for workers in (1, 2):
+            ohlcv_path = tmp_path / f"{path.suffix[1:]}_{workers}.ohlcv"
+            with OHLCVWriter(ohlcv_path) as writer:
+                load(writer, path, workers=workers)
+                results.append((ohlcv_path.read_bytes(), writer.analyzed_tick_size, writer.analyzed_opening_hours))
+        assert results[0] == results[1]
+
+    with OHLCVReader(tmp_path / "csv_2.ohlcv") as reader:
+        assert [c.timestamp for c in reader.read_from(reader.start_timestamp)] == [r[0] for r in rows]
+
+    # Errors of the workers are raised
+    with open(csv_path, 'a') as f:
+        f.write("invalid-timestamp,100.0,110.0,90.0,105.0,1000.0\n")
+    with pytest.raises(ValueError, match="Failed to parse timestamp"):
+        with OHLCVWriter(tmp_path / "invalid.ohlcv") as writer:
+            writer.load_from_csv(csv_path, workers=2)
+
+
+def __test_ohlcv_timestamp_parser__():
+    """The cached timestamp parser gives the same results as parsing every row"""
+    from datetime import datetime, timedelta, timezone
+    from zoneinfo import ZoneInfo
+    # noinspection PyProtectedMember
+    from pynecore.core.ohlcv_file import _TimestampParser, _parse_timestamp
+
+    timezones = (None, ZoneInfo('UTC'), ZoneInfo('Europe/London'), timezone(timedelta(hours=5, minutes=30)))
+    formats = ('%Y-%m-%d %H:%M:%S', '%d.%m.%Y %H:%M:%S', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%d %H:%M', '%Y-%m-%d')
+    # Around the DST change in London, with some rows in other formats
+    dates = [datetime(2024, 3, 30, 22) + timedelta(minutes=37 * i) for i in range(100)]
+
+    for tz in timezones:
+        for fmt in formats:
+            rows = [dt.strftime(fmt) for dt in dates]
+            rows[10] = str(int(dates[10].timestamp()))
+            rows[20] = dates[20].strftime('%Y-%m-%d %H:%M:%S+0100')
+            rows[30] = rows[30].replace('0', '9', 1)
+            for timestamp_format in (None, fmt):
+                parser = _TimestampParser(timestamp_format, tz)
+                for row in rows:
+                    try:
+                        expected = _parse_timestamp(row, timestamp_format, tz)
+                    except ValueError:
+                        with pytest.raises(ValueError):
+                            parser(row)
+                        continue
+                    assert parser(row) == expected, (tz, fmt, row)
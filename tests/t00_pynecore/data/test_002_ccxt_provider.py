@@ -263,3 +263,111 @@ def __test_ccxt_real_data_download__(tmp_path):
                 f"Volume mismatch at candle {i}: expected {expected['volume']}, got {actual.volume}"
 
         print("Data validation successful - downloaded data matches expected values")
+
+
+class _FakeExchange:
+    """Local exchange, bars from `listed` on, with a missing day, it can fail after some requests"""
+    id = 'fake'
+    rateLimit = 0
+
+    def __init__(self, listed: int, fail_after: int | None = None):
+        self.listed = listed
+        self.fail_after = fail_after
+        self.requests = []
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        assert symbol == 'BTC/USDT' and timeframe == '1h'
+        if self.fail_after is not None and len(self.requests) >= self.fail_after:
+            raise ConnectionError("Connection lost")
+        self.requests.append(since)
+        start = max(since, self.listed * 1000)
+        start = (start + 3599999) // 3600000 * 3600000
+        bars = []
+        for t in range(start, start + limit * 3600000, 3600000):
+            if 1612137600000 <= t < 1612224000000:  # Missing day
+                continue
+            price = 100.0 + t % 7200000 / 3600000
+            bars.append([t, price, price + 1, price - 1, price, 10.0])
+        # Returns less bars than the limit, as some exchanges do
+        return bars[:70]
+
+
+class _FakeMonthlyExchange:
+    """Local exchange with monthly bars, it returns only 2 bars per request"""
+    id = 'fake'
+    rateLimit = 0
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        from datetime import datetime, UTC
+        assert timeframe == '1M'
+        dt = datetime.fromtimestamp(since / 1000, UTC)
+        year, month = dt.year, dt.month
+        if dt != datetime(year, month, 1, tzinfo=UTC):
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        bars = []
+        for i in range(2):
+            t = int(datetime(year + (month - 1 + i) // 12, (month - 1 + i) % 12 + 1, 1, tzinfo=UTC).timestamp())
+            bars.append([t * 1000, 100.0, 101.0, 99.0, 100.0, 10.0])
+        return bars
+
+
+def __test_ccxt_concurrent_resumable_download__(tmp_path):
+    """Concurrent download by windows with checkpoints, resumed after an interruption"""
+    from datetime import datetime, UTC
+    from pynecore.core.ohlcv_file import OHLCVReader
+
+    pytest.importorskip('ccxt')
+
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "providers.toml").write_text("[ccxt]\n")
+    time_from = datetime(2021, 1, 1, tzinfo=UTC)
+    time_to = datetime(2021, 3, 1, tzinfo=UTC)
+    listed = int(datetime(2021, 1, 10, tzinfo=UTC).timestamp())
+
+    def provider_for(data_dir, exchange):
+        data_dir.mkdir(exist_ok=True)
+        provider = CCXTProvider(symbol="BINANCE:BTC/USDT", timeframe="60", ohlv_dir=data_dir,
+                                config_dir=tmp_path / "config")
+        provider._client = exchange  # noqa
+        return provider
+
+    # Uninterrupted download
+    provider = provider_for(tmp_path / "full", _FakeExchange(listed))
+    with provider:
+        provider.download_ohlcv(time_from, time_to, workers=3)
+    assert provider.load_checkpoint() == int(time_to.timestamp()) + 1
+    with OHLCVReader(provider.ohlcv_path) as reader:
+        candles = list(reader.read_from(reader.start_timestamp))
+    assert candles[0].timestamp == listed
+    assert candles[-1].timestamp == int(time_to.timestamp())
+    assert len(candles) == (candles[-1].timestamp - listed) // 3600 + 1 - 24  # Without the missing day
+
+    # Interrupted download
+    provider = provider_for(tmp_path / "resumed", _FakeExchange(listed, fail_after=12))
+    with provider:
+        with pytest.raises(ConnectionError):
+            provider.download_ohlcv(time_from, time_to, workers=3)
+        checkpoint = provider.load_checkpoint()
+        assert checkpoint is not None and provider.ohlcv_file.end_timestamp < checkpoint
+
+    # Continue where it stopped
+    exchange = _FakeExchange(listed)
+    provider = provider_for(tmp_path / "resumed", exchange)
+    with provider:
+        resume_timestamp = provider.get_resume_timestamp()
+        assert resume_timestamp == checkpoint
+        provider.download_ohlcv(datetime.fromtimestamp(resume_timestamp, UTC), time_to, workers=3)
+    assert min(exchange.requests) == checkpoint * 1000
+
+    assert provider.ohlcv_path.read_bytes() == (tmp_path / "full" / provider.ohlcv_path.name).read_bytes()
+
+    # Monthly bars: months are shorter or longer than the average month of the timeframe
+    provider = CCXTProvider(symbol="BINANCE:BTC/USDT", timeframe="1M", ohlv_dir=tmp_path / "monthly",
+                            config_dir=tmp_path / "config")
+    (tmp_path / "monthly").mkdir()
+    provider._client = _FakeMonthlyExchange()  # noqa
+    with provider:
+        provider.download_ohlcv(datetime(2020, 1, 1, tzinfo=UTC), datetime(2022, 12, 1, tzinfo=UTC), workers=3)
+    with OHLCVReader(provider.ohlcv_path) as reader:
+        months = [datetime.fromtimestamp(c.timestamp, UTC) for c in reader.read_from(reader.start_timestamp)]
+    assert [(m.year, m.month) for m in months] == [(y, m) for y in range(2020, 2023) for m in range(1, 13)]
@@ -0,0 +1,90 @@
+"""
+@pyne
+"""
+from datetime import datetime, UTC
+
+from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader
+from pynecore.providers.provider import Provider, refresh_ohlcv
+from pynecore.types.ohlcv import OHLCV
+
+
+def main():
+    """
+    Dummy main function to be a valid Pyne script
+    """
+    pass
+
+
+class LocalProvider(Provider):
+    """
+    Provider with generated hourly bars
+    """
+
+    downloads: list[tuple[str, datetime, datetime]] = []
+
+    @classmethod
+    def to_tradingview_timeframe(cls, timeframe: str) -> str:
+        return timeframe
+
+    @classmethod
+    def to_exchange_timeframe(cls, timeframe: str) -> str:
+        return timeframe
+
+    def get_list_of_symbols(self, *args, **kwargs) -> list[str]:
+        return []
+
+    def update_symbol_info(self):
+        raise NotImplementedError
+
+    def get_opening_hours_and_sessions(self):
+        raise NotImplementedError
+
+    def download_ohlcv(self, time_from, time_to, on_progress=None):
+        if self.symbol == 'BROKEN':
+            raise ConnectionError("Connection lost")
+        self.downloads.append((self.symbol, time_from, time_to))
+        start = int(time_from.replace(tzinfo=UTC).timestamp())
+        end = int(time_to.replace(tzinfo=UTC).timestamp())
+        self.save_ohlcv_data([OHLCV(t, 1.0, 2.0, 0.5, 1.5, 10.0) for t in range(start, end + 1, 3600)])
+
+
+def __test_refresh_ohlcv__(tmp_path):
+    """ Refresh the data files of many symbols: only the missing tails are downloaded and appended """
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "providers.toml").write_text("[local]\n")
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+
+    start = int(datetime(2024, 1, 1, tzinfo=UTC).timestamp())
+    ends = {'AAA': start + 10 * 3600, 'BBB': start + 50 * 3600, 'BROKEN': start + 3600}
+    for symbol, end in ends.items():
+        path = LocalProvider.get_ohlcv_path(symbol, '60', data_dir)
+        with OHLCVWriter(path) as writer:
+            writer.write_many(OHLCV(t, 1.0, 2.0, 0.5, 1.5, 10.0) for t in range(start, end + 1, 3600))
+    original_bytes = LocalProvider.get_ohlcv_path('AAA', '60', data_dir).read_bytes()
+
+    time_to = datetime(2024, 1, 5, tzinfo=UTC)
+    results = {r.symbol: r for r in refresh_ohlcv(LocalProvider, ['AAA', 'BBB', 'BROKEN', 'NEW'], ['60'], data_dir,
+                                                   config_dir=tmp_path / "config", time_to=time_to, workers=3)}
+
+    # Only the tails were downloaded
+    assert sorted((s, int(f.replace(tzinfo=UTC).timestamp())) for s, f, _ in LocalProvider.downloads) == \
+           [('AAA', ends['AAA'] + 3600), ('BBB', ends['BBB'] + 3600)]
+
+    for symbol in ('AAA', 'BBB'):
+        result = results[symbol]
+        assert result.error is None
+        assert result.previous_end == ends[symbol]
+        assert result.end == int(time_to.timestamp())
+        assert result.new_bars == (result.end - ends[symbol]) // 3600
+        with OHLCVReader(result.path) as reader:
+            assert reader.start_timestamp == start
+            assert reader.end_timestamp == result.end
+
+    # Earlier data is not rewritten
+    path = LocalProvider.get_ohlcv_path('AAA', '60', data_dir)
+    assert path.read_bytes()[:len(original_bytes)] == original_bytes
+
+    assert results['BROKEN'].error == "Connection lost"
+    assert results['NEW'].error == "No data, download it first"
+    assert not results['NEW'].path.exists()
@@ -0,0 +1,33 @@
+"""
+@pyne
+"""
+from pynecore.lib import script, bar_index, close, label, line, plot
+
+
+@script.indicator(title="Drawings", max_labels_count=3, max_lines_count=2)
+def main():
+    lbl = label.new(bar_index, close, str(bar_index))
+    if bar_index % 2 == 1:
+        label.delete(lbl)
+    line.new(bar_index, close, bar_index + 1, close)
+    plot(len(label.all), "labels")
+    plot(len(line.all), "lines")
+
+
+def __test_drawing_limits__(csv_reader, runner, log):
+    """ Only the last max_*_count drawings are kept, the oldest ones are removed """
+    from pynecore.lib import label, line
+
+    with csv_reader('na.csv', subdir="data") as cr:
+        for i, (_, _plot) in enumerate(runner(cr).run_iter()):
+            # The label of odd bars is deleted after the oldest one was removed to make room for it
+            assert _plot['labels'] == (min((i + 2) // 2, 3) if i % 2 == 0 else min((i + 1) // 2, 2))
+            assert _plot['lines'] == min(i + 1, 2)
+            if i == 20:
+                assert [lbl.text for lbl in label.all()] == ['16', '18', '20']
+                copied = label.copy(label.all()[0])
+                assert label.all()[-1] is copied and len(label.all()) == 3
+                label.delete(copied)
+                break
+    # Drawings are removed after the run
+    assert not label.all() and not line.all()
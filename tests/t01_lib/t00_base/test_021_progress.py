@@ -0,0 +1,45 @@
+"""
+@pyne
+"""
+from pynecore.lib import script, close, plot
+
+
+@script.indicator(title="Progress")
+def main():
+    plot(close, "close")
+
+
+def __test_progress__(csv_reader, runner, log):
+    """ Progress counters, throttled progress callback and progress monitor """
+    from datetime import datetime
+    from pynecore.core.progress import ProgressMonitor, RunProgress
+
+    with csv_reader('na.csv', subdir="data") as cr:
+        candles = list(cr)
+
+    calls = []
+    r = runner(candles)
+    r.run(on_progress=calls.append, progress_every=7)
+    assert r.progress.bars == len(candles)
+    assert r.progress.timestamp == candles[-1].timestamp
+    assert r.progress.finished
+    # Every 7th bar and the end
+    assert len(calls) == len(candles) // 7 + 1
+    assert calls[-1] == datetime.max
+
+    # At most once an hour: the first bar and the end
+    calls.clear()
+    runner(candles).run(on_progress=calls.append, progress_interval=3600.0)
+    assert len(calls) == 2
+
+    # The runner only updates counters, the monitor samples them
+    samples = []
+    r = runner(candles)
+    with ProgressMonitor(r.progress, lambda p: samples.append((p.bars, p.finished)), interval=0.001):
+        r.run()
+    assert samples[-1] == (len(candles), True)
+    assert [bars for bars, _ in samples] == sorted(bars for bars, _ in samples)
+
+    progress = RunProgress(total_bars=4)
+    progress.bars = 1
+    assert progress.fraction == 0.25
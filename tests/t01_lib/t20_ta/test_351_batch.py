@@ -0,0 +1,107 @@
+"""
+@pyne
+"""
+from pynecore.lib import script, ta, close, high, low, hl2, hlc3, bar_index
+
+
+@script.indicator(title="Batch TA Test", shorttitle="batch", overlay=False)
+def main():
+    ema = ta.ema(close, 20)
+    res = {
+        "ta.sma(close, 10)": ta.sma(close, 10),
+        "ta.sma(close, 1)": ta.sma(close, 1),
+        "ta.ema(close, 20)": ema,
+        "ta.rma(hl2, 14)": ta.rma(hl2, 14),
+        "ta.wma(hlc3, 9)": ta.wma(hlc3, 9),
+        "ta.rsi(close, 14)": ta.rsi(close, 14),
+        "ta.change(close)": ta.change(close),
+        "ta.mom(close, 5)": ta.mom(close, 5),
+        "ta.highest(high, 12)": ta.highest(high, 12),
+        "ta.lowest(low, 12)": ta.lowest(low, 12),
+        "ta.cum(close)": ta.cum(close),
+        # Not supported in batch mode, they must run bar by bar
+        "ta.sma(ema, 5)": ta.sma(ema, 5),
+    }
+    if bar_index % 2 == 0:
+        res["conditional"] = ta.sma(close, 3)
+    return res
+
+
+def __test_batch_find_calls__():
+    """ Batch mode: call sites """
+    from pathlib import Path
+    from pynecore.core.batch_ta import find_batch_calls_in_script
+
+    calls = find_batch_calls_in_script(Path(__file__))
+    assert [(c.function, c.source, c.args) for c in calls] == [
+        ('ema', 'close', (20,)),
+        ('sma', 'close', (10,)),
+        ('sma', 'close', (1,)),
+        ('rma', 'hl2', (14,)),
+        ('wma', 'hlc3', (9,)),
+        ('rsi', 'close', (14,)),
+        ('change', 'close', ()),
+        ('mom', 'close', (5,)),
+        ('highest', 'high', (12,)),
+        ('lowest', 'low', (12,)),
+        ('cum', 'close', ()),
+    ]
+
+
+def __test_batch_same_results__(csv_reader, runner):
+    """ Batch mode: same results as bar by bar """
+    import pytest
+    pytest.importorskip('numpy')
+    from pynecore.types.na import NA
+
+    with csv_reader('ma.csv', subdir="data") as cr:
+        candles = list(cr)
+
+    expected = [dict(plot) for _, plot in runner(iter(candles)).run_iter()]
+    results = [dict(plot) for _, plot in runner(iter(candles), batch=True).run_iter()]
+
+    assert len(results) == len(expected)
+    for exp, res in zip(expected, results):
+        assert exp.keys() == res.keys()
+        for key, value in exp.items():
+            if isinstance(value, NA):
+                assert isinstance(res[key], NA), key
+            else:
+                assert res[key] == value, key
+
+
+# noinspection PyShadowingNames
+def __test_batch_ohlcv_file__(csv_reader, script_path, syminfo, tmp_path):
+    """ Batch mode: the sources are read as columns from an OHLCV file, gap bars are skipped """
+    import pytest
+    pytest.importorskip('numpy')
+    from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader, OHLCVRange
+    from pynecore.core.script_runner import ScriptRunner
+
+    with csv_reader('ma.csv', subdir="data") as cr:
+        candles = list(cr)
+    # Some missing bars, the writer fills them with gap bars
+    candles = candles[:100] + candles[105:]
+
+    path = tmp_path / 'ma.ohlcv'
+    with OHLCVWriter(path) as writer:
+        for candle in candles:
+            writer.write(candle)
+
+    with OHLCVReader(path) as reader:
+        assert reader.size >= len(candles) + 5
+        # `read_from()` is still an iterator
+        assert next(reader.read_from(reader.start_timestamp)).timestamp == candles[0].timestamp
+        ohlcv_range = reader.read_range(reader.start_timestamp, reader.end_timestamp)
+        columns = ohlcv_range.as_arrays()
+        assert list(columns.timestamp) == [c.timestamp for c in candles]
+
+        expected = [dict(plot) for _, plot in ScriptRunner(script_path, list(ohlcv_range), syminfo).run_iter()]
+        r = ScriptRunner(script_path, ohlcv_range, syminfo, batch=True)
+        results = [dict(plot) for _, plot in r.run_iter()]
+        # The bars are not loaded into a list
+        assert isinstance(r.ohlcv_iter, OHLCVRange)
+
+    assert len(results) == len(expected) == len(candles)
+    assert [res["ta.rsi(close, 14)"] for res in results] == [exp["ta.rsi(close, 14)"] for exp in expected]
+    assert [res["ta.wma(hlc3, 9)"] for res in results] == [exp["ta.wma(hlc3, 9)"] for exp in expected]
@@ -0,0 +1,68 @@
+"""
+@pyne
+"""
+from pynecore.lib import close, input, na, script, strategy, ta
+
+
+@script.strategy("RSI Strategy Batch", overlay=True)
+def main(
+        length=input(14, "Length"),
+        overSold=input(30, "Oversold"),
+        overBought=input(70, "Overbought")
+):
+    vrsi = ta.rsi(close, length)
+    co = ta.crossover(vrsi, overSold)
+    cu = ta.crossunder(vrsi, overBought)
+    if not na(vrsi):
+        if co:
+            strategy.entry('RsiLE', strategy.long, comment='RsiLE')
+        if cu:
+            strategy.entry('RsiSE', strategy.short, comment='RsiSE')
+
+
+# noinspection PyShadowingNames
+def __test_run_batch__(csv_reader, script_path, syminfo, tmp_path):
+    """ Run batch """
+    from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader
+    from pynecore.core.script_runner import ScriptRunner
+
+    # Create two data files with symbol info
+    with csv_reader('ohlcv.csv', subdir="data") as cr:
+        candles = list(cr)
+    data_paths = [tmp_path / 'AAA.ohlcv', tmp_path / 'BBB.ohlcv']
+    for data_path in data_paths:
+        with OHLCVWriter(data_path) as writer:
+            for candle in candles:
+                writer.write(candle)
+        syminfo.save_toml(data_path.with_suffix('.toml'))
+
+    input_sets = [{'length': 14}, {'length': 7}]
+    summary_path = tmp_path / 'summary.csv'
+    results = list(ScriptRunner.run_batch(script_path, data_paths, input_sets, workers=2,
+                                          summary_path=summary_path))
+
+    assert len(results) == 4
+    assert all(r.error is None for r in results), [r.error for r in results]
+    assert {(r.data_path.name, r.inputs['length']) for r in results} == {
+        ('AAA.ohlcv', 14), ('AAA.ohlcv', 7), ('BBB.ohlcv', 14), ('BBB.ohlcv', 7)
+    }
+
+    # Results must be the same as running in this process
+    for inputs in input_sets:
+        with OHLCVReader(data_paths[0]) as reader:
+            size = reader.get_size(skip_gaps=True)
+            runner = ScriptRunner(script_path, reader.read_from(reader.start_timestamp), syminfo,
+                                  last_bar_index=size - 1, inputs=inputs)
+            runner.run()
+        assert runner.statistics is not None
+        for r in results:
+            if r.inputs == inputs:
+                assert r.statistics == runner.statistics
+
+    results_by_length = {r.inputs['length']: r.statistics for r in results}
+    assert results_by_length[14].total_trades != results_by_length[7].total_trades
+
+    # Summary
+    lines = summary_path.read_text().splitlines()
+    assert len(lines) == 5
+    assert lines[0].startswith('data,inputs,error,net_profit,')
@@ -0,0 +1,84 @@
+"""
+@pyne
+"""
+from pynecore.lib import close, input, na, script, strategy, ta
+
+
+@script.strategy("RSI Strategy Optimizer", overlay=True)
+def main(
+        length=input.int(14, "Length", minval=2, maxval=30),
+        overSold=input(30, "Oversold"),
+        overBought=input(70, "Overbought")
+):
+    vrsi = ta.rsi(close, length)
+    co = ta.crossover(vrsi, overSold)
+    cu = ta.crossunder(vrsi, overBought)
+    if not na(vrsi):
+        if co:
+            strategy.entry('RsiLE', strategy.long, comment='RsiLE')
+        if cu:
+            strategy.entry('RsiSE', strategy.short, comment='RsiSE')
+
+
+# noinspection PyShadowingNames
+def __test_search_space__():
+    """ Optimizer search space """
+    import pytest
+    from pynecore.core.optimizer import input_range, parse_search_space
+    from pynecore.core.script import InputData
+
+    assert input_range(5, 20, 5) == [5, 10, 15, 20]
+    assert input_range(0.1, 0.5, 0.1) == [0.1, 0.2, 0.3, 0.4, 0.5]
+
+    inputs = {'length': InputData(id='length', minval=2, maxval=6)}
+    assert parse_search_space({'length': {'step': 2}}, inputs) == {'length': [2, 4, 6]}
+    assert parse_search_space({'length': [3, 5]}, inputs) == {'length': [3, 5]}
+    with pytest.raises(ValueError):
+        parse_search_space({'unknown': [1]}, inputs)
+
+
+# noinspection PyShadowingNames
+def __test_optimizer__(csv_reader, script_path, syminfo, tmp_path):
+    """ Optimizer """
+    from pynecore.core.ohlcv_file import OHLCVWriter, OHLCVReader
+    from pynecore.core.optimizer import Optimizer
+    from pynecore.core.script_runner import ScriptRunner
+
+    with csv_reader('ohlcv.csv', subdir="data") as cr:
+        candles = list(cr)
+    data_path = tmp_path / 'AAA.ohlcv'
+    with OHLCVWriter(data_path) as writer:
+        for candle in candles:
+            writer.write(candle)
+    syminfo.save_toml(data_path.with_suffix('.toml'))
+
+    space = {'length': [7, 14], 'overSold': [25, 30]}
+    optimizer = Optimizer(script_path, data_path, workers=2)
+
+    # Grid
+    results = optimizer.run(space)
+    assert len(results) == 4
+    assert all(r.error is None for r in results), [r.error for r in results]
+    scores = [r.score for r in results]
+    assert scores == sorted(scores, reverse=True)
+
+    # The best must be the same as running in this process
+    best = results[0]
+    with OHLCVReader(data_path) as reader:
+        size = reader.get_size(skip_gaps=True)
+        runner = ScriptRunner(script_path, reader.read_from(reader.start_timestamp), syminfo,
+                              last_bar_index=size - 1, inputs=best.inputs)
+        runner.run()
+    assert best.bars == size
+    assert best.statistics == runner.statistics
+
+    # Random
+    results = optimizer.run(space, 'random', samples=2, seed=1)
+    assert len(results) == 2
+    assert results[0].inputs != results[1].inputs
+
+    # Successive halving, the winner must run on the whole data
+    results = optimizer.run(space, 'halving', eta=2, min_bars=100)
+    assert len(results) == 4
+    assert results[0].bars == size
+    assert any(r.bars < size for r in results)
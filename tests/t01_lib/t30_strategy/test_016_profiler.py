@@ -0,0 +1,60 @@
+"""
+@pyne
+"""
+from pynecore.lib import close, na, script, strategy, ta
+
+
+@script.strategy("RSI Strategy Profile", overlay=True)
+def main():
+    vrsi = ta.rsi(close, 14)
+    co = ta.crossover(vrsi, 30)
+    cu = ta.crossunder(vrsi, 70)
+    if not na(vrsi):
+        if co:
+            strategy.entry('RsiLE', strategy.long, comment='RsiLE')
+        if cu:
+            strategy.entry('RsiSE', strategy.short, comment='RsiSE')
+
+
+# noinspection PyShadowingNames
+def __test_profiler__(csv_reader, runner, script_path):
+    """ Profiler """
+    from pynecore.core.profiler import Profiler
+    from pynecore.lib.strategy import Position
+
+    original_process_orders = Position.process_orders
+
+    profiler = Profiler()
+    with csv_reader('ohlcv.csv', subdir="data") as cr:
+        r = runner(cr)
+        r.profiler = profiler
+        bars = sum(1 for _ in r.run_iter())
+
+    assert profiler.bars == bars > 0
+    assert Position.process_orders is original_process_orders, "Patched functions must be restored"
+
+    entries = {e.name: e for e in profiler.report()}
+    lines = script_path.read_text().splitlines()
+    for name in ('ta.rsi', 'ta.crossover', 'ta.crossunder'):
+        entry = entries[name]
+        assert entry.calls == bars
+        lineno = int(entry.location.split(':')[1])
+        assert name + '(' in lines[lineno - 1]
+
+    assert entries['Position.process_orders()'].calls == bars
+    assert 0 < entries['ta.rsi'].total < entries['main()'].total <= profiler.total
+
+    # Wrappers of call sites are reused if the isolated function is the same, new instances share the entry
+    from pynecore.core.profiler import find_call_sites
+    call_id = next(site.call_id for site in find_call_sites(script_path).values() if site.name == 'ta.rsi')
+    profiler = Profiler()
+    profiler.install(r.script_module, script_path)
+    try:
+        isolate = r.script_module.isolate_function
+        wrapper = isolate(ta.rsi, call_id, 'main', 0)
+        assert isolate(ta.rsi, call_id, 'main', 0) is wrapper
+        isolate(ta.rsi, call_id, 'main')(1.0, 14)
+        isolate(ta.rsi, call_id, 'main')(1.0, 14)
+        assert [e.calls for e in profiler.entries.values() if e.name == 'ta.rsi'] == [2]
+    finally:
+        profiler.uninstall()
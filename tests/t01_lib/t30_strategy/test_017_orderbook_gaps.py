@@ -0,0 +1,57 @@
+"""
+@pyne
+"""
+import random
+
+from pynecore.lib.strategy import Order, PriceOrderBook
+
+
+def main():
+    """
+    Dummy main function to be a valid Pyne script
+    """
+    pass
+
+
+def _gapped(order: Order, price: float) -> bool:
+    """ Same condition as `Position._check_already_filled()` """
+    if order.stop is not None:
+        if (order.size > 0 and price >= order.stop) or (order.size < 0 and price <= order.stop):
+            return True
+    if order.limit is not None:
+        if (order.size > 0 and price <= order.limit) or (order.size < 0 and price >= order.limit):
+            return True
+    return False
+
+
+def __test_orderbook_gap_orders__():
+    """ Gap candidates of the order book are the same as checking all orders, in the same order """
+    rnd = random.Random(42)
+    book = PriceOrderBook()
+    orders = []
+    for i in range(300):
+        limit = rnd.randint(90, 110) if rnd.random() < 0.6 else None
+        stop = rnd.randint(90, 110) if limit is None or rnd.random() < 0.3 else None
+        order = Order(f"o{i % 50}", rnd.choice((-1.0, 1.0)) * rnd.randint(1, 3), limit=limit, stop=stop)
+        book.add_order(order)
+        orders.append(order)
+
+        # Move stops, remove orders
+        if rnd.random() < 0.2:
+            book.update_order_stop(rnd.choice(orders), rnd.randint(90, 110))
+        if rnd.random() < 0.2:
+            book.remove_order(orders.pop(rnd.randrange(len(orders))))
+
+        for price in (89, rnd.uniform(90, 110), rnd.randint(90, 110), 111):
+            expected = [o for o in book.iter_orders() if _gapped(o, price)]
+            result = [o for o in book.iter_gap_orders(price) if _gapped(o, price)]
+            assert len(result) == len(expected)
+            assert all(a is b for a, b in zip(result, expected))
+
+    # Orders resting on the right side of the price are not even visited
+    book.clear()
+    book.add_order(Order("long stop", 1.0, stop=105.0))
+    book.add_order(Order("long limit", 1.0, limit=95.0))
+    book.add_order(Order("short stop", -1.0, stop=105.0))
+    assert [o.order_id for o in book.iter_gap_orders(100.0)] == ["short stop"]
+    assert [o.order_id for o in book.iter_gap_orders(94.0)] == ["long limit", "short stop"]
@@ -0,0 +1,51 @@
+"""
+@pyne
+"""
+from pynecore.core.trade_store import ClosedTradeStore
+from pynecore.lib.strategy import Trade
+
+
+def main():
+    """
+    Dummy main function to be a valid Pyne script
+    """
+    pass
+
+
+def _trade(num: int) -> Trade:
+    trade = Trade(size=1.0, entry_id=f"T{num}", entry_bar_index=num, entry_time=num * 60, entry_price=100.0 + num,
+                  commission=0.5, entry_comment="", entry_equity=1000.0)
+    trade.exit_bar_index = num + 2
+    trade.profit = float(num % 7 - 3)
+    return trade
+
+
+def __test_closed_trade_store__():
+    """ Indexed access, columns and running aggregates of the closed trade store, which drops its oldest trades """
+    store = ClosedTradeStore(maxlen=5)
+    trades = []
+    for num in range(13):
+        trade = _trade(num)
+        store.append(trade)
+        trades.append(trade)
+        kept = trades[-5:]
+
+        assert len(store) == len(kept)
+        assert store.count == num + 1
+        assert list(store) == kept
+        assert all(store[i] is trade for i, trade in enumerate(kept))
+        assert store[-1] is trade
+        assert store.column('entry_bar_index') == [t.entry_bar_index for t in kept]
+        assert store.column('profit', last=2) == [t.profit for t in kept[-2:]]
+        assert store.profit_sum() == sum(t.profit for t in trades)
+        for last in range(7):
+            assert store.profit_sum(last) == sum(t.profit for t in kept[len(kept) - min(last, len(kept)):])
+
+    try:
+        _ = store[5]
+        assert False, "IndexError expected"
+    except IndexError:
+        pass
+
+    store.clear()
+    assert len(store) == 0 and store.count == 0 and store.profit_sum() == 0.0
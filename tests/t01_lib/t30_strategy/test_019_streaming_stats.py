@@ -0,0 +1,75 @@
+"""
+@pyne
+"""
+import math
+import random
+import statistics
+
+from pynecore.core.strategy_stats import StrategyStatsAccumulator
+from pynecore.lib.strategy import Position, Trade
+
+
+def main():
+    """
+    Dummy main function to be a valid Pyne script
+    """
+    pass
+
+
+def __test_streaming_statistics__():
+    """ Incremental statistics are the same as calculated from all trades and equities at once """
+    rnd = random.Random(7)
+    position = Position()
+    accumulator = StrategyStatsAccumulator()
+    trades = []
+    equities = []
+
+    time = 0
+    for num in range(200):
+        size = rnd.choice((-2.0, -1.0, 1.0, 2.0))
+        trade = Trade(size=size, entry_id=f"T{num}", entry_bar_index=num * 3, entry_time=time, entry_price=100.0,
+                      commission=0.25, entry_comment="", entry_equity=1000.0)
+        trade.exit_bar_index = num * 3 + rnd.randint(0, 5)
+        trade.exit_time = time + rnd.choice((0, 60, 120, 300))
+        trade.profit = float(rnd.randint(-10, 10))
+        trade.profit_percent = trade.profit / 10.0
+        time += 60
+        position.closed_trades.append(trade)
+        position.closed_trades_count += 1
+        trades.append(trade)
+
+        # Statistics can be updated at any time
+        if rnd.random() < 0.3:
+            accumulator.add_closed_trades(position.closed_trades)
+        equity = 1000.0 + sum(t.profit for t in trades)
+        equities.append(equity)
+        accumulator.add_equity(equity)
+
+    accumulator.add_closed_trades(position.closed_trades)
+    stats = accumulator.statistics(position, 1000.0)
+
+    wins = [t.profit for t in trades if t.profit > 0]
+    longs = [t for t in trades if t.size > 0]
+    assert stats.commission_paid == 0.25 * len(trades)
+    assert stats.avg_winning_trade == sum(wins) / len(wins)
+    assert stats.largest_losing_trade == min(t.profit for t in trades)
+    assert stats.avg_bars_in_trades == sum(t.exit_bar_index - t.entry_bar_index for t in trades) / len(trades)
+    assert stats.long_trades == len(longs)
+    assert stats.long_net_profit == sum(t.profit for t in longs)
+
+    # Consecutive wins
+    streak = max_streak = 0
+    for t in trades:
+        streak = streak + 1 if t.profit > 0 else 0
+        max_streak = max(max_streak, streak)
+    assert stats.max_cons_winning_trades == max_streak
+
+    # Summed size of the trades open at every entry
+    max_size = max(sum(abs(o.size) for o in trades[:i + 1] if o.exit_time > t.entry_time)
+                   for i, t in enumerate(trades))
+    assert stats.max_contracts_held == max_size
+
+    # Sharpe ratio from the returns of all bars
+    returns = [(b - a) / a for a, b in zip(equities, equities[1:])]
+    sharpe = statistics.mean(returns) * 252 / (statistics.stdev(returns) * math.sqrt(252))
+    assert math.isclose(stats.sharpe_ratio, sharpe, rel_tol=1e-9)
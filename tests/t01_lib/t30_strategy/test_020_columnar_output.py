@@ -0,0 +1,137 @@
+"""
+@pyne
+"""
+from pynecore.lib import close, na, plot, script, strategy, ta
+
+
+@script.strategy("RSI Strategy Columnar", overlay=True)
+def main():
+    vrsi = ta.rsi(close, 14)
+    co = ta.crossover(vrsi, 30)
+    cu = ta.crossunder(vrsi, 70)
+    if not na(vrsi):
+        if co:
+            strategy.entry('RsiLE', strategy.long, comment='RsiLE')
+        if cu:
+            strategy.entry('RsiSE', strategy.short, comment='RsiSE')
+    plot(vrsi, "rsi")
+
+
+# noinspection PyShadowingNames
+def __test_columnar_output__(csv_reader, script_path, syminfo, tmp_path):
+    """ Binary columnar plot, trade and equity files contain the same data as the CSV files """
+    import csv
+    import math
+    from pynecore.core.columnar_file import ColumnarReader
+    from pynecore.core.script_runner import ScriptRunner
+
+    with csv_reader('ohlcv.csv', subdir="data") as cr:
+        candles = list(cr)
+
+    outputs = {}
+    for suffix in ('.csv', '.pcol'):
+        paths = dict(plot_path=tmp_path / f'plot{suffix}', trade_path=tmp_path / f'trade{suffix}',
+                     equity_path=tmp_path / f'equity{suffix}')
+        ScriptRunner(script_path, iter(candles), syminfo, **paths).run()
+        outputs[suffix] = paths
+
+    # Plot
+    with open(outputs['.csv']['plot_path']) as f:
+        plot_rows = list(csv.DictReader(f))
+    with ColumnarReader(outputs['.pcol']['plot_path']) as reader:
+        assert reader.headers == list(plot_rows[0].keys())
+        assert reader.types['time'] == 'q' and reader.types['rsi'] == 'd'
+        plot_data = reader.read()
+    assert len(plot_data['time']) == len(plot_rows) == len(candles)
+    assert list(plot_data['time']) == [c.timestamp for c in candles]
+    assert list(plot_data['close']) == [c.close for c in candles]
+    assert math.isnan(plot_data['rsi'][0]) and plot_rows[0]['rsi'] == ''
+    for value, row in zip(plot_data['rsi'][14:], plot_rows[14:]):
+        assert math.isclose(value, float(row['rsi']), rel_tol=1e-7)
+
+    # Trades: times are raw timestamps, percents are floats
+    with open(outputs['.csv']['trade_path']) as f:
+        trade_rows = list(csv.reader(f))[1:]
+    with ColumnarReader(outputs['.pcol']['trade_path']) as reader:
+        trades = reader.read()
+    assert len(trade_rows) == len(trades['Trade #']) > 2
+    assert list(trades['Type']) == [row[2] for row in trade_rows]
+    assert list(trades['Signal']) == [row[3] for row in trade_rows]
+    assert [f"{p:.2f}" for p in trades['Profit %']] == [row[8] for row in trade_rows]
+    assert all(t % 60000 == 0 for t in trades['Date/Time'])
+
+    # Equity
+    with open(outputs['.csv']['equity_path']) as f:
+        equity_rows = list(csv.reader(f))[1:]
+    with ColumnarReader(outputs['.pcol']['equity_path']) as reader:
+        equity = reader.read()
+    assert len(equity['equity']) == len(equity_rows) == len(candles)
+    assert [int(row[0]) for row in equity_rows] == list(equity['time'])
+    assert [float(row[1]) for row in equity_rows] == [float(f"{e:.8g}") for e in equity['equity']]
+
+
+def __test_columnar_writer__(tmp_path):
+    """ Columnar writer and reader round trip with several chunks """
+    from array import array
+    from pynecore.core.columnar_file import ColumnarWriter, ColumnarReader, INT_NA
+    from pynecore.types.na import NA
+    from pynecore.types.ohlcv import OHLCV
+
+    path = tmp_path / 'test.pcol'
+    with ColumnarWriter(path, chunk_size=3) as writer:
+        plot_data = {}
+        for i in range(10):
+            plot_data['value'] = NA(float) if i == 0 else i * 1.5
+            if i != 5:
+                plot_data['label'] = f"ä{i}"
+            candle = OHLCV(timestamp=1000 + i, open=1.0, high=2.0, low=0.5, close=1.5, volume=float(i),
+                           extra_fields={'extra': i})
+            writer.write_plot(candle, plot_data)
+            plot_data.clear()
+
+    with ColumnarReader(path) as reader:
+        assert reader.headers == ['time', 'open', 'high', 'low', 'close', 'volume', 'extra', 'value', 'label']
+        assert reader.types['label'] == 's'
+        data = reader.read()
+    assert list(data['time']) == list(range(1000, 1010))
+    assert list(data['extra']) == [float(i) for i in range(10)]
+    assert data['value'][0] != data['value'][0]
+    assert list(data['value'][1:]) == [i * 1.5 for i in range(1, 10)]
+    assert data['label'][5] == '' and data['label'][9] == 'ä9'
+
+    # Rows by headers and types
+    with ColumnarWriter(path, headers=('id', 'name'), types={'id': 'q', 'name': 's'}) as writer:
+        writer.write(1, "a")
+        writer.write(NA(int), "b")
+        writer.write_dict({'name': "c", 'id': 3})
+    data = ColumnarReader(path).read()
+    assert list(data['id']) == [1, INT_NA, 3]
+    assert data['name'] == ["a", "b", "c"]
+
+    # The schema is written on open if the headers are known, so files without rows can be read
+    with ColumnarWriter(path, headers=('a', 'b'), types={'a': 'q'}):
+        pass
+    with ColumnarReader(path) as reader:
+        assert reader.types == {'a': 'q', 'b': 'd'}
+        assert reader.read() == {'a': array('q'), 'b': array('d')}
+    with ColumnarWriter(path):
+        pass
+    assert ColumnarReader(path).read() == {}
+
+
+# noinspection PyShadowingNames
+def __test_columnar_no_trades__(csv_reader, script_path, syminfo, tmp_path):
+    """ Trade file of a run without trades has the schema """
+    from pynecore.core.columnar_file import ColumnarReader
+    from pynecore.core.script_runner import ScriptRunner
+
+    with csv_reader('ohlcv.csv', subdir="data") as cr:
+        candles = list(cr)[:10]  # RSI is NA, no trades
+
+    trade_path = tmp_path / 'trade.pcol'
+    ScriptRunner(script_path, iter(candles), syminfo, trade_path=trade_path).run()
+    with ColumnarReader(trade_path) as reader:
+        assert reader.headers[:3] == ["Trade #", "Bar Index", "Type"]
+        assert reader.types["Date/Time"] == 'q'
+        trades = reader.read()
+    assert len(trades["Trade #"]) == 0 and trades["Signal"] == []